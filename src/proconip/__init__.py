@@ -14,6 +14,7 @@ from .api import (
     DIGITAL_INPUT_COUNT,
     BadCredentialsException,
     BadStatusCodeException,
+    CircuitOpenException,
     DigitalInputControl,
     DmxControl,
     DosageControl,
@@ -21,7 +22,9 @@ from .api import (
     ProconipApiException,
     RelaySwitch,
     TimeoutException,
+    async_apply_relay_changes,
     async_get_dmx,
+    async_get_raw_bytes,
     async_get_raw_data,
     async_get_raw_dmx,
     async_get_raw_state,
@@ -34,6 +37,7 @@ from .api import (
     async_switch_on,
     async_trigger_digital_input,
 )
+from .client import AdaptiveInterval, ProconipClient
 from .definitions import (
     CATEGORY_ANALOG,
     CATEGORY_CANISTER,
@@ -44,8 +48,12 @@ from .definitions import (
     CATEGORY_RELAY,
     CATEGORY_TEMPERATURE,
     CATEGORY_TIME,
+    DEFAULT_COLUMN_LAYOUT,
+    DEFAULT_PAYLOAD_ENCODING,
     EXTERNAL_RELAY_ID_OFFSET,
     BadRelayException,
+    ColumnLayout,
+    ColumnSpec,
     ConfigObject,
     DataObject,
     DigitalInput,
@@ -55,7 +63,11 @@ from .definitions import (
     GetStateData,
     InvalidPayloadException,
     Relay,
+    RelayMode,
 )
+from .fleet import ControllerFleet
+from .limiter import RequestLimiter
+from .resilience import CircuitBreaker, RetryPolicy
 
 __all__ = [
     "__version__",
@@ -64,10 +76,13 @@ __all__ = [
     "BadCredentialsException",
     "BadStatusCodeException",
     "TimeoutException",
+    "CircuitOpenException",
     "BadRelayException",
     "InvalidPayloadException",
     # config
     "ConfigObject",
+    "ColumnLayout",
+    "ColumnSpec",
     # data classes
     "DataObject",
     "Relay",
@@ -77,8 +92,11 @@ __all__ = [
     "GetDmxData",
     # enums
     "DosageTarget",
+    "RelayMode",
     # constants
     "DIGITAL_INPUT_COUNT",
+    "DEFAULT_COLUMN_LAYOUT",
+    "DEFAULT_PAYLOAD_ENCODING",
     "EXTERNAL_RELAY_ID_OFFSET",
     "CATEGORY_TIME",
     "CATEGORY_ANALOG",
@@ -89,6 +107,15 @@ __all__ = [
     "CATEGORY_EXTERNAL_RELAY",
     "CATEGORY_CANISTER",
     "CATEGORY_CONSUMPTION",
+    # persistent client
+    "ProconipClient",
+    "AdaptiveInterval",
+    # fleet polling
+    "ControllerFleet",
+    # request control
+    "RequestLimiter",
+    "RetryPolicy",
+    "CircuitBreaker",
     # OO wrappers
     "GetState",
     "RelaySwitch",
@@ -97,12 +124,14 @@ __all__ = [
     "DigitalInputControl",
     # free async functions
     "async_get_raw_data",
+    "async_get_raw_bytes",
     "async_get_raw_state",
     "async_get_state",
     "async_post_usrcfg_cgi",
     "async_switch_on",
     "async_switch_off",
     "async_set_auto_mode",
+    "async_apply_relay_changes",
     "async_start_dosage",
     "async_get_raw_dmx",
     "async_get_dmx",
@@ -18,6 +18,9 @@ Each operation is available in two equivalent forms:
   arguments on every call.
 
 The OO wrappers delegate to the free functions, so behavior is identical.
+Long-running integrations can use `proconip.client.ProconipClient` instead,
+which bundles every operation behind one object with its session, auth header
+and endpoint URLs set up once.
 
 All requests use HTTP Basic auth and run inside an `asyncio.timeout` block
 that covers both the request and the response body read. Network failures,
@@ -27,7 +30,10 @@ subclasses so callers can handle them uniformly.
 
 import asyncio
 import contextlib
+import functools
 import socket
+from collections.abc import Awaitable, Callable, Coroutine, Iterable, Mapping
+from typing import Any
 
 from aiohttp import (
     BasicAuth,
@@ -42,13 +48,18 @@ from .definitions import (
     API_PATH_GET_DMX,
     API_PATH_GET_STATE,
     API_PATH_USRCFG,
+    DEFAULT_PAYLOAD_ENCODING,
+    EXTERNAL_RELAY_ID_OFFSET,
     BadRelayException,
     ConfigObject,
     DosageTarget,
     GetDmxData,
     GetStateData,
     Relay,
+    RelayMode,
 )
+from .limiter import RequestLimiter
+from .resilience import CircuitBreaker, RetryPolicy
 
 
 class ProconipApiException(Exception):
@@ -84,15 +95,226 @@ class TimeoutException(ProconipApiException):
     """
 
 
-async def _handle_response(response: ClientResponse) -> str:
-    """Validate the response and return its body, mapping HTTP errors to typed exceptions."""
+class CircuitOpenException(ProconipApiException):
+    """Raised without contacting the controller while its circuit breaker is open.
+
+    The controller failed too many requests in a row; see
+    `proconip.resilience.CircuitBreaker`.
+    """
+
+
+def _check_response(response: ClientResponse) -> None:
+    """Map HTTP error statuses to typed exceptions."""
     if response.status in (401, 403):
         raise BadCredentialsException("Invalid credentials")
     try:
         response.raise_for_status()
     except ClientError as exc:
         raise BadStatusCodeException(f"Unexpected response status {response.status}") from exc
-    return await response.text()
+
+
+async def _handle_response(response: ClientResponse, encoding: str | None = None) -> str:
+    """Validate the response and return its body as text.
+
+    With ``encoding`` set the body is decoded with it directly; otherwise
+    aiohttp works the charset out from the headers or the body itself.
+    """
+    _check_response(response)
+    return await response.text(encoding=encoding)
+
+
+async def _handle_response_bytes(response: ClientResponse) -> bytes:
+    """Validate the response and return its body undecoded."""
+    _check_response(response)
+    return await response.read()
+
+
+async def _handle_response_payload(response: ClientResponse) -> tuple[bytes, str]:
+    """Validate the response and return its undecoded body and text encoding.
+
+    The encoding is the ``charset`` of the ``Content-Type`` header, falling
+    back to `DEFAULT_PAYLOAD_ENCODING` when the controller sends none.
+    """
+    _check_response(response)
+    return await response.read(), response.charset or DEFAULT_PAYLOAD_ENCODING
+
+
+# Content type of every `/usrcfg.cgi` write.
+_USRCFG_HEADERS = {"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"}
+
+
+async def _async_request[T](
+    client_session: ClientSession,
+    method: str,
+    url: URL,
+    timeout: float,
+    handler: Callable[[ClientResponse], Awaitable[T]],
+    *,
+    auth: BasicAuth | None = None,
+    headers: Mapping[str, str] | None = None,
+    data: str | None = None,
+    limiter: RequestLimiter | None = None,
+    write: bool = False,
+    retry: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
+) -> T:
+    """Send one request and hand the response to ``handler``, mapping failures.
+
+    Credentials come either as ``auth`` or as a ready-made ``Authorization``
+    entry in ``headers``. With a ``limiter``, the request first waits for a
+    slot (``write`` ones ahead of reads); that wait is not part of
+    ``timeout``, which only covers the exchange itself.
+
+    An open ``breaker`` rejects the request before it queues for a slot.
+    Transport failures (timeouts and network errors) are reported to the
+    breaker and, unless ``write`` is set, retried as ``retry`` allows; any
+    HTTP response counts as a success for the breaker.
+    """
+    attempt = 0
+    while True:
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenException(
+                f"Controller unreachable, not retrying for {breaker.retry_after:.1f} s"
+            )
+        try:
+            async with contextlib.nullcontext() if limiter is None else limiter.slot(write):
+                result = await _async_exchange(
+                    client_session,
+                    method,
+                    url,
+                    timeout,
+                    handler,
+                    auth=auth,
+                    headers=headers,
+                    data=data,
+                )
+        except (BadCredentialsException, BadStatusCodeException):
+            if breaker is not None:
+                breaker.record_success()
+            raise
+        except ProconipApiException:
+            if breaker is not None:
+                breaker.record_failure()
+            attempt += 1
+            if write or retry is None or attempt >= retry.attempts:
+                raise
+            await asyncio.sleep(retry.delay(attempt - 1))
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+
+async def _async_exchange[T](
+    client_session: ClientSession,
+    method: str,
+    url: URL,
+    timeout: float,
+    handler: Callable[[ClientResponse], Awaitable[T]],
+    *,
+    auth: BasicAuth | None,
+    headers: Mapping[str, str] | None,
+    data: str | None,
+) -> T:
+    """Send one request within ``timeout``, mapping failures to API exceptions."""
+    try:
+        async with asyncio.timeout(timeout):
+            async with client_session.request(
+                method, url, auth=auth, headers=headers, data=data
+            ) as response:
+                return await handler(response)
+    except TimeoutError as exc:
+        raise TimeoutException("API request timed out") from exc
+    except (ClientError, socket.gaierror) as exc:
+        raise ProconipApiException(f"API request failed ({exc})") from exc
+
+
+def _relay_bits(
+    current_state: GetStateData,
+    changes: Iterable[tuple[Relay, RelayMode]],
+    bit_state: tuple[int, int] | None = None,
+) -> tuple[int, int]:
+    """Return the ENA ``(manual_bits, on_bits)`` that put every given relay into its mode.
+
+    Relays not mentioned keep the mode they have in ``bit_state``, which
+    defaults to the bitmaps of ``current_state``. ``current_state`` is still
+    consulted for the dosage relay check. All changes are checked before
+    anything is returned, so a rejected batch never reaches the controller.
+
+    Raises:
+        BadRelayException: If `RelayMode.ON` is requested for a dosage relay.
+        ValueError: If ``bit_state`` is not given and ``current_state`` holds
+            an invalid relay value (see
+            `GetStateData.determine_overall_relay_bit_state`).
+    """
+    if bit_state is None:
+        manual_bits, on_bits = current_state.determine_overall_relay_bit_state()
+    else:
+        manual_bits, on_bits = bit_state
+    for relay, mode in changes:
+        if mode == RelayMode.ON and current_state.is_dosage_relay(relay):
+            raise BadRelayException("Cannot permanently switch on a dosage relay")
+        relay_bit_mask = relay.get_bit_mask()
+        if mode & 2:
+            manual_bits |= relay_bit_mask
+        else:
+            manual_bits &= ~relay_bit_mask
+        if mode & 1:
+            on_bits |= relay_bit_mask
+        else:
+            on_bits &= ~relay_bit_mask
+    return manual_bits, on_bits
+
+
+def _ena_payload(bit_state: tuple[int, int]) -> str:
+    """Format ENA bitmaps as a `/usrcfg.cgi` body."""
+    manual_bits, on_bits = bit_state
+    return f"ENA={manual_bits},{on_bits}&MANUAL=1"
+
+
+def _relay_payload(current_state: GetStateData, changes: Iterable[tuple[Relay, RelayMode]]) -> str:
+    """Build the `/usrcfg.cgi` body that puts every given relay into its mode.
+
+    See `_relay_bits` for how the bitmaps are derived and validated.
+
+    Raises:
+        BadRelayException: If `RelayMode.ON` is requested for a dosage relay.
+        ValueError: If ``current_state`` holds an invalid relay value.
+    """
+    return _ena_payload(_relay_bits(current_state, changes))
+
+
+def _resolve_relay_changes(
+    current_state: GetStateData, changes: Mapping[int, RelayMode]
+) -> list[tuple[Relay, RelayMode]]:
+    """Turn ``{relay_id: mode}`` into ``(Relay, RelayMode)`` pairs.
+
+    Raises:
+        ValueError: If ``changes`` is empty or holds an unknown mode.
+        IndexError: If a relay ID is outside the 0–15 range, or names an
+            external relay (8–15) while the relay extension is disabled.
+    """
+    if not changes:
+        raise ValueError("No relay changes given")
+    relay_count = 2 * EXTERNAL_RELAY_ID_OFFSET
+    if not current_state.is_relay_extension_enabled():
+        relay_count = EXTERNAL_RELAY_ID_OFFSET
+    for relay_id in changes:
+        if not 0 <= relay_id < relay_count:
+            raise IndexError(f"Relay ID {relay_id} is outside the range 0–{relay_count - 1}")
+    return [
+        (current_state.get_relay(relay_id), RelayMode(mode)) for relay_id, mode in changes.items()
+    ]
+
+
+def _dosage_query(dosage_target: DosageTarget, dosage_duration: int) -> str:
+    """Build the `/Command.htm` query string for a manual dosage."""
+    return f"MAN_DOSAGE={dosage_target},{dosage_duration}"
+
+
+def _dmx_payload(dmx_states: GetDmxData) -> str:
+    """Build the `/usrcfg.cgi` body that writes all 16 DMX channels."""
+    return "&".join(f"{k}={v}" for k, v in dmx_states.post_data.items())
 
 
 async def async_get_raw_data(
@@ -100,6 +322,10 @@ async def async_get_raw_data(
     config: ConfigObject,
     url: URL,
     timeout: float = 10.0,
+    encoding: str | None = None,
+    limiter: RequestLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
 ) -> str:
     """Send an authenticated GET request and return the response body as text.
 
@@ -118,6 +344,18 @@ async def async_get_raw_data(
             standard endpoints.
         timeout: Maximum seconds to wait for the entire exchange (request and
             response body). Defaults to 10 seconds.
+        encoding: Decode the body with this codec (e.g. ``"utf-8"``). The
+            controller sends CSV without a charset, so by default aiohttp
+            has to guess one, which costs noticeable CPU on small bodies.
+            Pass `DEFAULT_PAYLOAD_ENCODING` to skip the guess.
+        limiter: Admission control shared by every request to this
+            controller (see `proconip.limiter.RequestLimiter`). ``None``
+            sends the request right away.
+        retry: Repeat the request after timeouts and network errors (see
+            `proconip.resilience.RetryPolicy`). ``None`` fails on the first
+            error.
+        breaker: Per-controller `proconip.resilience.CircuitBreaker`. While
+            it is open, the call fails at once with `CircuitOpenException`.
 
     Returns:
         The raw response body as a string. The controller typically returns
@@ -129,22 +367,105 @@ async def async_get_raw_data(
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For DNS failures, connection resets, and other
             network-level errors.
+        CircuitOpenException: While ``breaker`` is open.
     """
+    handler = _handle_response
+    if encoding is not None:
+        handler = functools.partial(_handle_response, encoding=encoding)
     auth = BasicAuth(config.username, config.password)
-    try:
-        async with asyncio.timeout(timeout):
-            async with client_session.get(url, auth=auth) as response:
-                return await _handle_response(response)
-    except TimeoutError as exc:
-        raise TimeoutException("API request timed out") from exc
-    except (ClientError, socket.gaierror) as exc:
-        raise ProconipApiException(f"API request failed ({exc})") from exc
+    return await _async_request(
+        client_session,
+        "GET",
+        url,
+        timeout,
+        handler,
+        auth=auth,
+        limiter=limiter,
+        retry=retry,
+        breaker=breaker,
+    )
+
+
+async def async_get_raw_bytes(
+    client_session: ClientSession,
+    config: ConfigObject,
+    url: URL,
+    timeout: float = 10.0,
+    limiter: RequestLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
+) -> bytes:
+    """Send an authenticated GET request and return the undecoded response body.
+
+    Same as `async_get_raw_data`, but skips decoding altogether. Feed the
+    result to `GetStateData.from_bytes` or `GetDmxData.from_bytes`, or
+    decode it yourself.
+
+    Args:
+        client_session: An open `aiohttp.ClientSession`.
+        config: Controller configuration.
+        url: Fully-qualified URL to GET.
+        timeout: Maximum seconds to wait for the entire exchange.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
+        retry: Retry policy for transport failures; see `async_get_raw_data`.
+        breaker: Per-controller circuit breaker; see `async_get_raw_data`.
+
+    Returns:
+        The raw response body.
+
+    Raises:
+        BadCredentialsException: If the controller responds with HTTP 401 or 403.
+        BadStatusCodeException: If any other 4xx or 5xx status is returned.
+        TimeoutException: If the exchange exceeds ``timeout`` seconds.
+        ProconipApiException: For network-level errors.
+        CircuitOpenException: While ``breaker`` is open.
+    """
+    auth = BasicAuth(config.username, config.password)
+    return await _async_request(
+        client_session,
+        "GET",
+        url,
+        timeout,
+        _handle_response_bytes,
+        auth=auth,
+        limiter=limiter,
+        retry=retry,
+        breaker=breaker,
+    )
+
+
+async def _async_get_payload(
+    client_session: ClientSession,
+    config: ConfigObject,
+    url: URL,
+    timeout: float,
+    limiter: RequestLimiter | None,
+    retry: RetryPolicy | None,
+    breaker: CircuitBreaker | None,
+) -> tuple[bytes, str]:
+    """Like `async_get_raw_bytes`, but also return the encoding of the body's text."""
+    auth = BasicAuth(config.username, config.password)
+    return await _async_request(
+        client_session,
+        "GET",
+        url,
+        timeout,
+        _handle_response_payload,
+        auth=auth,
+        limiter=limiter,
+        retry=retry,
+        breaker=breaker,
+    )
 
 
 async def async_get_raw_state(
     client_session: ClientSession,
     config: ConfigObject,
     timeout: float = 10.0,
+    encoding: str | None = None,
+    limiter: RequestLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
 ) -> str:
     """Fetch the raw `/GetState.csv` body from the controller.
 
@@ -155,6 +476,10 @@ async def async_get_raw_state(
         client_session: An open `aiohttp.ClientSession`.
         config: Controller configuration including base URL and credentials.
         timeout: Per-request timeout in seconds.
+        encoding: Fixed encoding for the body; see `async_get_raw_data`.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
+        retry: Retry policy for transport failures; see `async_get_raw_data`.
+        breaker: Per-controller circuit breaker; see `async_get_raw_data`.
 
     Returns:
         The raw multi-line CSV body returned by the controller.
@@ -164,15 +489,29 @@ async def async_get_raw_state(
         BadStatusCodeException: On any other 4xx or 5xx response.
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors (DNS, connection reset).
+        CircuitOpenException: While ``breaker`` is open.
     """
     url = URL(config.base_url).with_path(API_PATH_GET_STATE)
-    return await async_get_raw_data(client_session, config, url, timeout=timeout)
+    return await async_get_raw_data(
+        client_session,
+        config,
+        url,
+        timeout=timeout,
+        encoding=encoding,
+        limiter=limiter,
+        retry=retry,
+        breaker=breaker,
+    )
 
 
 async def async_get_state(
     client_session: ClientSession,
     config: ConfigObject,
     timeout: float = 10.0,
+    previous_state: GetStateData | None = None,
+    limiter: RequestLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
 ) -> GetStateData:
     """Fetch and parse the controller's current state.
 
@@ -184,9 +523,19 @@ async def async_get_state(
         client_session: An open `aiohttp.ClientSession`.
         config: Controller configuration including base URL and credentials.
         timeout: Per-request timeout in seconds.
+        previous_state: The snapshot returned by the previous poll, if any.
+            When the new response body is byte-identical to the one this
+            snapshot was parsed from, parsing is skipped and
+            ``previous_state`` itself is returned. Callers can then detect
+            "nothing changed" with a cheap identity check
+            (``state is previous_state``).
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
+        retry: Retry policy for transport failures; see `async_get_raw_data`.
+        breaker: Per-controller circuit breaker; see `async_get_raw_data`.
 
     Returns:
-        A `GetStateData` instance with all properties populated.
+        A `GetStateData` instance with all properties populated, or
+        ``previous_state`` if the controller returned the same body again.
 
     Raises:
         BadCredentialsException: On HTTP 401 or 403.
@@ -194,9 +543,63 @@ async def async_get_state(
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors.
         InvalidPayloadException: If the response is empty or truncated.
+        CircuitOpenException: While ``breaker`` is open.
+    """
+    url = URL(config.base_url).with_path(API_PATH_GET_STATE)
+    raw_data, encoding = await _async_get_payload(
+        client_session, config, url, timeout, limiter, retry, breaker
+    )
+    if previous_state is not None and previous_state.matches_payload(raw_data):
+        return previous_state
+    return GetStateData.from_bytes(raw_data, encoding=encoding)
+
+
+class _SingleFlight[T]:
+    """Share one in-flight call between all concurrent callers.
+
+    The first caller starts the call as a task; callers arriving while it
+    runs await the same task and get the same result (or exception). Each
+    waiter is shielded, so one caller being cancelled does not cancel the
+    request the others are waiting on.
     """
-    raw_data = await async_get_raw_state(client_session, config, timeout=timeout)
-    return GetStateData(raw_data)
+
+    __slots__ = ("_task",)
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task[T] | None = None
+
+    async def run(self, call: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Join the in-flight call, or start ``call()`` if there is none."""
+        task = self._task
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._task = task
+            task.add_done_callback(self._done)
+        return await asyncio.shield(task)
+
+    @property
+    def in_flight(self) -> bool:
+        """True while a call is running."""
+        return self._task is not None
+
+    def forget(self) -> None:
+        """Make the next `run` start a new call instead of joining the current one."""
+        self._task = None
+
+    def cancel(self) -> asyncio.Task[T] | None:
+        """Cancel and forget the in-flight call; return its task so it can be awaited."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+        return task
+
+    def _done(self, task: asyncio.Task[T]) -> None:
+        if self._task is task:
+            self._task = None
+        if not task.cancelled():
+            # Every waiter may have been cancelled before the call failed;
+            # mark the exception as retrieved so asyncio does not log it.
+            task.exception()
 
 
 class GetState:
@@ -210,6 +613,16 @@ class GetState:
     this wrapper. Each method then accepts an optional per-call `timeout`
     that overrides the bound default when supplied.
 
+    With ``reuse_unchanged=True`` the wrapper remembers the last snapshot and
+    hands the same instance back whenever the controller returns an
+    identical body, skipping the parse entirely (see the ``previous_state``
+    argument of `async_get_state`).
+
+    Concurrent `async_get_state` calls on the same wrapper are coalesced:
+    while one request is in flight, further callers wait for it and receive
+    the same `GetStateData` instead of sending their own. A joining caller
+    shares the in-flight request's timeout, not its own.
+
     Example:
         ```python
         async with aiohttp.ClientSession() as session:
@@ -225,6 +638,11 @@ class GetState:
         client_session: ClientSession,
         config: ConfigObject,
         timeout: float = 10.0,
+        reuse_unchanged: bool = False,
+        encoding: str | None = None,
+        limiter: RequestLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
     ):
         """Bind the session, config, and default per-request timeout.
 
@@ -233,10 +651,28 @@ class GetState:
             config: Controller configuration.
             timeout: Default per-request timeout in seconds, used when a
                 method is called without its own ``timeout`` argument.
+            reuse_unchanged: If True, `async_get_state` returns the previous
+                `GetStateData` instance when the response body has not
+                changed since the last call.
+            encoding: Fixed encoding for `async_get_raw_state`; see
+                `async_get_raw_data`. ``None`` lets aiohttp pick one.
+            limiter: Per-controller request limiter applied to every
+                call; see `async_get_raw_data`.
+            retry: Retry policy for transport failures; see
+                `async_get_raw_data`.
+            breaker: Per-controller circuit breaker; see
+                `async_get_raw_data`.
         """
         self.client_session = client_session
         self.config = config
         self.timeout = timeout
+        self.limiter = limiter
+        self.retry = retry
+        self.breaker = breaker
+        self.reuse_unchanged = reuse_unchanged
+        self.encoding = encoding
+        self._last_state: GetStateData | None = None
+        self._state_flight: _SingleFlight[GetStateData] = _SingleFlight()
 
     async def async_get_raw_state(self, timeout: float | None = None) -> str:
         """Fetch the raw `/GetState.csv` body using the bound session and config.
@@ -252,6 +688,31 @@ class GetState:
             self.client_session,
             self.config,
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
+            retry=self.retry,
+            breaker=self.breaker,
+            encoding=self.encoding,
+        )
+
+    async def async_get_raw_bytes(self, timeout: float | None = None) -> bytes:
+        """Fetch the undecoded `/GetState.csv` body using the bound session and config.
+
+        Args:
+            timeout: Override for this call only. If ``None``, the timeout
+                bound in `__init__` is used.
+
+        See `async_get_raw_bytes` (the free function) for the full description
+        of behavior and raised exceptions.
+        """
+        url = URL(self.config.base_url).with_path(API_PATH_GET_STATE)
+        return await async_get_raw_bytes(
+            self.client_session,
+            self.config,
+            url,
+            timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
+            retry=self.retry,
+            breaker=self.breaker,
         )
 
     async def async_get_state(self, timeout: float | None = None) -> GetStateData:
@@ -264,11 +725,22 @@ class GetState:
         See `async_get_state` (the free function) for the full description of
         behavior and raised exceptions.
         """
-        return await async_get_state(
+        return await self._state_flight.run(functools.partial(self._async_fetch_state, timeout))
+
+    async def _async_fetch_state(self, timeout: float | None) -> GetStateData:
+        """Send the state request that concurrent callers share."""
+        state = await async_get_state(
             self.client_session,
             self.config,
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
+            retry=self.retry,
+            breaker=self.breaker,
+            previous_state=self._last_state if self.reuse_unchanged else None,
         )
+        if self.reuse_unchanged:
+            self._last_state = state
+        return state
 
 
 async def async_post_usrcfg_cgi(
@@ -276,6 +748,7 @@ async def async_post_usrcfg_cgi(
     config: ConfigObject,
     payload: str,
     timeout: float = 10.0,
+    limiter: RequestLimiter | None = None,
 ) -> str:
     """Send a form-encoded POST to `/usrcfg.cgi`.
 
@@ -289,6 +762,8 @@ async def async_post_usrcfg_cgi(
         config: Controller configuration including base URL and credentials.
         payload: The pre-encoded `application/x-www-form-urlencoded` body.
         timeout: Per-request timeout in seconds.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
+            Writes are queued ahead of waiting reads.
 
     Returns:
         The raw response body returned by the controller.
@@ -301,20 +776,18 @@ async def async_post_usrcfg_cgi(
     """
     url = URL(config.base_url).with_path(API_PATH_USRCFG)
     auth = BasicAuth(config.username, config.password)
-    headers = {"Content-Type": "application/x-www-form-urlencoded; charset=UTF-8"}
-    try:
-        async with asyncio.timeout(timeout):
-            async with client_session.post(
-                url=url,
-                headers=headers,
-                data=payload,
-                auth=auth,
-            ) as response:
-                return await _handle_response(response)
-    except TimeoutError as exc:
-        raise TimeoutException("API request timed out") from exc
-    except (ClientError, socket.gaierror) as exc:
-        raise ProconipApiException(f"API request failed ({exc})") from exc
+    return await _async_request(
+        client_session,
+        "POST",
+        url,
+        timeout,
+        _handle_response,
+        auth=auth,
+        headers=_USRCFG_HEADERS,
+        data=payload,
+        limiter=limiter,
+        write=True,
+    )
 
 
 async def async_switch_on(
@@ -323,6 +796,7 @@ async def async_switch_on(
     current_state: GetStateData,
     relay: Relay,
     timeout: float = 10.0,
+    limiter: RequestLimiter | None = None,
 ) -> str:
     """Switch a relay to manual ON.
 
@@ -342,11 +816,13 @@ async def async_switch_on(
             ENA bit field so that other relays keep their current state.
         relay: The relay to switch on.
         timeout: Per-request timeout in seconds.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
 
     Returns:
         The raw response body returned by `/usrcfg.cgi`.
 
     Raises:
+        ValueError: If ``current_state`` holds an invalid relay value.
         BadRelayException: If ``relay`` is one of the configured dosage
             control relays.
         BadCredentialsException: On HTTP 401 or 403.
@@ -354,17 +830,12 @@ async def async_switch_on(
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors.
     """
-    if current_state.is_dosage_relay(relay):
-        raise BadRelayException("Cannot permanently switch on a dosage relay")
-    bit_state = current_state.determine_overall_relay_bit_state()
-    relay_bit_mask = relay.get_bit_mask()
-    bit_state[0] |= relay_bit_mask
-    bit_state[1] |= relay_bit_mask
     return await async_post_usrcfg_cgi(
         client_session=client_session,
         config=config,
-        payload=f"ENA={bit_state[0]},{bit_state[1]}&MANUAL=1",
+        payload=_relay_payload(current_state, [(relay, RelayMode.ON)]),
         timeout=timeout,
+        limiter=limiter,
     )
 
 
@@ -374,6 +845,7 @@ async def async_switch_off(
     current_state: GetStateData,
     relay: Relay,
     timeout: float = 10.0,
+    limiter: RequestLimiter | None = None,
 ) -> str:
     """Switch a relay to manual OFF.
 
@@ -389,25 +861,24 @@ async def async_switch_off(
             ENA bit field.
         relay: The relay to switch off.
         timeout: Per-request timeout in seconds.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
 
     Returns:
         The raw response body returned by `/usrcfg.cgi`.
 
     Raises:
+        ValueError: If ``current_state`` holds an invalid relay value.
         BadCredentialsException: On HTTP 401 or 403.
         BadStatusCodeException: On any other 4xx or 5xx response.
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors.
     """
-    bit_state = current_state.determine_overall_relay_bit_state()
-    relay_bit_mask = relay.get_bit_mask()
-    bit_state[0] |= relay_bit_mask
-    bit_state[1] &= ~relay_bit_mask
     return await async_post_usrcfg_cgi(
         client_session=client_session,
         config=config,
-        payload=f"ENA={bit_state[0]},{bit_state[1]}&MANUAL=1",
+        payload=_relay_payload(current_state, [(relay, RelayMode.OFF)]),
         timeout=timeout,
+        limiter=limiter,
     )
 
 
@@ -417,6 +888,7 @@ async def async_set_auto_mode(
     current_state: GetStateData,
     relay: Relay,
     timeout: float = 10.0,
+    limiter: RequestLimiter | None = None,
 ) -> str:
     """Hand a relay back to the controller's automatic schedule.
 
@@ -431,25 +903,82 @@ async def async_set_auto_mode(
             ENA bit field.
         relay: The relay to put back into auto mode.
         timeout: Per-request timeout in seconds.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
+
+    Returns:
+        The raw response body returned by `/usrcfg.cgi`.
+
+    Raises:
+        ValueError: If ``current_state`` holds an invalid relay value.
+        BadCredentialsException: On HTTP 401 or 403.
+        BadStatusCodeException: On any other 4xx or 5xx response.
+        TimeoutException: If the exchange exceeds ``timeout`` seconds.
+        ProconipApiException: For network-level errors.
+    """
+    return await async_post_usrcfg_cgi(
+        client_session=client_session,
+        config=config,
+        payload=_relay_payload(current_state, [(relay, RelayMode.AUTO)]),
+        timeout=timeout,
+        limiter=limiter,
+    )
+
+
+async def async_apply_relay_changes(
+    client_session: ClientSession,
+    config: ConfigObject,
+    current_state: GetStateData,
+    changes: Mapping[int, RelayMode],
+    timeout: float = 10.0,
+    limiter: RequestLimiter | None = None,
+) -> str:
+    """Switch several relays with a single `/usrcfg.cgi` write.
+
+    The ENA bit field covers every relay at once, so any number of ON, OFF
+    and AUTO changes fit into one POST instead of one read-modify-write
+    round trip per relay. Relays not in ``changes`` keep the state they have
+    in ``current_state``.
+
+    The whole batch is validated first; if any change is rejected, nothing
+    is sent.
+
+    Args:
+        client_session: An open `aiohttp.ClientSession`.
+        config: Controller configuration.
+        current_state: A recent `GetStateData` snapshot used to compute the
+            ENA bit field.
+        changes: Target `RelayMode` per aggregated relay ID (0–15).
+        timeout: Per-request timeout in seconds.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
 
     Returns:
         The raw response body returned by `/usrcfg.cgi`.
 
     Raises:
+        ValueError: If ``changes`` is empty or holds an unknown mode, or
+            ``current_state`` holds an invalid relay value.
+        IndexError: If a relay ID is outside the 0–15 range, or names an
+            external relay (8–15) while the relay extension is disabled.
+        BadRelayException: If `RelayMode.ON` is requested for a dosage relay.
         BadCredentialsException: On HTTP 401 or 403.
         BadStatusCodeException: On any other 4xx or 5xx response.
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors.
+
+    Example:
+        ```python
+        await async_apply_relay_changes(
+            session, config, state, {0: RelayMode.ON, 3: RelayMode.OFF, 5: RelayMode.AUTO}
+        )
+        ```
     """
-    bit_state = current_state.determine_overall_relay_bit_state()
-    relay_bit_mask = relay.get_bit_mask()
-    bit_state[0] &= ~relay_bit_mask
-    bit_state[1] &= ~relay_bit_mask
+    payload = _relay_payload(current_state, _resolve_relay_changes(current_state, changes))
     return await async_post_usrcfg_cgi(
         client_session=client_session,
         config=config,
-        payload=f"ENA={bit_state[0]},{bit_state[1]}&MANUAL=1",
+        payload=payload,
         timeout=timeout,
+        limiter=limiter,
     )
 
 
@@ -480,6 +1009,7 @@ class RelaySwitch:
         client_session: ClientSession,
         config: ConfigObject,
         timeout: float = 10.0,
+        limiter: RequestLimiter | None = None,
     ):
         """Bind the session, config, and default per-request timeout.
 
@@ -488,10 +1018,13 @@ class RelaySwitch:
             config: Controller configuration.
             timeout: Default per-request timeout in seconds, used when a
                 method is called without its own ``timeout`` argument.
+            limiter: Per-controller request limiter applied to every
+                call; see `async_get_raw_data`.
         """
         self.client_session = client_session
         self.config = config
         self.timeout = timeout
+        self.limiter = limiter
 
     async def async_switch_on(
         self,
@@ -518,6 +1051,7 @@ class RelaySwitch:
             current_state=current_state,
             relay=current_state.get_relay(relay_id),
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
         )
 
     async def async_switch_off(
@@ -544,6 +1078,7 @@ class RelaySwitch:
             current_state=current_state,
             relay=current_state.get_relay(relay_id),
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
         )
 
     async def async_set_auto_mode(
@@ -570,6 +1105,33 @@ class RelaySwitch:
             current_state=current_state,
             relay=current_state.get_relay(relay_id),
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
+        )
+
+    async def async_apply_changes(
+        self,
+        current_state: GetStateData,
+        changes: Mapping[int, RelayMode],
+        timeout: float | None = None,
+    ) -> str:
+        """Switch several relays, keyed by aggregated relay ID, in one write.
+
+        Args:
+            current_state: A recent `GetStateData` snapshot.
+            changes: Target `RelayMode` per aggregated relay ID (0–15).
+            timeout: Override for this call only. If ``None``, the timeout
+                bound in `__init__` is used.
+
+        Delegates to the free function `async_apply_relay_changes`. See it
+        for the full description of behavior and raised exceptions.
+        """
+        return await async_apply_relay_changes(
+            client_session=self.client_session,
+            config=self.config,
+            current_state=current_state,
+            changes=changes,
+            timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
         )
 
 
@@ -579,6 +1141,7 @@ async def async_start_dosage(
     dosage_target: DosageTarget,
     dosage_duration: int,
     timeout: float = 10.0,
+    limiter: RequestLimiter | None = None,
 ) -> str:
     """Trigger a manual, time-limited dosage on the controller.
 
@@ -596,6 +1159,7 @@ async def async_start_dosage(
             controller's own dosage configuration; values that exceed the
             configured maximum are typically clamped silently by the device.
         timeout: Per-request timeout in seconds.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
 
     Returns:
         The raw response body returned by `/Command.htm`.
@@ -606,9 +1170,19 @@ async def async_start_dosage(
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors.
     """
-    query = f"MAN_DOSAGE={dosage_target},{dosage_duration}"
+    query = _dosage_query(dosage_target, dosage_duration)
     url = URL(config.base_url).with_path(API_PATH_COMMAND).with_query(query)
-    return await async_get_raw_data(client_session, config, url, timeout=timeout)
+    auth = BasicAuth(config.username, config.password)
+    return await _async_request(
+        client_session,
+        "GET",
+        url,
+        timeout,
+        _handle_response,
+        auth=auth,
+        limiter=limiter,
+        write=True,
+    )
 
 
 class DosageControl:
@@ -634,6 +1208,7 @@ class DosageControl:
         client_session: ClientSession,
         config: ConfigObject,
         timeout: float = 10.0,
+        limiter: RequestLimiter | None = None,
     ):
         """Bind the session, config, and default per-request timeout.
 
@@ -642,10 +1217,13 @@ class DosageControl:
             config: Controller configuration.
             timeout: Default per-request timeout in seconds, used when a
                 method is called without its own ``timeout`` argument.
+            limiter: Per-controller request limiter applied to every
+                call; see `async_get_raw_data`.
         """
         self.client_session = client_session
         self.config = config
         self.timeout = timeout
+        self.limiter = limiter
 
     async def async_chlorine_dosage(
         self, dosage_duration: int, timeout: float | None = None
@@ -667,6 +1245,7 @@ class DosageControl:
             dosage_target=DosageTarget.CHLORINE,
             dosage_duration=dosage_duration,
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
         )
 
     async def async_ph_minus_dosage(
@@ -689,6 +1268,7 @@ class DosageControl:
             dosage_target=DosageTarget.PH_MINUS,
             dosage_duration=dosage_duration,
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
         )
 
     async def async_ph_plus_dosage(self, dosage_duration: int, timeout: float | None = None) -> str:
@@ -709,6 +1289,7 @@ class DosageControl:
             dosage_target=DosageTarget.PH_PLUS,
             dosage_duration=dosage_duration,
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
         )
 
 
@@ -716,6 +1297,10 @@ async def async_get_raw_dmx(
     client_session: ClientSession,
     config: ConfigObject,
     timeout: float = 10.0,
+    encoding: str | None = None,
+    limiter: RequestLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
 ) -> str:
     """Fetch the raw `/GetDmx.csv` body — the current 16 DMX channel values.
 
@@ -726,6 +1311,10 @@ async def async_get_raw_dmx(
         client_session: An open `aiohttp.ClientSession`.
         config: Controller configuration.
         timeout: Per-request timeout in seconds.
+        encoding: Fixed encoding for the body; see `async_get_raw_data`.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
+        retry: Retry policy for transport failures; see `async_get_raw_data`.
+        breaker: Per-controller circuit breaker; see `async_get_raw_data`.
 
     Returns:
         A single CSV line containing the 16 channel values.
@@ -735,15 +1324,28 @@ async def async_get_raw_dmx(
         BadStatusCodeException: On any other 4xx or 5xx response.
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors.
+        CircuitOpenException: While ``breaker`` is open.
     """
     url = URL(config.base_url).with_path(API_PATH_GET_DMX)
-    return await async_get_raw_data(client_session, config, url, timeout=timeout)
+    return await async_get_raw_data(
+        client_session,
+        config,
+        url,
+        timeout=timeout,
+        encoding=encoding,
+        limiter=limiter,
+        retry=retry,
+        breaker=breaker,
+    )
 
 
 async def async_get_dmx(
     client_session: ClientSession,
     config: ConfigObject,
     timeout: float = 10.0,
+    limiter: RequestLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    breaker: CircuitBreaker | None = None,
 ) -> GetDmxData:
     """Fetch and parse the controller's DMX channel state.
 
@@ -755,6 +1357,9 @@ async def async_get_dmx(
         client_session: An open `aiohttp.ClientSession`.
         config: Controller configuration.
         timeout: Per-request timeout in seconds.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
+        retry: Retry policy for transport failures; see `async_get_raw_data`.
+        breaker: Per-controller circuit breaker; see `async_get_raw_data`.
 
     Returns:
         A `GetDmxData` containing all 16 DMX channels.
@@ -765,11 +1370,13 @@ async def async_get_dmx(
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors.
         InvalidPayloadException: If the response is empty.
+        CircuitOpenException: While ``breaker`` is open.
     """
-    raw_data = await async_get_raw_dmx(
-        client_session=client_session, config=config, timeout=timeout
+    url = URL(config.base_url).with_path(API_PATH_GET_DMX)
+    raw_data, encoding = await _async_get_payload(
+        client_session, config, url, timeout, limiter, retry, breaker
     )
-    return GetDmxData(raw_data)
+    return GetDmxData.from_bytes(raw_data, encoding=encoding)
 
 
 async def async_set_dmx(
@@ -777,6 +1384,7 @@ async def async_set_dmx(
     config: ConfigObject,
     dmx_states: GetDmxData,
     timeout: float = 10.0,
+    limiter: RequestLimiter | None = None,
 ) -> str:
     """Push DMX channel values back to the controller.
 
@@ -789,6 +1397,7 @@ async def async_set_dmx(
         config: Controller configuration.
         dmx_states: The full DMX state to write. All 16 channels are sent.
         timeout: Per-request timeout in seconds.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
 
     Returns:
         The raw response body returned by `/usrcfg.cgi`.
@@ -799,12 +1408,12 @@ async def async_set_dmx(
         TimeoutException: If the exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors.
     """
-    payload = "&".join(f"{k}={v}" for k, v in dmx_states.post_data.items())
     return await async_post_usrcfg_cgi(
         client_session=client_session,
         config=config,
-        payload=payload,
+        payload=_dmx_payload(dmx_states),
         timeout=timeout,
+        limiter=limiter,
     )
 
 
@@ -833,6 +1442,8 @@ class DmxControl:
         client_session: ClientSession,
         config: ConfigObject,
         timeout: float = 10.0,
+        encoding: str | None = None,
+        limiter: RequestLimiter | None = None,
     ):
         """Bind the session, config, and default per-request timeout.
 
@@ -841,10 +1452,16 @@ class DmxControl:
             config: Controller configuration.
             timeout: Default per-request timeout in seconds, used when a
                 method is called without its own ``timeout`` argument.
+            encoding: Fixed encoding for `async_get_raw_dmx`; see
+                `async_get_raw_data`. ``None`` lets aiohttp pick one.
+            limiter: Per-controller request limiter applied to every
+                call; see `async_get_raw_data`.
         """
         self.client_session = client_session
         self.config = config
         self.timeout = timeout
+        self.limiter = limiter
+        self.encoding = encoding
 
     async def async_get_raw_dmx(self, timeout: float | None = None) -> str:
         """Fetch the raw `/GetDmx.csv` body using the bound session and config.
@@ -860,6 +1477,8 @@ class DmxControl:
             self.client_session,
             self.config,
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
+            encoding=self.encoding,
         )
 
     async def async_get_dmx(self, timeout: float | None = None) -> GetDmxData:
@@ -876,6 +1495,7 @@ class DmxControl:
             self.client_session,
             self.config,
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
         )
 
     async def async_set(self, data: GetDmxData, timeout: float | None = None) -> str:
@@ -894,6 +1514,7 @@ class DmxControl:
             config=self.config,
             dmx_states=data,
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
         )
 
 
@@ -907,6 +1528,7 @@ async def async_trigger_digital_input(
     digital_input_id: int,
     timeout: float = 10.0,
     hold_seconds: float = DIGITAL_INPUT_PULSE_SECONDS,
+    limiter: RequestLimiter | None = None,
 ) -> str:
     """Trigger (momentarily pulse) a digital input via the WEBIO ``IO`` field.
 
@@ -935,6 +1557,7 @@ async def async_trigger_digital_input(
             POSTs.
         hold_seconds: Seconds to hold the input HIGH between the press and
             release POSTs. Defaults to the web UI's ~600ms.
+        limiter: Per-controller request limiter; see `async_get_raw_data`.
 
     Returns:
         The raw response body returned by the release POST.
@@ -946,17 +1569,27 @@ async def async_trigger_digital_input(
         TimeoutException: If an exchange exceeds ``timeout`` seconds.
         ProconipApiException: For network-level errors.
     """
+    return await _async_pulse_digital_input(
+        functools.partial(
+            async_post_usrcfg_cgi, client_session, config, timeout=timeout, limiter=limiter
+        ),
+        digital_input_id,
+        hold_seconds,
+    )
+
+
+async def _async_pulse_digital_input(
+    post: Callable[[str], Awaitable[str]],
+    digital_input_id: int,
+    hold_seconds: float,
+) -> str:
+    """Press, hold and release a digital input, sending each write through ``post``."""
     if not 0 <= digital_input_id < DIGITAL_INPUT_COUNT:
         raise ValueError(
             f"digital_input_id must be in 0..{DIGITAL_INPUT_COUNT - 1}, got {digital_input_id}"
         )
     mask = 1 << digital_input_id
-    await async_post_usrcfg_cgi(
-        client_session=client_session,
-        config=config,
-        payload=f"IO={mask}&WEBIO=1",
-        timeout=timeout,
-    )
+    await post(f"IO={mask}&WEBIO=1")
     try:
         await asyncio.sleep(hold_seconds)
     except asyncio.CancelledError:
@@ -964,19 +1597,9 @@ async def async_trigger_digital_input(
         # asserted HIGH. Networking inside a cancellation is awkward, so this
         # is a best effort, not a guarantee.
         with contextlib.suppress(Exception):
-            await async_post_usrcfg_cgi(
-                client_session=client_session,
-                config=config,
-                payload="IO=0&WEBIO=1",
-                timeout=timeout,
-            )
+            await post("IO=0&WEBIO=1")
         raise
-    return await async_post_usrcfg_cgi(
-        client_session=client_session,
-        config=config,
-        payload="IO=0&WEBIO=1",
-        timeout=timeout,
-    )
+    return await post("IO=0&WEBIO=1")
 
 
 class DigitalInputControl:
@@ -1002,6 +1625,7 @@ class DigitalInputControl:
         client_session: ClientSession,
         config: ConfigObject,
         timeout: float = 10.0,
+        limiter: RequestLimiter | None = None,
     ):
         """Bind the session, config, and default per-request timeout.
 
@@ -1010,10 +1634,13 @@ class DigitalInputControl:
             config: Controller configuration.
             timeout: Default per-request timeout in seconds, used when a method
                 is called without its own ``timeout`` argument.
+            limiter: Per-controller request limiter applied to every
+                call; see `async_get_raw_data`.
         """
         self.client_session = client_session
         self.config = config
         self.timeout = timeout
+        self.limiter = limiter
 
     async def async_trigger(
         self,
@@ -1038,5 +1665,6 @@ class DigitalInputControl:
             config=self.config,
             digital_input_id=digital_input_id,
             timeout=self.timeout if timeout is None else timeout,
+            limiter=self.limiter,
             hold_seconds=hold_seconds,
         )
@@ -0,0 +1,1155 @@
+"""Long-lived, all-in-one client for a single ProCon.IP controller.
+
+The free functions and OO wrappers in `proconip.api` take (or bind) a session
+and `ConfigObject` and work everything else out per call: a fresh
+`aiohttp.BasicAuth`, the endpoint URL, the request headers. That keeps them
+simple and composable, but an integration that polls one controller every
+few seconds for months pays for the same setup on every request.
+
+`ProconipClient` does that setup once. It pre-encodes the ``Authorization``
+header, builds the endpoint URLs up front, and either owns a
+`aiohttp.ClientSession` with a keep-alive connector tuned for a single small
+embedded web server or borrows one the caller already has. Every operation the
+`proconip.api` module offers is available as a method, with the same
+semantics and exceptions.
+"""
+
+import asyncio
+import contextlib
+import copy
+import functools
+import math
+import time
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable, Mapping
+from types import TracebackType
+from typing import Any, Self
+
+from aiohttp import BasicAuth, ClientSession, ClientTimeout, TCPConnector
+from yarl import URL
+
+from .api import (
+    _USRCFG_HEADERS,
+    DIGITAL_INPUT_PULSE_SECONDS,
+    _async_pulse_digital_input,
+    _async_request,
+    _dmx_payload,
+    _dosage_query,
+    _ena_payload,
+    _handle_response,
+    _handle_response_payload,
+    _relay_bits,
+    _resolve_relay_changes,
+    _SingleFlight,
+)
+from .definitions import (
+    API_PATH_COMMAND,
+    API_PATH_GET_DMX,
+    API_PATH_GET_STATE,
+    API_PATH_USRCFG,
+    BadRelayException,
+    ConfigObject,
+    DosageTarget,
+    GetDmxData,
+    GetStateData,
+    RelayMode,
+)
+from .limiter import RequestLimiter
+from .resilience import CircuitBreaker, RetryPolicy
+
+# Connection pool defaults for an owned session. The controller is a small
+# embedded device that handles very few sockets at once, so a couple of
+# kept-alive connections is both enough and polite.
+DEFAULT_CONNECTION_LIMIT = 2
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+
+# Seconds between polls of `ProconipClient.watch` unless told otherwise.
+DEFAULT_WATCH_INTERVAL = 5.0
+
+# Queued to every subscriber when the client closes, ending its iteration.
+_WATCH_CLOSED = object()
+
+
+class AdaptiveInterval:
+    """Poll interval that tightens while the state changes and relaxes while it does not.
+
+    Every change snaps the interval back to ``min_interval``; every unchanged
+    poll multiplies it by ``backoff``, up to ``max_interval``. Pass one to
+    `ProconipClient` to drive its `watch`/`subscribe` poll loop.
+
+    Example:
+        ```python
+        schedule = AdaptiveInterval(min_interval=2, max_interval=60)
+        async with ProconipClient(config, adaptive_interval=schedule) as client:
+            async for state in client.watch():
+                ...
+        ```
+    """
+
+    __slots__ = ("min_interval", "max_interval", "backoff", "_current")
+
+    def __init__(self, min_interval: float, max_interval: float, backoff: float = 2.0):
+        """Set the bounds and growth factor.
+
+        Raises:
+            ValueError: If ``min_interval`` is not positive, ``max_interval``
+                is below it, or ``backoff`` is below 1.
+        """
+        if min_interval <= 0:
+            raise ValueError(f"min_interval must be positive, got {min_interval}")
+        if max_interval < min_interval:
+            raise ValueError(
+                f"max_interval ({max_interval}) must not be below min_interval ({min_interval})"
+            )
+        if backoff < 1:
+            raise ValueError(f"backoff must be at least 1, got {backoff}")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self._current = min_interval
+
+    @property
+    def current(self) -> float:
+        """The interval most recently handed out."""
+        return self._current
+
+    def next(self, changed: bool) -> float:
+        """Return the delay before the next poll, given whether this poll saw a change."""
+        if changed:
+            self._current = self.min_interval
+        else:
+            self._current = min(self._current * self.backoff, self.max_interval)
+        return self._current
+
+    def reset(self) -> None:
+        """Go back to ``min_interval``, e.g. after the client wrote to the controller."""
+        self._current = self.min_interval
+
+
+class _SnapshotCache[T]:
+    """The last snapshot read from one endpoint, and when it was read.
+
+    ``generation`` is bumped on every invalidation, so a fetch that was
+    started before a write cannot store its (possibly outdated) result
+    afterwards.
+    """
+
+    __slots__ = ("value", "fetched_at", "generation")
+
+    def __init__(self) -> None:
+        self.value: T | None = None
+        self.fetched_at = 0.0
+        self.generation = 0
+
+    def store(self, value: T, generation: int) -> None:
+        """Remember ``value`` unless the cache was invalidated since ``generation``."""
+        if generation == self.generation:
+            self.value = value
+            self.fetched_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Drop the snapshot and discard results of fetches still in flight."""
+        self.value = None
+        self.generation += 1
+
+
+class _RelayModel:
+    """The last known ENA bitmaps of the relays, and when they were last known.
+
+    Reads record the bitmaps of each parsed snapshot, successful relay writes
+    record the bitmaps they sent; ``written_at`` is when the latter last
+    happened. ``reference`` is the snapshot the relay layout and the dosage
+    relay assignment are taken from. Like `_SnapshotCache`, ``generation``
+    keeps a read that was started before a write from overwriting the
+    written bitmaps.
+    """
+
+    __slots__ = ("reference", "bit_state", "updated_at", "written_at", "generation")
+
+    def __init__(self) -> None:
+        self.reference: GetStateData | None = None
+        self.bit_state: tuple[int, int] | None = None
+        self.updated_at = 0.0
+        self.written_at = 0.0
+        self.generation = 0
+
+    def observe(self, state: GetStateData, generation: int) -> None:
+        """Take the bitmaps of a freshly read ``state`` unless written to since ``generation``.
+
+        A snapshot with an invalid relay value leaves the relay state
+        unknown, so the bitmaps are forgotten rather than written back later.
+        """
+        if generation == self.generation:
+            try:
+                manual_bits, on_bits = state.determine_overall_relay_bit_state()
+            except ValueError:
+                self.reference = None
+                self.bit_state = None
+                return
+            self.reference = state
+            self.bit_state = (manual_bits, on_bits)
+            self.updated_at = time.monotonic()
+
+    def apply(self, reference: GetStateData, bit_state: tuple[int, int]) -> None:
+        """Record the bitmaps the controller accepted in an ENA write."""
+        self.reference = reference
+        self.bit_state = bit_state
+        self.updated_at = self.written_at = time.monotonic()
+        self.generation += 1
+
+    def invalidate(self) -> None:
+        """Forget the bitmaps, e.g. after a write whose outcome is unknown."""
+        self.reference = None
+        self.bit_state = None
+        self.generation += 1
+
+    def known(self) -> tuple[GetStateData, tuple[int, int]] | None:
+        """Return ``(reference, bit_state)`` if known at all, however old."""
+        if self.reference is None or self.bit_state is None:
+            return None
+        return self.reference, self.bit_state
+
+    def fresh(self, max_age: float) -> tuple[GetStateData, tuple[int, int]] | None:
+        """Return ``(reference, bit_state)`` if known for at most ``max_age`` seconds."""
+        if time.monotonic() - self.updated_at > max_age:
+            return None
+        return self.known()
+
+
+class _RelayRequest:
+    """One caller's relay changes waiting in the write sequencer, and its outcome."""
+
+    __slots__ = ("current_state", "changes", "future")
+
+    def __init__(
+        self,
+        current_state: GetStateData | None,
+        changes: Mapping[int, RelayMode],
+        future: asyncio.Future[str],
+    ) -> None:
+        self.current_state = current_state
+        self.changes = changes
+        self.future = future
+
+
+class _Subscription:
+    """One `ProconipClient.watch` consumer: its bounded queue and preferences."""
+
+    __slots__ = ("interval", "raise_errors", "queue")
+
+    def __init__(self, interval: float, queue_size: int, raise_errors: bool) -> None:
+        self.interval = interval
+        self.raise_errors = raise_errors
+        self.queue: asyncio.Queue[object] = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, item: object) -> None:
+        """Queue ``item`` without blocking, evicting the oldest entry if full."""
+        if isinstance(item, Exception) and not self.raise_errors:
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+
+
+class _ColumnSubscription:
+    """One `ProconipClient.subscribe` consumer: selected columns and their deadbands.
+
+    Keeps the values last reported per column and compares each polled
+    snapshot against them as one array, so no `DataObject` is ever built.
+    """
+
+    __slots__ = (
+        "interval",
+        "_callback",
+        "_columns",
+        "_categories",
+        "_absolute",
+        "_relative",
+        "_selected",
+        "_reported",
+    )
+
+    def __init__(
+        self,
+        callback: Callable[[GetStateData, tuple[int, ...]], object],
+        columns: tuple[int, ...],
+        categories: tuple[str, ...],
+        absolute: float,
+        relative: float,
+        interval: float,
+    ) -> None:
+        self.interval = interval
+        self._callback = callback
+        self._columns = columns
+        self._categories = categories
+        self._absolute = absolute
+        self._relative = relative
+        self._selected: tuple[int, ...] | None = None
+        self._reported: list[float] | None = None
+
+    def offer(self, item: object) -> None:
+        """Report the columns of ``item`` that moved beyond their deadband.
+
+        Errors from resolving the columns or from the callback are passed to
+        the event loop's exception handler so they cannot stop the poll loop.
+        """
+        if not isinstance(item, GetStateData):
+            return
+        try:
+            selected = self._selected
+            if selected is None:
+                # Columns first, then categories; duplicates keep their first position.
+                unique = dict.fromkeys(self._columns)
+                for category in self._categories:
+                    unique.update(dict.fromkeys(item.category_columns(category)))
+                selected = self._selected = tuple(unique)
+            values = item.values_at(selected)
+            reported = self._reported
+            if reported is None:
+                self._reported = values.tolist()
+                changed = selected
+            else:
+                absolute = self._absolute
+                relative = self._relative
+                # NaN fails every comparison, so a column turning NaN or
+                # recovering from it is checked for separately.
+                moved = [
+                    index
+                    for index, (new, old) in enumerate(zip(values, reported))
+                    if math.isnan(new) != math.isnan(old)
+                    or abs(new - old) > max(absolute, relative * abs(old))
+                ]
+                if not moved:
+                    return
+                for index in moved:
+                    reported[index] = values[index]
+                changed = tuple(selected[index] for index in moved)
+            self._callback(item, changed)
+        except Exception as exc:
+            asyncio.get_running_loop().call_exception_handler(
+                {"message": "ProconipClient subscription callback failed", "exception": exc}
+            )
+
+
+class ProconipClient:
+    """Async context manager bundling every controller operation.
+
+    Use it as ``async with ProconipClient(config) as client: ...``. On entry a
+    session is created (unless one was passed in), on exit it is closed again.
+    A borrowed session is never closed by the client.
+
+    The constructor binds a default `timeout` for every call. Each method
+    accepts an optional per-call `timeout` that overrides it, exactly like
+    the wrappers in `proconip.api`.
+
+    Concurrent `async_get_state` calls share one in-flight request and all
+    receive the same `GetStateData`. Any write through the client detaches
+    the in-flight read, so a read issued after a write always sees a fresh
+    request.
+
+    Passing ``cache_max_age`` turns on a snapshot cache for `async_get_state`
+    and `async_get_dmx`. A snapshot younger than ``cache_max_age`` seconds is
+    returned without contacting the controller. An older one is still
+    returned immediately, while a single background request refreshes it
+    (stale-while-revalidate); ``cache_max_stale`` caps how far past
+    ``cache_max_age`` that is allowed before callers wait for a fresh read
+    again. Writes made through the client invalidate the state snapshot, and
+    `async_set_dmx` replaces the DMX snapshot with the values just written.
+    Errors of background refreshes are dropped; the snapshot simply stays
+    stale until a refresh succeeds.
+
+    `watch` turns the client into a state stream. However many consumers
+    iterate it, the client runs a single poll loop and hands every new
+    snapshot to each of them. `subscribe` hooks callbacks into the same loop
+    that only fire when selected columns change by more than a deadband.
+    With an `AdaptiveInterval` the loop polls faster while readings change
+    and backs off while they stay put. A write through the client wakes the
+    loop for an immediate poll either way.
+
+    The client also keeps a local model of the relay bitmaps, fed by every
+    state read and every successful relay write. Pass ``None`` as
+    ``current_state`` to the relay methods to write against that model
+    instead of a snapshot of your own: while the model is younger than
+    ``relay_state_max_age`` seconds, a relay switch costs a single POST;
+    otherwise the state is read first.
+
+    Relay writes are serialized. While one ENA write is in flight, further
+    relay changes queue up and are then merged, in call order, into a
+    single write, so concurrent calls built from the same snapshot no longer
+    undo each other. A snapshot passed as ``current_state`` is used as is,
+    unless the client has written the relays since it last handed out a
+    snapshot and that write is younger than ``relay_state_max_age``: then
+    the snapshot cannot know about the write, and the change is applied to
+    the relay model instead.
+
+    Example:
+        ```python
+        async with ProconipClient(config) as client:
+            state = await client.async_get_state()
+            await client.async_switch_on(state, relay_id=2)
+            await client.async_start_dosage(DosageTarget.CHLORINE, 60)
+        ```
+    """
+
+    def __init__(
+        self,
+        config: ConfigObject,
+        client_session: ClientSession | None = None,
+        timeout: float = 10.0,
+        reuse_unchanged: bool = False,
+        encoding: str | None = None,
+        connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        cache_max_age: float | None = None,
+        cache_max_stale: float | None = None,
+        adaptive_interval: AdaptiveInterval | None = None,
+        relay_state_max_age: float | None = None,
+        limiter: RequestLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        """Precompute the auth header and URLs, and remember how to get a session.
+
+        Args:
+            config: Controller configuration.
+            client_session: An open `aiohttp.ClientSession` to borrow. If
+                ``None``, the client creates its own on entry and closes it
+                on exit.
+            timeout: Default per-request timeout in seconds.
+            reuse_unchanged: If True, `async_get_state` returns the previous
+                `GetStateData` instance when the response body has not
+                changed (see `proconip.api.async_get_state`).
+            encoding: Fixed encoding for the raw text reads; ``None`` lets
+                aiohttp pick one.
+            connection_limit: Maximum simultaneous connections of an owned
+                session. Ignored for a borrowed session.
+            keepalive_timeout: Seconds an idle connection of an owned
+                session is kept open for reuse. Ignored for a borrowed
+                session.
+            cache_max_age: Seconds a state or DMX snapshot counts as fresh.
+                ``None`` (the default) disables the cache.
+            cache_max_stale: Seconds past ``cache_max_age`` a stale snapshot
+                may still be served while it is refreshed in the
+                background. ``None`` serves it no matter how old.
+            adaptive_interval: Schedule for the `watch`/`subscribe` poll
+                loop. When set, it replaces the intervals requested by the
+                individual consumers.
+            relay_state_max_age: Seconds the local relay model may be used
+                for relay writes, instead of reading the state first or
+                trusting a ``current_state`` older than the client's last
+                relay write. ``None`` (the default) never uses the model:
+                writes without ``current_state`` read the state first.
+            limiter: Per-controller request limiter every request of the
+                client waits for; writes are queued ahead of polls. Share
+                it with anything else talking to the same controller.
+            retry: Retry policy for reads that hit a timeout or network
+                error (see `proconip.resilience.RetryPolicy`). Writes are
+                never retried.
+            breaker: Per-controller circuit breaker consulted before every
+                request (see `proconip.resilience.CircuitBreaker`).
+        """
+        self.config = config
+        self.timeout = timeout
+        self.reuse_unchanged = reuse_unchanged
+        self.encoding = encoding
+        self._session = client_session
+        self._owns_session = client_session is None
+        self._connection_limit = connection_limit
+        self._keepalive_timeout = keepalive_timeout
+        self._last_state: GetStateData | None = None
+        self.cache_max_age = cache_max_age
+        self.cache_max_stale = cache_max_stale
+        self._state_flight: _SingleFlight[GetStateData] = _SingleFlight()
+        self._dmx_flight: _SingleFlight[GetDmxData] = _SingleFlight()
+        self._state_cache: _SnapshotCache[GetStateData] = _SnapshotCache()
+        self._dmx_cache: _SnapshotCache[GetDmxData] = _SnapshotCache()
+        self._background: set[asyncio.Future[Any]] = set()
+        self._subscriptions: set[_Subscription | _ColumnSubscription] = set()
+        self._poll_task: asyncio.Task[None] | None = None
+        self._watched_state: GetStateData | None = None
+        self.adaptive_interval = adaptive_interval
+        self._poll_wakeup = asyncio.Event()
+        self.relay_state_max_age = relay_state_max_age
+        self.limiter = limiter
+        self.retry = retry
+        self.breaker = breaker
+        self._relay_model = _RelayModel()
+        self._state_handed_out_at = 0.0
+        self._relay_lock = asyncio.Lock()
+        self._relay_queue: list[_RelayRequest] = []
+
+        base_url = URL(config.base_url)
+        self._state_url = base_url.with_path(API_PATH_GET_STATE)
+        self._dmx_url = base_url.with_path(API_PATH_GET_DMX)
+        self._usrcfg_url = base_url.with_path(API_PATH_USRCFG)
+        self._command_url = base_url.with_path(API_PATH_COMMAND)
+        authorization = BasicAuth(config.username, config.password).encode()
+        self._get_headers = {"Authorization": authorization}
+        self._post_headers = {**_USRCFG_HEADERS, "Authorization": authorization}
+        self._text_handler = (
+            _handle_response
+            if encoding is None
+            else functools.partial(_handle_response, encoding=encoding)
+        )
+
+    async def __aenter__(self) -> Self:
+        """Create the owned session if needed and return the client."""
+        if self._session is None:
+            connector = TCPConnector(
+                limit=self._connection_limit,
+                limit_per_host=self._connection_limit,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            # Per-request deadlines come from asyncio.timeout around each
+            # call, so the session-wide timeout is switched off.
+            self._session = ClientSession(connector=connector, timeout=ClientTimeout(total=None))
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the session if the client owns it."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Stop background refreshes and close the owned session.
+
+        A borrowed session is left open. Running `watch` iterations end.
+        The poll loop, background refreshes and in-flight reads are
+        cancelled and waited for before the session is closed, so none of
+        them runs into a closed connector.
+        """
+        for subscription in tuple(self._subscriptions):
+            subscription.offer(_WATCH_CLOSED)
+        self._subscriptions.clear()
+        tasks: list[asyncio.Future[Any]] = list(self._background)
+        for task in tasks:
+            task.cancel()
+        poll_task = self._stop_polling()
+        if poll_task is not None:
+            tasks.append(poll_task)
+        for flight in (self._state_flight, self._dmx_flight):
+            flight_task = flight.cancel()
+            if flight_task is not None:
+                tasks.append(flight_task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._state_cache.invalidate()
+        self._dmx_cache.invalidate()
+        self._relay_model.invalidate()
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def client_session(self) -> ClientSession:
+        """The session requests are sent through.
+
+        Raises:
+            RuntimeError: If the client owns its session and has not been
+                entered yet (or has already been closed).
+        """
+        if self._session is None:
+            raise RuntimeError("ProconipClient is not open; use it as 'async with'")
+        return self._session
+
+    def _timeout(self, timeout: float | None) -> float:
+        """Return the per-call override, or the bound default."""
+        return self.timeout if timeout is None else timeout
+
+    async def _async_cached[T](
+        self,
+        cache: _SnapshotCache[T],
+        flight: _SingleFlight[T],
+        fetch: Callable[[], Coroutine[Any, Any, T]],
+    ) -> T:
+        """Serve from ``cache`` when allowed, refreshing or filling it through ``flight``."""
+        value = cache.value
+        if value is not None and self.cache_max_age is not None:
+            age = time.monotonic() - cache.fetched_at
+            if age <= self.cache_max_age:
+                return value
+            if self.cache_max_stale is None or age <= self.cache_max_age + self.cache_max_stale:
+                if not flight.in_flight:
+                    task = asyncio.ensure_future(self._async_fill(cache, flight, fetch))
+                    self._background.add(task)
+                    task.add_done_callback(self._background_done)
+                return value
+        return await self._async_fill(cache, flight, fetch)
+
+    @staticmethod
+    async def _async_fill[T](
+        cache: _SnapshotCache[T],
+        flight: _SingleFlight[T],
+        fetch: Callable[[], Coroutine[Any, Any, T]],
+    ) -> T:
+        """Fetch through ``flight`` and store the result in ``cache``."""
+        generation = cache.generation
+        value = await flight.run(fetch)
+        cache.store(value, generation)
+        return value
+
+    def _background_done(self, task: asyncio.Future[Any]) -> None:
+        self._background.discard(task)
+        if not task.cancelled():
+            # Mark the exception as retrieved; see the class docstring.
+            task.exception()
+
+    def _state_changed(self) -> None:
+        """Forget everything known about the controller state after a write."""
+        self._state_flight.forget()
+        self._state_cache.invalidate()
+        if self.adaptive_interval is not None:
+            self.adaptive_interval.reset()
+        self._poll_wakeup.set()
+
+    async def async_get_raw_state(self, timeout: float | None = None) -> str:
+        """Fetch the raw `/GetState.csv` body as text.
+
+        See `proconip.api.async_get_raw_state` for behavior and raised
+        exceptions.
+        """
+        return await _async_request(
+            self.client_session,
+            "GET",
+            self._state_url,
+            self._timeout(timeout),
+            self._text_handler,
+            headers=self._get_headers,
+            limiter=self.limiter,
+            retry=self.retry,
+            breaker=self.breaker,
+        )
+
+    async def async_get_raw_state_bytes(self, timeout: float | None = None) -> bytes:
+        """Fetch the undecoded `/GetState.csv` body.
+
+        See `proconip.api.async_get_raw_bytes` for behavior and raised
+        exceptions.
+        """
+        raw_data, _ = await self._async_get_state_payload(timeout)
+        return raw_data
+
+    async def _async_get_state_payload(self, timeout: float | None) -> tuple[bytes, str]:
+        """Fetch the undecoded `/GetState.csv` body and the encoding of its text."""
+        return await _async_request(
+            self.client_session,
+            "GET",
+            self._state_url,
+            self._timeout(timeout),
+            _handle_response_payload,
+            headers=self._get_headers,
+            limiter=self.limiter,
+            retry=self.retry,
+            breaker=self.breaker,
+        )
+
+    async def async_get_state(self, timeout: float | None = None) -> GetStateData:
+        """Fetch and parse the controller state.
+
+        With the cache enabled, a cached snapshot may be returned instead
+        (see the class docstring).
+
+        See `proconip.api.async_get_state` for behavior and raised exceptions.
+        """
+        fetch = functools.partial(self._async_fetch_state, timeout)
+        if self.cache_max_age is None:
+            state = await self._state_flight.run(fetch)
+        else:
+            state = await self._async_cached(self._state_cache, self._state_flight, fetch)
+        self._state_handed_out_at = time.monotonic()
+        return state
+
+    async def _async_fetch_state(self, timeout: float | None) -> GetStateData:
+        """Send the state request that concurrent callers share."""
+        generation = self._relay_model.generation
+        raw_data, encoding = await self._async_get_state_payload(timeout)
+        previous = self._last_state
+        if previous is not None and previous.matches_payload(raw_data):
+            state = previous
+        else:
+            state = GetStateData.from_bytes(raw_data, encoding=encoding)
+            if self.reuse_unchanged:
+                self._last_state = state
+        self._relay_model.observe(state, generation)
+        return state
+
+    async def async_post_usrcfg_cgi(self, payload: str, timeout: float | None = None) -> str:
+        """Send a form-encoded POST to `/usrcfg.cgi`.
+
+        The payload is opaque to the client, so the cached state, the cached
+        DMX snapshot and the local relay model are invalidated.
+
+        See `proconip.api.async_post_usrcfg_cgi` for behavior and raised
+        exceptions.
+        """
+        try:
+            return await self._async_post(payload, timeout)
+        finally:
+            self._dmx_flight.forget()
+            self._dmx_cache.invalidate()
+            self._relay_model.invalidate()
+
+    async def _async_post(self, payload: str, timeout: float | None) -> str:
+        """POST ``payload`` to `/usrcfg.cgi` and invalidate the cached state."""
+        try:
+            return await _async_request(
+                self.client_session,
+                "POST",
+                self._usrcfg_url,
+                self._timeout(timeout),
+                _handle_response,
+                headers=self._post_headers,
+                data=payload,
+                limiter=self.limiter,
+                write=True,
+                breaker=self.breaker,
+            )
+        finally:
+            self._state_changed()
+
+    async def async_switch_on(
+        self, current_state: GetStateData | None, relay_id: int, timeout: float | None = None
+    ) -> str:
+        """Switch the relay with aggregated ID ``relay_id`` to manual ON.
+
+        Pass ``None`` as ``current_state`` to write against the local relay
+        model (see the class docstring).
+
+        See `proconip.api.async_switch_on` for behavior and raised exceptions,
+        including `BadRelayException` for dosage relays.
+        """
+        return await self._async_write_relays(current_state, {relay_id: RelayMode.ON}, timeout)
+
+    async def async_switch_off(
+        self, current_state: GetStateData | None, relay_id: int, timeout: float | None = None
+    ) -> str:
+        """Switch the relay with aggregated ID ``relay_id`` to manual OFF.
+
+        Pass ``None`` as ``current_state`` to write against the local relay
+        model (see the class docstring).
+
+        See `proconip.api.async_switch_off` for behavior and raised exceptions.
+        """
+        return await self._async_write_relays(current_state, {relay_id: RelayMode.OFF}, timeout)
+
+    async def async_set_auto_mode(
+        self, current_state: GetStateData | None, relay_id: int, timeout: float | None = None
+    ) -> str:
+        """Hand the relay with aggregated ID ``relay_id`` back to AUTO mode.
+
+        Pass ``None`` as ``current_state`` to write against the local relay
+        model (see the class docstring).
+
+        See `proconip.api.async_set_auto_mode` for behavior and raised
+        exceptions.
+        """
+        return await self._async_write_relays(current_state, {relay_id: RelayMode.AUTO}, timeout)
+
+    async def async_apply_relay_changes(
+        self,
+        current_state: GetStateData | None,
+        changes: Mapping[int, RelayMode],
+        timeout: float | None = None,
+    ) -> str:
+        """Switch several relays, keyed by aggregated relay ID, in one write.
+
+        Pass ``None`` as ``current_state`` to write against the local relay
+        model (see the class docstring).
+
+        See `proconip.api.async_apply_relay_changes` for behavior and raised
+        exceptions.
+        """
+        return await self._async_write_relays(current_state, changes, timeout)
+
+    async def _async_write_relays(
+        self,
+        current_state: GetStateData | None,
+        changes: Mapping[int, RelayMode],
+        timeout: float | None,
+    ) -> str:
+        """Queue ``changes`` in the write sequencer and wait for their write.
+
+        Whoever gets the sequencer lock writes everything queued so far; a
+        caller whose changes were written by someone else just returns that
+        write's response.
+        """
+        request = _RelayRequest(current_state, changes, asyncio.get_running_loop().create_future())
+        self._relay_queue.append(request)
+        try:
+            async with self._relay_lock:
+                if not request.future.done():
+                    batch, self._relay_queue = self._relay_queue, []
+                    await self._async_flush_relays(batch, timeout)
+        except asyncio.CancelledError:
+            if request in self._relay_queue:
+                self._relay_queue.remove(request)
+            raise
+        return request.future.result()
+
+    async def _async_flush_relays(self, batch: list[_RelayRequest], timeout: float | None) -> None:
+        """Merge ``batch`` into one ENA write and settle each request's future.
+
+        Requests that fail validation get their own exception and are left
+        out of the write. A failed write leaves the controller in an unknown
+        state, so the relay model is dropped and every remaining request
+        gets the error. If the writing caller is cancelled, the unsettled
+        requests go back to the front of the queue for the next lock holder.
+        """
+        try:
+            reference, bit_state = await self._async_relay_baseline(batch, timeout)
+            written = []
+            for request in batch:
+                try:
+                    resolved = _resolve_relay_changes(reference, request.changes)
+                    bit_state = _relay_bits(reference, resolved, bit_state)
+                except (BadRelayException, IndexError, ValueError) as exc:
+                    request.future.set_exception(exc)
+                else:
+                    written.append(request)
+            if not written:
+                return
+            response = await self._async_post(_ena_payload(bit_state), timeout)
+        except asyncio.CancelledError:
+            self._relay_model.invalidate()
+            self._relay_queue[:0] = [request for request in batch if not request.future.done()]
+            raise
+        except Exception as exc:
+            self._relay_model.invalidate()
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            return
+        self._relay_model.apply(reference, bit_state)
+        for request in written:
+            request.future.set_result(response)
+
+    async def _async_relay_baseline(
+        self, batch: list[_RelayRequest], timeout: float | None
+    ) -> tuple[GetStateData, tuple[int, int]]:
+        """Pick the relay state ``batch`` is applied to.
+
+        If a request brought its own snapshot, that is the snapshot of the
+        last such request, unless the client wrote the relays after it last
+        handed out a snapshot: no snapshot a caller can hold knows about
+        that write, so the relay model is used while it is fresh enough.
+        Without any snapshot it is the relay model while it is fresh enough,
+        or a new read.
+        """
+        model = self._relay_model
+        max_age = self.relay_state_max_age
+        supplied = [request.current_state for request in batch if request.current_state is not None]
+        if max_age is not None and (not supplied or model.written_at > self._state_handed_out_at):
+            known = model.fresh(max_age)
+            if known is not None:
+                return known
+        if supplied:
+            state = supplied[-1]
+        else:
+            # Bypass the snapshot cache: a stale snapshot must not become the baseline.
+            fetch = functools.partial(self._async_fetch_state, timeout)
+            state = await self._state_flight.run(fetch)
+        manual_bits, on_bits = state.determine_overall_relay_bit_state()
+        return state, (manual_bits, on_bits)
+
+    async def async_start_dosage(
+        self,
+        dosage_target: DosageTarget,
+        dosage_duration: int,
+        timeout: float | None = None,
+    ) -> str:
+        """Trigger a manual, time-limited dosage.
+
+        See `proconip.api.async_start_dosage` for behavior and raised
+        exceptions.
+        """
+        url = self._command_url.with_query(_dosage_query(dosage_target, dosage_duration))
+        try:
+            return await _async_request(
+                self.client_session,
+                "GET",
+                url,
+                self._timeout(timeout),
+                _handle_response,
+                headers=self._get_headers,
+                limiter=self.limiter,
+                write=True,
+                breaker=self.breaker,
+            )
+        finally:
+            self._state_changed()
+
+    async def async_get_raw_dmx(self, timeout: float | None = None) -> str:
+        """Fetch the raw `/GetDmx.csv` body as text.
+
+        See `proconip.api.async_get_raw_dmx` for behavior and raised
+        exceptions.
+        """
+        return await _async_request(
+            self.client_session,
+            "GET",
+            self._dmx_url,
+            self._timeout(timeout),
+            self._text_handler,
+            headers=self._get_headers,
+            limiter=self.limiter,
+            retry=self.retry,
+            breaker=self.breaker,
+        )
+
+    async def async_get_dmx(self, timeout: float | None = None) -> GetDmxData:
+        """Fetch and parse the DMX channel state.
+
+        With the cache enabled, a copy of a cached snapshot may be returned
+        instead (see the class docstring). Each caller gets its own copy, so
+        mutating it with `GetDmxData.set` never affects the cache.
+
+        See `proconip.api.async_get_dmx` for behavior and raised exceptions.
+        """
+        if self.cache_max_age is None:
+            return await self._async_fetch_dmx(timeout)
+        fetch = functools.partial(self._async_fetch_dmx, timeout)
+        return copy.deepcopy(await self._async_cached(self._dmx_cache, self._dmx_flight, fetch))
+
+    async def _async_fetch_dmx(self, timeout: float | None) -> GetDmxData:
+        """Send a DMX state request."""
+        raw_data, encoding = await _async_request(
+            self.client_session,
+            "GET",
+            self._dmx_url,
+            self._timeout(timeout),
+            _handle_response_payload,
+            headers=self._get_headers,
+            limiter=self.limiter,
+            retry=self.retry,
+            breaker=self.breaker,
+        )
+        return GetDmxData.from_bytes(raw_data, encoding=encoding)
+
+    async def async_set_dmx(self, dmx_states: GetDmxData, timeout: float | None = None) -> str:
+        """Push all 16 DMX channel values to the controller.
+
+        On success the cached DMX snapshot (if the cache is enabled) is
+        replaced by a copy of ``dmx_states``.
+
+        See `proconip.api.async_set_dmx` for behavior and raised exceptions.
+        """
+        self._dmx_flight.forget()
+        self._dmx_cache.invalidate()
+        generation = self._dmx_cache.generation
+        response = await self._async_post(_dmx_payload(dmx_states), timeout)
+        if self.cache_max_age is not None:
+            self._dmx_cache.store(copy.deepcopy(dmx_states), generation)
+        return response
+
+    async def async_trigger_digital_input(
+        self,
+        digital_input_id: int,
+        timeout: float | None = None,
+        hold_seconds: float = DIGITAL_INPUT_PULSE_SECONDS,
+    ) -> str:
+        """Pulse the digital input ``digital_input_id`` (0–3).
+
+        See `proconip.api.async_trigger_digital_input` for behavior, the
+        release guarantees, and raised exceptions.
+        """
+        return await _async_pulse_digital_input(
+            functools.partial(self._async_post, timeout=timeout),
+            digital_input_id,
+            hold_seconds,
+        )
+
+    async def watch(
+        self,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        queue_size: int = 1,
+        raise_errors: bool = False,
+    ) -> AsyncIterator[GetStateData]:
+        """Yield controller state snapshots as they are polled.
+
+        All iterations over `watch` on one client share a single poll loop,
+        which runs while at least one of them is active and polls at the
+        shortest ``interval`` among them (or as the client's
+        ``adaptive_interval`` dictates, if set). Each poll goes through
+        `async_get_state`, so it coalesces with direct reads and honors the
+        cache. Only new snapshots are delivered; an identical instance (see
+        ``reuse_unchanged``) is not yielded twice.
+
+        Every consumer has its own queue of ``queue_size`` snapshots. A
+        consumer that falls behind loses the oldest queued snapshots, never
+        the newest, and never slows down the poll loop or other consumers.
+        A newly started iteration begins with the latest snapshot if the
+        loop is already running.
+
+        Iteration ends when the client is closed. Breaking out of the loop
+        or cancelling the consuming task unsubscribes; wrap the iterator in
+        `contextlib.aclosing` to make that happen immediately rather than at
+        garbage collection.
+
+        Args:
+            interval: Seconds between polls requested by this consumer.
+            queue_size: Snapshots buffered for this consumer.
+            raise_errors: If True, a failed poll is raised from this
+                iteration (ending it). By default failed polls are skipped
+                and polling simply continues.
+
+        Raises:
+            ValueError: If ``interval`` is not positive or ``queue_size`` is
+                less than 1.
+            ProconipApiException: Only with ``raise_errors``, for a failed
+                poll.
+
+        Example:
+            ```python
+            async with ProconipClient(config) as client:
+                async for state in client.watch(interval=10):
+                    print(state.ph_electrode.display_value)
+            ```
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        subscription = _Subscription(interval, queue_size, raise_errors)
+        if self._poll_task is not None and self._watched_state is not None:
+            subscription.offer(self._watched_state)
+        self._subscriptions.add(subscription)
+        if self._poll_task is None:
+            self._poll_task = asyncio.ensure_future(self._async_poll())
+        try:
+            while True:
+                item = await subscription.queue.get()
+                if isinstance(item, GetStateData):
+                    yield item
+                elif isinstance(item, Exception):
+                    raise item
+                else:  # _WATCH_CLOSED
+                    return
+        finally:
+            self._subscriptions.discard(subscription)
+            if not self._subscriptions:
+                self._stop_polling()
+
+    def subscribe(
+        self,
+        callback: Callable[[GetStateData, tuple[int, ...]], object],
+        columns: Iterable[int] = (),
+        categories: Iterable[str] = (),
+        absolute_deadband: float = 0.0,
+        relative_deadband: float = 0.0,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+    ) -> Callable[[], None]:
+        """Call ``callback`` whenever selected columns change beyond a deadband.
+
+        The subscription rides on the same poll loop as `watch` and keeps it
+        running until it is cancelled. For every new snapshot, the calibrated
+        values of the selected columns are compared in one pass against the
+        values last reported to this callback. A column counts as changed
+        when it moved by more than ``absolute_deadband`` and by more than
+        ``relative_deadband`` times its last reported value. Columns within
+        their band keep their last reported value as reference, so a slow
+        drift is still reported once it adds up.
+
+        The first snapshot reports all selected columns. ``callback`` is
+        called synchronously from the poll loop with the snapshot and the
+        changed column indices, so it should return quickly; schedule a task
+        for anything slow. Exceptions it raises go to the event loop's
+        exception handler. Failed polls are skipped.
+
+        Must be called from a running event loop.
+
+        Args:
+            callback: Receives ``(state, changed_columns)``.
+            columns: Column indices to watch, for example ``(7,)`` for the pH
+                electrode.
+            categories: `CATEGORY_*` constants whose columns to watch, for
+                example ``(CATEGORY_RELAY,)``.
+            absolute_deadband: Changes up to this amount (in the column's
+                unit) are ignored.
+            relative_deadband: Changes up to this fraction of the last
+                reported value are ignored.
+            interval: Seconds between polls requested by this subscription.
+
+        Returns:
+            A function that cancels the subscription.
+
+        Raises:
+            ValueError: If nothing is selected, a deadband is negative, or
+                ``interval`` is not positive.
+
+        Example:
+            ```python
+            def on_change(state, columns):
+                print(state.ph_electrode.display_value)
+
+            unsubscribe = client.subscribe(on_change, columns=(7,), absolute_deadband=0.05)
+            ...
+            unsubscribe()
+            ```
+        """
+        columns = tuple(columns)
+        categories = tuple(categories)
+        if not columns and not categories:
+            raise ValueError("Select at least one column or category")
+        if absolute_deadband < 0 or relative_deadband < 0:
+            raise ValueError("Deadbands must not be negative")
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        subscription = _ColumnSubscription(
+            callback, columns, categories, absolute_deadband, relative_deadband, interval
+        )
+        loop = asyncio.get_running_loop()
+        if self._poll_task is not None and self._watched_state is not None:
+            loop.call_soon(subscription.offer, self._watched_state)
+        self._subscriptions.add(subscription)
+        if self._poll_task is None:
+            self._poll_task = asyncio.ensure_future(self._async_poll())
+
+        def unsubscribe() -> None:
+            self._subscriptions.discard(subscription)
+            if not self._subscriptions:
+                self._stop_polling()
+
+        return unsubscribe
+
+    async def _async_poll(self) -> None:
+        """Poll the state for the `watch` subscribers until there are none left."""
+        while self._subscriptions:
+            self._poll_wakeup.clear()
+            item: object
+            try:
+                item = await self.async_get_state()
+            except Exception as exc:  # handed to the subscribers, polling goes on
+                item = exc
+            previous = self._watched_state
+            if item is not previous:
+                if isinstance(item, GetStateData):
+                    self._watched_state = item
+                for subscription in tuple(self._subscriptions):
+                    subscription.offer(item)
+            if not self._subscriptions:
+                break
+            if self.adaptive_interval is None:
+                interval = min(sub.interval for sub in self._subscriptions)
+            else:
+                changed = isinstance(item, GetStateData) and (
+                    previous is None or (item is not previous and not item.same_readings(previous))
+                )
+                interval = self.adaptive_interval.next(changed)
+            # Sleep until the next poll is due, or until a write wakes the loop.
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(interval):
+                    await self._poll_wakeup.wait()
+
+    def _stop_polling(self) -> asyncio.Task[None] | None:
+        """Cancel the `watch` poll loop and forget its last snapshot.
+
+        Returns the cancelled poll task, if there was one, so that `close`
+        can wait for it to finish.
+        """
+        poll_task, self._poll_task = self._poll_task, None
+        if poll_task is not None:
+            poll_task.cancel()
+        self._watched_state = None
+        return poll_task
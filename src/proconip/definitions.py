@@ -12,6 +12,8 @@ Assistant integration) build on them.
 The classes you will most often work with are:
 
 - `ConfigObject` — base URL plus credentials.
+- `ColumnLayout` — which `/GetState.csv` column belongs to which category.
+  `DEFAULT_COLUMN_LAYOUT` describes the stock firmware.
 - `GetStateData` — parsed `/GetState.csv` response. Exposes individual sensors,
   relays, dosage flags, and a few derived helpers.
 - `Relay` — convenience wrapper around a relay `DataObject` with on/off and
@@ -20,7 +22,9 @@ The classes you will most often work with are:
   16 DMX channels.
 """
 
-from collections.abc import Iterator
+import functools
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from enum import IntEnum
 
 API_PATH_GET_STATE = "/GetState.csv"
@@ -43,6 +47,11 @@ CATEGORY_EXTERNAL_RELAY = "external_relay"
 CATEGORY_CANISTER = "canister"
 CATEGORY_CONSUMPTION = "consumption"
 
+# Text encoding assumed when a `/GetState.csv` or `/GetDmx.csv` body is parsed
+# from bytes. The numeric rows are plain ASCII either way; only sensor names
+# and units can contain anything else.
+DEFAULT_PAYLOAD_ENCODING = "utf-8"
+
 # Lookup table mapping the controller's reset-root-cause code to a human
 # label. The codes are exact values, not bit flags.
 RESET_ROOT_CAUSE = {
@@ -80,6 +89,19 @@ class DosageTarget(IntEnum):
     PH_PLUS = 2
 
 
+class RelayMode(IntEnum):
+    """Target mode of a relay in a batch switch.
+
+    The values are the relay's two ENA bits, manual (2) and on (1), which is
+    also how the controller encodes a relay's state in its raw value. See
+    `proconip.api.async_apply_relay_changes`.
+    """
+
+    AUTO = 0
+    OFF = 2
+    ON = 3
+
+
 class ConfigObject:
     """Base URL and credentials for talking to a single ProCon.IP controller.
 
@@ -145,30 +167,260 @@ class ConfigObject:
         }
 
 
+def _format_time(value: float, unit: str) -> str:
+    """Render the packed system time column (``hours * 256 + minutes``) as ``"HH:MM"``."""
+    return f"{int(value / 256):02d}:{int(value) % 256:02d}"
+
+
+def _format_measurement(value: float, unit: str) -> str:
+    """Render a sensor reading with two decimal places and its unit."""
+    return f"{value:.2f} {unit}"
+
+
+def _format_temperature(value: float, unit: str) -> str:
+    """Render a temperature with two decimal places and a degree sign."""
+    return f"{value:.2f} °{unit}"
+
+
+def _format_relay(value: float, unit: str) -> str:
+    """Render a relay value as one of the four state strings.
+
+    Raises:
+        ValueError: If ``value`` is not one of the four valid relay states
+            (0, 1, 2, 3). Indicates a malformed CSV payload.
+    """
+    if value == 0:
+        return "Auto (off)"
+    if value == 1:
+        return "Auto (on)"
+    if value == 2:
+        return "Off"
+    if value == 3:
+        return "On"
+    raise ValueError(f"Unexpected relay value {value}")
+
+
+def _format_plain(value: float, unit: str) -> str:
+    """Render the bare value, without unit or rounding."""
+    return f"{value}"
+
+
+# Display formatter used for each category unless a `ColumnLayout` overrides
+# it. Categories not listed here (including custom ones) use `_format_plain`.
+_CATEGORY_FORMATTERS: dict[str, Callable[[float, str], str]] = {
+    CATEGORY_TIME: _format_time,
+    CATEGORY_ANALOG: _format_measurement,
+    CATEGORY_ELECTRODE: _format_measurement,
+    CATEGORY_TEMPERATURE: _format_temperature,
+    CATEGORY_RELAY: _format_relay,
+    CATEGORY_DIGITAL_INPUT: _format_plain,
+    CATEGORY_EXTERNAL_RELAY: _format_relay,
+    CATEGORY_CANISTER: _format_measurement,
+    CATEGORY_CONSUMPTION: _format_measurement,
+}
+
+
+class ColumnSpec:
+    """Classification of a single `/GetState.csv` column.
+
+    Attributes:
+        category: One of the `CATEGORY_*` constants (or a custom category
+            name), or ``""`` for a column the layout does not know about.
+        category_id: Zero-based index of the column within its category, or
+            ``-1`` for an unknown column.
+        formatter: Callable ``(value, unit) -> str`` that renders the
+            column's `DataObject.display_value`.
+    """
+
+    __slots__ = ("category", "category_id", "formatter")
+
+    category: str
+    category_id: int
+    formatter: Callable[[float, str], str]
+
+    def __init__(
+        self,
+        category: str,
+        category_id: int,
+        formatter: Callable[[float, str], str],
+    ):
+        """Build a column spec from its three parts."""
+        self.category = category
+        self.category_id = category_id
+        self.formatter = formatter
+
+    def __repr__(self) -> str:
+        """Return ``"ColumnSpec(category, category_id)"``."""
+        return f"ColumnSpec({self.category!r}, {self.category_id})"
+
+
+# Spec handed out for columns beyond the end of a layout.
+_UNKNOWN_COLUMN = ColumnSpec("", -1, _format_plain)
+
+
+class ColumnLayout:
+    """Table mapping each `/GetState.csv` column to its category and formatter.
+
+    The controller's CSV has no type information: a column's meaning is
+    defined by its position alone. A layout captures that mapping once, as a
+    list of ``(category, column_count)`` blocks in column order, so parsing a
+    snapshot is a table lookup per column instead of a chain of range
+    comparisons. All snapshots parsed with the same layout share it.
+
+    `DEFAULT_COLUMN_LAYOUT` describes the stock firmware. Firmware variants
+    with a different column arrangement can be supported by building another
+    layout and passing it to `GetStateData`:
+
+    Example:
+        ```python
+        layout = ColumnLayout(
+            [(CATEGORY_TIME, 1), (CATEGORY_ANALOG, 5), (CATEGORY_ELECTRODE, 2)]
+        )
+        state = GetStateData(raw_csv, layout=layout)
+        ```
+
+    Columns past the end of the layout are treated as uncategorized.
+    """
+
+    __slots__ = ("_specs", "_categories", "_columns")
+
+    _specs: tuple[ColumnSpec, ...]
+    _categories: tuple[str, ...]
+    _columns: dict[str, range | tuple[int, ...]]
+
+    def __init__(
+        self,
+        blocks: Iterable[tuple[str, int]],
+        formatters: Mapping[str, Callable[[float, str], str]] | None = None,
+    ):
+        """Build a layout from consecutive category blocks.
+
+        Args:
+            blocks: ``(category, column_count)`` pairs in column order. A
+                category may appear in more than one block; its
+                ``category_id`` numbering then continues across them.
+            formatters: Optional per-category display formatters
+                (``(value, unit) -> str``) that override the defaults.
+
+        Raises:
+            ValueError: If a block has fewer than one column.
+        """
+        overrides = formatters or {}
+        specs: list[ColumnSpec] = []
+        categories: list[str] = []
+        seen: dict[str, int] = {}
+        for category, count in blocks:
+            if count < 1:
+                raise ValueError(f"Block {category!r} must have at least one column, got {count}")
+            formatter = overrides.get(category, _CATEGORY_FORMATTERS.get(category, _format_plain))
+            if category not in seen:
+                seen[category] = 0
+                categories.append(category)
+            for _ in range(count):
+                specs.append(ColumnSpec(category, seen[category], formatter))
+                seen[category] += 1
+        self._specs = tuple(specs)
+        self._categories = tuple(categories)
+
+        # Category → column index, built in a single pass. Contiguous blocks
+        # (the normal case) are stored as ranges so they can be sliced.
+        columns_by_category: dict[str, list[int]] = {category: [] for category in categories}
+        for column, spec in enumerate(specs):
+            columns_by_category[spec.category].append(column)
+        self._columns = {}
+        for category, columns in columns_by_category.items():
+            if columns[-1] - columns[0] + 1 == len(columns):
+                self._columns[category] = range(columns[0], columns[-1] + 1)
+            else:
+                self._columns[category] = tuple(columns)
+
+    def __len__(self) -> int:
+        """Return the number of columns the layout describes."""
+        return len(self._specs)
+
+    @property
+    def categories(self) -> tuple[str, ...]:
+        """Distinct categories in order of first appearance."""
+        return self._categories
+
+    def spec(self, column: int) -> ColumnSpec:
+        """Return the `ColumnSpec` for a zero-based column index.
+
+        Columns outside the layout get an uncategorized spec with category
+        ``""`` and category_id ``-1``.
+        """
+        if 0 <= column < len(self._specs):
+            return self._specs[column]
+        return _UNKNOWN_COLUMN
+
+    def columns(self, category: str) -> range | tuple[int, ...]:
+        """Column indices that belong to ``category``, in column order.
+
+        Returns a `range` for a contiguous block (the stock layout only has
+        those) and a tuple otherwise. Empty if the category is not part of
+        the layout.
+        """
+        return self._columns.get(category, ())
+
+
+# Column layout of the stock ProCon.IP firmware (42 columns). Used by
+# `GetStateData` and `DataObject` unless another layout is supplied.
+DEFAULT_COLUMN_LAYOUT = ColumnLayout(
+    [
+        (CATEGORY_TIME, 1),
+        (CATEGORY_ANALOG, 5),
+        (CATEGORY_ELECTRODE, 2),
+        (CATEGORY_TEMPERATURE, 8),
+        (CATEGORY_RELAY, 8),
+        (CATEGORY_DIGITAL_INPUT, 4),
+        (CATEGORY_EXTERNAL_RELAY, 8),
+        (CATEGORY_CANISTER, 3),
+        (CATEGORY_CONSUMPTION, 3),
+    ]
+)
+
+
 class DataObject:
     """A single sensor, relay, canister, or consumption channel from `/GetState.csv`.
 
     Each `DataObject` represents one column of the CSV response, combining the
     name, unit, offset, gain, and raw value rows that the controller sends. The
     column index alone determines which category the object falls into (analog,
-    relay, temperature, …) — see the constructor for the exact ranges.
+    relay, temperature, …) — it is looked up in a `ColumnLayout`,
+    `DEFAULT_COLUMN_LAYOUT` unless the object was parsed with another one.
 
     The actual physical reading is computed once at construction via
-    ``offset + gain * raw_value`` and exposed as `value`. A pre-formatted
-    `display_value` string is also produced; for relay columns it is one of
-    "Auto (off)", "Auto (on)", "Off", or "On".
+    ``offset + gain * raw_value`` and exposed as `value`. A human-readable
+    `display_value` string is formatted on first access and cached; for relay
+    columns it is one of "Auto (off)", "Auto (on)", "Off", or "On". Code that
+    only reads `value` never pays for string formatting.
+
+    Instances use ``__slots__`` rather than a per-instance ``__dict__``, which
+    keeps them small when many parsed snapshots are held in memory. Arbitrary
+    attributes can therefore not be attached to them.
     """
 
+    __slots__ = (
+        "_column",
+        "_spec",
+        "_name",
+        "_unit",
+        "_offset",
+        "_gain",
+        "_raw_value",
+        "_value",
+        "_display_value",
+    )
+
     _column: int
-    _category: str
-    _category_id: int
+    _spec: ColumnSpec
     _name: str
     _unit: str
     _offset: float
     _gain: float
     _raw_value: float
     _value: float
-    _display_value: str
+    _display_value: str | None
 
     def __init__(
         self,
@@ -178,11 +430,13 @@ class DataObject:
         offset: float,
         gain: float,
         value: float,
+        spec: ColumnSpec | None = None,
     ):
         """Build a `DataObject` from one column's worth of CSV data.
 
         Args:
-            column: Zero-based column index in the CSV. Determines the category:
+            column: Zero-based column index in the CSV. Unless ``spec`` is
+                given, determines the category via `DEFAULT_COLUMN_LAYOUT`:
                 ``0`` → time, ``1–5`` → analog, ``6–7`` → electrode, ``8–15`` →
                 temperature, ``16–23`` → relay, ``24–27`` → digital input,
                 ``28–35`` → external relay, ``36–38`` → canister, ``39–41`` →
@@ -195,6 +449,9 @@ class DataObject:
             value: Raw sensor value before calibration. Stored verbatim as
                 `raw_value`; the physical `value` is computed as
                 ``offset + gain * raw_value``.
+            spec: Classification of the column, taken from the `ColumnLayout`
+                the payload was parsed with. Defaults to the entry for
+                ``column`` in `DEFAULT_COLUMN_LAYOUT`.
         """
         self._column = column
         self._name = name
@@ -204,67 +461,29 @@ class DataObject:
         self._raw_value = value
         self._value = self._offset + (self._gain * self._raw_value)
 
-        if column == 0:
-            self._category = CATEGORY_TIME
-            self._category_id = 0
-            self._display_value = f"{int(self._value / 256):02d}:{int(self._value) % 256:02d}"
-        elif 1 <= column <= 5:
-            self._category = CATEGORY_ANALOG
-            self._category_id = column - 1
-            self._display_value = f"{self._value:.2f} {self._unit}"
-        elif 6 <= column <= 7:
-            self._category = CATEGORY_ELECTRODE
-            self._category_id = column - 6
-            self._display_value = f"{self._value:.2f} {self._unit}"
-        elif 8 <= column <= 15:
-            self._category = CATEGORY_TEMPERATURE
-            self._category_id = column - 8
-            self._display_value = f"{self._value:.2f} °{self._unit}"
-        elif 16 <= column <= 23:
-            self._category = CATEGORY_RELAY
-            self._category_id = column - 16
-            self._display_value = self._relay_state()
-        elif 24 <= column <= 27:
-            self._category = CATEGORY_DIGITAL_INPUT
-            self._category_id = column - 24
-            self._display_value = f"{self._value}"
-        elif 28 <= column <= 35:
-            self._category = CATEGORY_EXTERNAL_RELAY
-            self._category_id = column - 28
-            self._display_value = self._relay_state()
-        elif 36 <= column <= 38:
-            self._category = CATEGORY_CANISTER
-            self._category_id = column - 36
-            self._display_value = f"{self._value:.2f} {self._unit}"
-        elif 39 <= column <= 41:
-            self._category = CATEGORY_CONSUMPTION
-            self._category_id = column - 39
-            self._display_value = f"{self._value:.2f} {self._unit}"
-        else:
-            self._category = ""
-            self._category_id = -1
-            self._display_value = f"{self._value}"
+        self._spec = DEFAULT_COLUMN_LAYOUT.spec(column) if spec is None else spec
+        self._display_value = None
 
     def __str__(self) -> str:
         """Return a short ``"name (unit): value"`` representation."""
         return f"{self._name} ({self._unit}): {self._value}"
 
-    def _relay_state(self) -> str:
-        """Render the current relay value as one of the four state strings.
+    def _adopt(self, data_object: "DataObject") -> None:
+        """Take over another object's parsed fields as-is.
 
-        Raises:
-            ValueError: If `self._value` is not one of the four valid relay
-                states (0, 1, 2, 3). Indicates a malformed CSV payload.
+        Used by the typed views (`Relay`, `DigitalInput`) in place of
+        ``__init__``: the calibrated value, column spec, and any display
+        string already formatted are shared, not recomputed.
         """
-        if self._value == 0:
-            return "Auto (off)"
-        if self._value == 1:
-            return "Auto (on)"
-        if self._value == 2:
-            return "Off"
-        if self._value == 3:
-            return "On"
-        raise ValueError(f"Unexpected relay value {self._value}")
+        self._column = data_object._column
+        self._spec = data_object._spec
+        self._name = data_object._name
+        self._unit = data_object._unit
+        self._offset = data_object._offset
+        self._gain = data_object._gain
+        self._raw_value = data_object._raw_value
+        self._value = data_object._value
+        self._display_value = data_object._display_value
 
     @property
     def name(self) -> str:
@@ -298,12 +517,18 @@ class DataObject:
 
     @property
     def display_value(self) -> str:
-        """Pre-formatted human-readable string for display.
+        """Human-readable string for display, formatted on first access.
 
         For sensors this is ``value`` rendered with its unit and two decimal
         places. For relay columns it is one of "Auto (off)", "Auto (on)",
         "Off", or "On". For column 0 (the system time field) it is "HH:MM".
+
+        Raises:
+            ValueError: If this is a relay column whose value is not one of
+                the four valid relay states (a malformed CSV payload).
         """
+        if self._display_value is None:
+            self._display_value = self._spec.formatter(self._value, self._unit)
         return self._display_value
 
     @property
@@ -314,7 +539,7 @@ class DataObject:
     @property
     def category(self) -> str:
         """One of the `CATEGORY_*` constants identifying the entity type."""
-        return self._category
+        return self._spec.category
 
     @property
     def category_id(self) -> int:
@@ -324,7 +549,7 @@ class DataObject:
         Use `Relay.relay_id` instead if you need the aggregated relay ID
         across both the internal and external relay banks.
         """
-        return self._category_id
+        return self._spec.category_id
 
 
 class Relay(DataObject):
@@ -336,15 +561,17 @@ class Relay(DataObject):
     - bit 1 — control mode (0 = auto, 1 = manual)
 
     The four valid combinations correspond to the four `display_value`
-    strings from `DataObject._relay_state`.
+    strings "Auto (off)", "Auto (on)", "Off", and "On".
 
     Construct one by passing the `DataObject` you got from
-    `GetStateData.relay_objects` (or `external_relay_objects`); the relay's
-    column, name, calibration, and raw value are copied across so the
-    physical value is computed exactly once. ``GetStateData.get_relay()`` is
-    a shorthand that does this for you.
+    `GetStateData.relay_objects` (or `external_relay_objects`); the relay
+    takes over the object's already-parsed fields, including the calibrated
+    value, so nothing is recomputed. ``GetStateData.get_relay()`` is a
+    shorthand that returns a `Relay` cached on the snapshot.
     """
 
+    __slots__ = ()
+
     def __init__(self, data_object: DataObject):
         """Wrap an existing relay `DataObject`.
 
@@ -355,18 +582,11 @@ class Relay(DataObject):
                 object yields a `Relay` whose interrogation methods will
                 still run but produce meaningless results.
         """
-        super().__init__(
-            data_object.column,
-            data_object.name,
-            data_object.unit,
-            data_object.offset,
-            data_object.gain,
-            data_object.raw_value,  # pass raw value so offset+gain are applied exactly once
-        )
+        self._adopt(data_object)
 
     def __str__(self) -> str:
         """Return ``"name: state"`` (e.g. ``"Pumpe: Auto (off)"``)."""
-        return f"{self._name}: {self._display_value}"
+        return f"{self._name}: {self.display_value}"
 
     @property
     def relay_id(self) -> int:
@@ -404,23 +624,26 @@ class Relay(DataObject):
         `determine_overall_relay_bit_state` output before sending an ENA
         update.
         """
-        if self._category == CATEGORY_EXTERNAL_RELAY:
-            return 1 << (self._category_id + EXTERNAL_RELAY_ID_OFFSET)
-        return 1 << self._category_id
+        if self._spec.category == CATEGORY_EXTERNAL_RELAY:
+            return 1 << (self._spec.category_id + EXTERNAL_RELAY_ID_OFFSET)
+        return 1 << self._spec.category_id
 
 
 class DigitalInput(DataObject):
     """Typed view of a single digital input (CSV columns 24–27).
 
     Construct one by passing the `DataObject` you got from
-    `GetStateData.digital_input_objects`; the column, name, calibration, and
-    raw value are copied across so the physical value is computed exactly once.
-    ``GetStateData.digital_inputs()`` is a shorthand that does this for you.
+    `GetStateData.digital_input_objects`; the input takes over the object's
+    already-parsed fields, so nothing is recomputed.
+    ``GetStateData.digital_inputs()`` is a shorthand that returns instances
+    cached on the snapshot.
 
     The wrapper exists so digital inputs can be *triggered* (not just read):
     `get_bit_mask` yields the bit used in the controller's WEBIO ``IO`` field.
     """
 
+    __slots__ = ()
+
     def __init__(self, data_object: DataObject):
         """Wrap an existing digital-input `DataObject`.
 
@@ -430,14 +653,7 @@ class DigitalInput(DataObject):
                 check is enforced — passing another object yields a
                 `DigitalInput` whose `get_bit_mask` is meaningless.
         """
-        super().__init__(
-            data_object.column,
-            data_object.name,
-            data_object.unit,
-            data_object.offset,
-            data_object.gain,
-            data_object.raw_value,  # pass raw value so offset+gain are applied exactly once
-        )
+        self._adopt(data_object)
 
     def get_bit_mask(self) -> int:
         """Bit for this input in the WEBIO ``IO`` field (``1 << category_id``).
@@ -448,25 +664,124 @@ class DigitalInput(DataObject):
         this method when assembling an ``IO`` payload for a manual
         `async_post_usrcfg_cgi` write.
         """
-        return 1 << self._category_id
+        return 1 << self._spec.category_id
+
+
+def _take_columns(values: array[float], columns: range | tuple[int, ...]) -> array[float]:
+    """Copy the given columns out of a column-wise buffer, slicing when they are contiguous."""
+    if isinstance(columns, range):
+        return values[columns.start : columns.stop]
+    return array("d", [values[column] for column in columns])
+
+
+class _StateHeader:
+    """The parsed header block of a `/GetState.csv` response (rows 2–5).
+
+    Names, units, calibration offsets and gains, and the per-category column
+    index practically never change between polls, so one instance is shared
+    by every `GetStateData` parsed from the same header rows (see
+    `_parse_state_header`). Nothing in here is mutated after construction.
+    """
+
+    __slots__ = (
+        "layout",
+        "names",
+        "units",
+        "offsets",
+        "gains",
+        "category_columns",
+    )
+
+    layout: ColumnLayout
+    names: tuple[str, ...]
+    units: tuple[str, ...]
+    offsets: array[float]
+    gains: array[float]
+    category_columns: dict[str, range | tuple[int, ...]]
+
+    def __init__(self, names: str, units: str, offsets: str, gains: str, layout: ColumnLayout):
+        """Split and convert the four header rows and classify the columns via ``layout``.
+
+        Raises:
+            ValueError: If the offsets or gains row contains a value that is
+                not parseable as a float.
+        """
+        self.layout = layout
+        self.names = tuple(names.split(","))
+        self.units = tuple(units.split(","))
+        self.offsets = array("d", map(float, offsets.split(",")))
+        self.gains = array("d", map(float, gains.split(",")))
+        # The layout's category index, clipped to the columns this payload
+        # actually has.
+        column_count = len(self.names)
+        self.category_columns = {}
+        for category in layout.categories:
+            columns = layout.columns(category)
+            if isinstance(columns, range):
+                self.category_columns[category] = range(
+                    columns.start, min(columns.stop, column_count)
+                )
+            else:
+                self.category_columns[category] = tuple(c for c in columns if c < column_count)
+
+
+# A handful of entries covers one header per controller for small fleets;
+# with more distinct headers than this the cache simply keeps the recent ones.
+_STATE_HEADER_CACHE_SIZE = 64
+
+
+def _as_text(field: str | bytes, encoding: str) -> str:
+    """Return ``field`` as text, decoding it first if it came from a bytes payload."""
+    return field if isinstance(field, str) else field.decode(encoding, "replace")
+
+
+@functools.lru_cache(maxsize=_STATE_HEADER_CACHE_SIZE)
+def _parse_state_header(
+    names: str | bytes,
+    units: str | bytes,
+    offsets: str | bytes,
+    gains: str | bytes,
+    layout: ColumnLayout,
+    encoding: str,
+) -> _StateHeader:
+    """Return the shared `_StateHeader` for these header rows, parsing them on a cache miss.
+
+    The rows (and the layout) are the cache key, so an unchanged header costs
+    one hash and comparison instead of two splits and two float conversions
+    per column. Rows from a bytes payload are only decoded on a miss.
+    """
+    return _StateHeader(
+        _as_text(names, encoding),
+        _as_text(units, encoding),
+        _as_text(offsets, encoding),
+        _as_text(gains, encoding),
+        layout,
+    )
 
 
 class GetStateData:
     """Parsed representation of a single `/GetState.csv` response.
 
     The CSV the controller returns has six lines: SYSINFO, names, units,
-    offsets, gains, and raw values. The constructor parses all six and
-    builds a list of `DataObject` instances, then groups them by category
-    for easy lookup.
+    offsets, gains, and raw values. The constructor parses all six, but
+    `DataObject` instances are only built when a column is first accessed
+    (directly or through one of the category lists) and are cached from then
+    on. A poller that only reads `ph_electrode` and `redox_electrode` never
+    pays for the other forty columns.
+
+    The numeric rows are held column-wise in compact ``array("d")`` buffers
+    (offsets, gains, raw values, and calibrated values). Use
+    `values_by_category` / `raw_values_by_category` to read a whole category
+    in bulk without building any `DataObject`.
+
+    The header rows (names, units, offsets, gains) are parsed once and shared
+    between all snapshots that carry the same header, so a regular poll only
+    parses the SYSINFO and raw values rows.
 
     Once constructed, an instance is read-only — it represents a snapshot.
     Re-fetch and reconstruct the object whenever you need fresh data.
-
-    All public properties on this class are populated eagerly at construction
-    time, so accessing them is cheap.
     """
 
-    _time: str
     _version: str
     _cpu_time: int
     _reset_root_cause: int
@@ -476,22 +791,31 @@ class GetStateData:
     _ph_plus_dosage_relay_id: int
     _ph_minus_dosage_relay_id: int
     _chlorine_dosage_relay_id: int
-    _data_objects: list[DataObject]
-    _analog_objects: list[DataObject]
-    _electrode_objects: list[DataObject]
-    _temperature_objects: list[DataObject]
-    _relay_objects: list[DataObject]
-    _digital_input_objects: list[DataObject]
-    _external_relay_objects: list[DataObject]
-    _canister_objects: list[DataObject]
-    _consumption_objects: list[DataObject]
-
-    def __init__(self, raw_data: str):
+    _dosage_relay_mask: int
+    _raw_data: str | bytes
+    _encoding: str
+    _header: _StateHeader
+    _data_raw_values: array[float]
+    _data_values: array[float]
+    _relay_manual_mask: int
+    _relay_on_mask: int
+    _relay_invalid_mask: int
+    _data_objects: list[DataObject | None]
+    _category_objects: dict[str, list[DataObject]]
+    _category_relays: dict[str, list[Relay]]
+    _digital_inputs: list[DigitalInput] | None
+    _aggregated_relay_objects: tuple[DataObject, ...] | None
+    _aggregated_relays: tuple[Relay, ...] | None
+
+    def __init__(self, raw_data: str, layout: ColumnLayout = DEFAULT_COLUMN_LAYOUT):
         """Parse a `/GetState.csv` body into structured data.
 
         Args:
             raw_data: The raw multi-line CSV string returned by the
                 controller. Leading blank lines are tolerated.
+            layout: Column layout used to classify the columns. Only needs to
+                be changed for firmware variants that arrange the CSV
+                columns differently from the stock firmware.
 
         Raises:
             InvalidPayloadException: If the payload is empty, has fewer than
@@ -499,12 +823,48 @@ class GetStateData:
                 line up (names / units / offsets / gains / raw values must
                 all have the same number of comma-separated entries).
             ValueError: If any of the numeric rows contains a value that is
-                not parseable as a float.
+                not parseable as a float. A relay column holding a value
+                outside 0–3 is only reported once its ``display_value`` is
+                read or `determine_overall_relay_bit_state` encodes it.
         """
         self._raw_data = raw_data
+        self._encoding = DEFAULT_PAYLOAD_ENCODING
+        self._parse(raw_data.splitlines(), ",", layout)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        raw_data: bytes | bytearray | memoryview,
+        layout: ColumnLayout = DEFAULT_COLUMN_LAYOUT,
+        encoding: str = DEFAULT_PAYLOAD_ENCODING,
+    ) -> "GetStateData":
+        """Parse a `/GetState.csv` body straight from the raw response bytes.
+
+        Equivalent to ``GetStateData(raw_data.decode(encoding))``, but the
+        numeric rows are converted from bytes directly and only the header
+        rows are ever decoded (and only when they are not already cached),
+        so no decoded copy of the whole body is made. This is what
+        `proconip.api.async_get_state` uses.
 
+        Args:
+            raw_data: The response body as received.
+            layout: Column layout used to classify the columns.
+            encoding: Encoding of the names and units rows, and of the text
+                returned by `str()`.
+
+        Raises:
+            InvalidPayloadException: Same conditions as the constructor.
+            ValueError: Same conditions as the constructor.
+        """
+        state = cls.__new__(cls)
+        state._raw_data = bytes(raw_data)
+        state._encoding = encoding
+        state._parse(state._raw_data.splitlines(), b",", layout)
+        return state
+
+    def _parse[T: (str, bytes)](self, lines: list[T], separator: T, layout: ColumnLayout) -> None:
+        """Parse the payload lines; shared by the text and bytes entry points."""
         line = 0
-        lines = raw_data.splitlines()
         while line < len(lines) and len(lines[line].strip()) < 1:
             line += 1
         if len(lines) < line + 6:
@@ -512,19 +872,23 @@ class GetStateData:
                 f"GetState.csv payload is incomplete: expected at least 6 non-blank lines, "
                 f"got {len(lines) - line}"
             )
-        self._system_info = lines[line].split(",")
-        self._data_names = lines[line + 1].split(",")
-        self._data_units = lines[line + 2].split(",")
-        self._data_offsets = [float(v) for v in lines[line + 3].split(",")]
-        self._data_gain = [float(v) for v in lines[line + 4].split(",")]
-        self._data_raw_values = [float(v) for v in lines[line + 5].split(",")]
-
-        column_count = len(self._data_names)
+        system_info = lines[line].split(separator)
+        self._header = _parse_state_header(
+            lines[line + 1],
+            lines[line + 2],
+            lines[line + 3],
+            lines[line + 4],
+            layout,
+            self._encoding,
+        )
+        self._data_raw_values = array("d", map(float, lines[line + 5].split(separator)))
+
+        column_count = len(self._header.names)
         row_lengths = {
             "names": column_count,
-            "units": len(self._data_units),
-            "offsets": len(self._data_offsets),
-            "gains": len(self._data_gain),
+            "units": len(self._header.units),
+            "offsets": len(self._header.offsets),
+            "gains": len(self._header.gains),
             "raw_values": len(self._data_raw_values),
         }
         if len(set(row_lengths.values())) != 1:
@@ -533,30 +897,95 @@ class GetStateData:
                 + ", ".join(f"{k}={v}" for k, v in row_lengths.items())
             )
 
-        self._parse_system_info()
-        self._parse()
-        self._time = self._data_objects[0].display_value
+        self._parse_system_info(system_info)
+        self._data_values = array(
+            "d",
+            [
+                offset + gain * raw_value
+                for offset, gain, raw_value in zip(
+                    self._header.offsets, self._header.gains, self._data_raw_values
+                )
+            ],
+        )
+        self._data_objects = [None] * column_count
+        self._category_objects = {}
+        self._category_relays = {}
+        self._digital_inputs = None
+        self._aggregated_relay_objects = None
+        self._aggregated_relays = None
+        self._parse_relay_bits()
 
     def __str__(self) -> str:
         """Return the original raw CSV as it was received."""
-        return self._raw_data
-
-    def _parse_system_info(self) -> None:
-        """Populate the system-level attributes from the SYSINFO line."""
-        self._version = self._system_info[1]
-        self._cpu_time = int(self._system_info[2])
-        self._reset_root_cause = int(self._system_info[3])
-        self._ntp_fault_state = int(self._system_info[4])
-        self._config_other_enable = int(self._system_info[5])
-        self._dosage_control = int(self._system_info[6])
-        self._ph_plus_dosage_relay_id = int(self._system_info[7])
-        self._ph_minus_dosage_relay_id = int(self._system_info[8])
-        self._chlorine_dosage_relay_id = int(self._system_info[9])
+        return _as_text(self._raw_data, self._encoding)
+
+    def matches_payload(self, raw_data: str | bytes) -> bool:
+        """True if ``raw_data`` is identical to the body this snapshot was parsed from.
+
+        Accepts either text or bytes, regardless of which form the snapshot
+        was built from. Used to skip re-parsing unchanged polls.
+        """
+        if isinstance(raw_data, str):
+            return raw_data == str(self)
+        if isinstance(self._raw_data, bytes):
+            return raw_data == self._raw_data
+        return raw_data == self._raw_data.encode(self._encoding)
+
+    def _parse_relay_bits(self) -> None:
+        """Fold the relay columns into the manual-mode and on-state bitmaps.
+
+        Bit ``n`` of each mask belongs to aggregated relay ID ``n`` (internal
+        relays 0–7, external relays 8–15), matching `Relay.get_bit_mask`.
+        A relay whose value is not one of the four states 0–3 gets both bits
+        clear and is recorded in ``_relay_invalid_mask`` instead, so that
+        `determine_overall_relay_bit_state` can refuse to encode it.
+        """
+        manual_mask = 0
+        on_mask = 0
+        invalid_mask = 0
+        for category, id_offset in (
+            (CATEGORY_RELAY, 0),
+            (CATEGORY_EXTERNAL_RELAY, EXTERNAL_RELAY_ID_OFFSET),
+        ):
+            for category_id, column in enumerate(self._columns_of(category)):
+                value = self._data_values[column]
+                bit = 1 << (category_id + id_offset)
+                if value not in (0, 1, 2, 3):
+                    invalid_mask |= bit
+                    continue
+                state = int(value)
+                if state & 2:
+                    manual_mask |= bit
+                if state & 1:
+                    on_mask |= bit
+        self._relay_manual_mask = manual_mask
+        self._relay_on_mask = on_mask
+        self._relay_invalid_mask = invalid_mask
+
+    def _parse_system_info(self, system_info: list[str] | list[bytes]) -> None:
+        """Populate the system-level attributes from the SYSINFO line's fields."""
+        self._version = _as_text(system_info[1], self._encoding)
+        self._cpu_time = int(system_info[2])
+        self._reset_root_cause = int(system_info[3])
+        self._ntp_fault_state = int(system_info[4])
+        self._config_other_enable = int(system_info[5])
+        self._dosage_control = int(system_info[6])
+        self._ph_plus_dosage_relay_id = int(system_info[7])
+        self._ph_minus_dosage_relay_id = int(system_info[8])
+        self._chlorine_dosage_relay_id = int(system_info[9])
+        self._dosage_relay_mask = 0
+        for dosage_relay_id in (
+            self._chlorine_dosage_relay_id,
+            self._ph_minus_dosage_relay_id,
+            self._ph_plus_dosage_relay_id,
+        ):
+            if dosage_relay_id >= 0:
+                self._dosage_relay_mask |= 1 << dosage_relay_id
 
     @property
     def time(self) -> str:
         """Controller's current local time as ``"HH:MM"``."""
-        return self._time
+        return self._data_object(0).display_value
 
     @property
     def version(self) -> str:
@@ -609,6 +1038,35 @@ class GetStateData:
         """Aggregated relay ID configured to act as the chlorine dosing pump."""
         return self._chlorine_dosage_relay_id
 
+    @property
+    def dosage_relay_mask(self) -> int:
+        """Bitmap of the configured dosage relays, indexed by aggregated relay ID.
+
+        Bit ``n`` is set if relay ``n`` is the chlorine, pH-, or pH+ dosing
+        pump. Lets safety checks test many relays at once, e.g.
+        ``state.dosage_relay_mask & relay.get_bit_mask()``.
+        """
+        return self._dosage_relay_mask
+
+    @property
+    def relay_manual_mask(self) -> int:
+        """Bitmap of the relays in manual mode, indexed by aggregated relay ID.
+
+        Bits 0–7 are the internal relays, bits 8–15 the external ones. Built
+        once while parsing, so reading it costs nothing. A relay whose value
+        is not a valid relay state has its bit clear here and in
+        `relay_on_mask`.
+        """
+        return self._relay_manual_mask
+
+    @property
+    def relay_on_mask(self) -> int:
+        """Bitmap of the relays whose output is currently on, indexed by aggregated relay ID.
+
+        Same bit layout as `relay_manual_mask`.
+        """
+        return self._relay_on_mask
+
     def is_chlorine_dosage_enabled(self) -> bool:
         """True if chlorine dosage control is enabled in the controller config (bit 0)."""
         return self._dosage_control & 1 == 1
@@ -630,18 +1088,21 @@ class GetStateData:
 
         Args:
             data_entity: A canister (column 36–38) or consumption (column 39–41)
-                `DataObject`. The chemical is inferred from the column index.
+                `DataObject`. The chemical is inferred from the position
+                within its category (chlorine, pH-, pH+).
 
         Returns:
             True if the corresponding ``is_*_dosage_enabled`` flag is set.
             False for any other column (or if the chemical is disabled).
         """
-        col = data_entity.column
-        if col in (36, 39):
+        if data_entity.category not in (CATEGORY_CANISTER, CATEGORY_CONSUMPTION):
+            return False
+        chemical = data_entity.category_id
+        if chemical == 0:
             return self.is_chlorine_dosage_enabled()
-        if col in (37, 40):
+        if chemical == 1:
             return self.is_ph_minus_dosage_enabled()
-        if col in (38, 41):
+        if chemical == 2:
             return self.is_ph_plus_dosage_enabled()
         return False
 
@@ -657,12 +1118,14 @@ class GetStateData:
             the entity's chemical, or ``None`` if the entity is not a
             canister/consumption object.
         """
-        col = data_entity.column
-        if col in (36, 39):
+        if data_entity.category not in (CATEGORY_CANISTER, CATEGORY_CONSUMPTION):
+            return None
+        chemical = data_entity.category_id
+        if chemical == 0:
             return self._chlorine_dosage_relay_id
-        if col in (37, 40):
+        if chemical == 1:
             return self._ph_minus_dosage_relay_id
-        if col in (38, 41):
+        if chemical == 2:
             return self._ph_plus_dosage_relay_id
         return None
 
@@ -703,14 +1166,9 @@ class GetStateData:
             state.is_dosage_relay(data_object=state.aggregated_relay_objects[5])
             ```
         """
-        dosage_control_relays = [
-            self._chlorine_dosage_relay_id,
-            self._ph_minus_dosage_relay_id,
-            self._ph_plus_dosage_relay_id,
-        ]
         if relay_object is not None:
-            return relay_object.relay_id in dosage_control_relays
-        if data_object is not None:
+            relay_id = relay_object.relay_id
+        elif data_object is not None:
             if data_object.category not in (CATEGORY_RELAY, CATEGORY_EXTERNAL_RELAY):
                 raise BadRelayException(
                     f"DataObject category '{data_object.category}' is not a relay category"
@@ -718,10 +1176,10 @@ class GetStateData:
             offset = (
                 EXTERNAL_RELAY_ID_OFFSET if data_object.category == CATEGORY_EXTERNAL_RELAY else 0
             )
-            return data_object.category_id + offset in dosage_control_relays
-        if relay_id is not None:
-            return relay_id in dosage_control_relays
-        return False
+            relay_id = data_object.category_id + offset
+        if relay_id is None or relay_id < 0:
+            return False
+        return (self._dosage_relay_mask >> relay_id) & 1 == 1
 
     def get_reset_root_cause_as_str(self) -> str:
         """Decode `reset_root_cause` to its `RESET_ROOT_CAUSE` label.
@@ -789,58 +1247,125 @@ class GetStateData:
         """True if the DMX extension module is enabled in the controller config (bit 8)."""
         return self._config_other_enable & 256 == 256
 
-    def _parse(self) -> None:
-        """Build per-column `DataObject` instances and group them by category."""
-        self._data_objects = []
-        for column, name in enumerate(self._data_names):
-            self._data_objects.append(
-                DataObject(
-                    column,
-                    name,
-                    self._data_units[column],
-                    self._data_offsets[column],
-                    self._data_gain[column],
-                    self._data_raw_values[column],
-                )
+    def _data_object(self, column: int) -> DataObject:
+        """Return the `DataObject` for ``column``, building it on first access."""
+        data_object = self._data_objects[column]
+        if data_object is None:
+            data_object = DataObject(
+                column,
+                self._header.names[column],
+                self._header.units[column],
+                self._header.offsets[column],
+                self._header.gains[column],
+                self._data_raw_values[column],
+                self._header.layout.spec(column),
             )
+            self._data_objects[column] = data_object
+        return data_object
+
+    def _columns_of(self, category: str) -> range | tuple[int, ...]:
+        """Return the column indices of one `CATEGORY_*` from the shared header index."""
+        return self._header.category_columns.get(category, ())
+
+    def _objects_of(self, category: str) -> list[DataObject]:
+        """Return the cached `DataObject` list for one `CATEGORY_*`, in column order.
 
-        self._analog_objects = [
-            obj for obj in self._data_objects if obj.category == CATEGORY_ANALOG
-        ]
-        self._electrode_objects = [
-            obj for obj in self._data_objects if obj.category == CATEGORY_ELECTRODE
-        ]
-        self._temperature_objects = [
-            obj for obj in self._data_objects if obj.category == CATEGORY_TEMPERATURE
-        ]
-        self._relay_objects = [obj for obj in self._data_objects if obj.category == CATEGORY_RELAY]
-        self._digital_input_objects = [
-            obj for obj in self._data_objects if obj.category == CATEGORY_DIGITAL_INPUT
-        ]
-        self._external_relay_objects = [
-            obj for obj in self._data_objects if obj.category == CATEGORY_EXTERNAL_RELAY
-        ]
-        self._canister_objects = [
-            obj for obj in self._data_objects if obj.category == CATEGORY_CANISTER
-        ]
-        self._consumption_objects = [
-            obj for obj in self._data_objects if obj.category == CATEGORY_CONSUMPTION
-        ]
+        Only the columns of the requested category are materialized.
+        """
+        objects = self._category_objects.get(category)
+        if objects is None:
+            objects = [self._data_object(column) for column in self._columns_of(category)]
+            self._category_objects[category] = objects
+        return objects
+
+    def _relays_of(self, category: str) -> list[Relay]:
+        """Return the cached `Relay` views of one relay category, in column order."""
+        relays = self._category_relays.get(category)
+        if relays is None:
+            relays = [Relay(obj) for obj in self._objects_of(category)]
+            self._category_relays[category] = relays
+        return relays
+
+    def values_by_category(self, category: str) -> array[float]:
+        """Calibrated values (``offset + gain * raw_value``) of one category, in column order.
+
+        Reads straight from the columnar buffers, so no `DataObject` is built.
+
+        Args:
+            category: One of the `CATEGORY_*` constants.
+
+        Returns:
+            A new ``array("d")``; empty if the payload has no such columns.
+
+        Example:
+            ```python
+            temperatures = state.values_by_category(CATEGORY_TEMPERATURE)
+            hottest = max(temperatures)
+            ```
+        """
+        return _take_columns(self._data_values, self._columns_of(category))
+
+    def raw_values_by_category(self, category: str) -> array[float]:
+        """Raw (uncalibrated) values of one category, in column order.
+
+        The raw counterpart of `values_by_category`.
+        """
+        return _take_columns(self._data_raw_values, self._columns_of(category))
+
+    def same_readings(self, other: "GetStateData") -> bool:
+        """True if ``other`` carries the same readings as this snapshot.
+
+        Compares the raw values rows in bulk, ignoring the `CATEGORY_TIME`
+        columns (the controller clock changes with every poll). Relay and
+        digital input states are part of that row, so a switched relay
+        counts as a change.
+        """
+        mine = self._data_raw_values
+        theirs = other._data_raw_values
+        if len(mine) != len(theirs):
+            return False
+        time_columns = self._columns_of(CATEGORY_TIME)
+        if isinstance(time_columns, range) and time_columns.start == 0:
+            # The default layout: the clock leads the row, compare the rest in one go.
+            return mine[time_columns.stop :] == theirs[time_columns.stop :]
+        ignored = set(time_columns)
+        return all(
+            a == b for column, (a, b) in enumerate(zip(mine, theirs)) if column not in ignored
+        )
+
+    def category_columns(self, category: str) -> range | tuple[int, ...]:
+        """Column indices of one `CATEGORY_*` in this payload, in column order.
+
+        Empty if the payload has no such columns.
+        """
+        return self._columns_of(category)
+
+    def values_at(self, columns: Iterable[int]) -> array[float]:
+        """Calibrated values of hand-picked columns, in the given order.
+
+        The counterpart of `values_by_category` for an arbitrary selection,
+        for example ``(6, 7)`` for both electrodes.
+
+        Raises:
+            IndexError: If a column lies beyond the end of the payload.
+        """
+        values = self._data_values
+        return array("d", [values[column] for column in columns])
 
     @property
     def analog_objects(self) -> list[DataObject]:
         """The five analog inputs (columns 1–5), in column order."""
-        return self._analog_objects
+        return self._objects_of(CATEGORY_ANALOG)
 
     @property
     def electrode_objects(self) -> list[DataObject]:
         """The two electrode readings — redox at index 0, pH at index 1."""
-        return self._electrode_objects
+        return self._objects_of(CATEGORY_ELECTRODE)
 
     @property
     def temperature_objects(self) -> list[DataObject]:
         """The eight temperature sensors (columns 8–15), in column order."""
-        return self._temperature_objects
+        return self._objects_of(CATEGORY_TEMPERATURE)
 
     @property
     def relay_objects(self) -> list[DataObject]:
@@ -850,27 +1375,34 @@ class GetStateData:
         `Relay` instances with on/off and manual/auto helpers, or
         `aggregated_relay_objects` to also include the external relays.
         """
-        return self._relay_objects
+        return self._objects_of(CATEGORY_RELAY)
 
     def relays(self) -> list[Relay]:
         """The eight built-in relays as `Relay` instances.
 
-        Equivalent to wrapping each entry in `relay_objects` with `Relay(...)`.
+        Equivalent to wrapping each entry in `relay_objects` with `Relay(...)`,
+        except that the instances are built once and cached on the snapshot.
         """
-        return [Relay(obj) for obj in self._relay_objects]
+        return list(self._relays_of(CATEGORY_RELAY))
 
     @property
     def digital_input_objects(self) -> list[DataObject]:
         """The four digital inputs (columns 24–27), in column order."""
-        return self._digital_input_objects
+        return self._objects_of(CATEGORY_DIGITAL_INPUT)
 
     def digital_inputs(self) -> list[DigitalInput]:
         """The four digital inputs as `DigitalInput` instances.
 
         Equivalent to wrapping each entry in `digital_input_objects` with
-        `DigitalInput(...)`. Use these to get `get_bit_mask()` for triggering.
+        `DigitalInput(...)`, except that the instances are built once and
+        cached on the snapshot. Use these to get `get_bit_mask()` for
+        triggering.
         """
-        return [DigitalInput(obj) for obj in self._digital_input_objects]
+        if self._digital_inputs is None:
+            self._digital_inputs = [
+                DigitalInput(obj) for obj in self._objects_of(CATEGORY_DIGITAL_INPUT)
+            ]
+        return list(self._digital_inputs)
 
     @property
     def external_relay_objects(self) -> list[DataObject]:
@@ -880,11 +1412,11 @@ class GetStateData:
         not enabled in the controller config — check
         `is_relay_extension_enabled` before treating them as live.
         """
-        return self._external_relay_objects
+        return self._objects_of(CATEGORY_EXTERNAL_RELAY)
 
     def external_relays(self) -> list[Relay]:
-        """The eight external relays as `Relay` instances."""
-        return [Relay(obj) for obj in self._external_relay_objects]
+        """The eight external relays as `Relay` instances, cached like `relays()`."""
+        return list(self._relays_of(CATEGORY_EXTERNAL_RELAY))
 
     @property
     def canister_objects(self) -> list[DataObject]:
@@ -893,7 +1425,7 @@ class GetStateData:
         Order: chlorine, pH-, pH+. Convenience properties `chlorine_canister`,
         `ph_minus_canister`, and `ph_plus_canister` return individual entries.
         """
-        return self._canister_objects
+        return self._objects_of(CATEGORY_CANISTER)
 
     @property
     def consumption_objects(self) -> list[DataObject]:
@@ -903,71 +1435,80 @@ class GetStateData:
         `chlorine_consumption`, `ph_minus_consumption`, and
         `ph_plus_consumption` return individual entries.
         """
-        return self._consumption_objects
+        return self._objects_of(CATEGORY_CONSUMPTION)
 
     @property
     def redox_electrode(self) -> DataObject:
         """The redox electrode reading (column 6)."""
-        return self._electrode_objects[0]
+        return self._objects_of(CATEGORY_ELECTRODE)[0]
 
     @property
     def ph_electrode(self) -> DataObject:
         """The pH electrode reading (column 7)."""
-        return self._electrode_objects[1]
+        return self._objects_of(CATEGORY_ELECTRODE)[1]
 
     @property
     def chlorine_canister(self) -> DataObject:
         """Chlorine canister fill level (column 36)."""
-        return self._canister_objects[0]
+        return self._objects_of(CATEGORY_CANISTER)[0]
 
     @property
     def ph_minus_canister(self) -> DataObject:
         """pH- canister fill level (column 37)."""
-        return self._canister_objects[1]
+        return self._objects_of(CATEGORY_CANISTER)[1]
 
     @property
     def ph_plus_canister(self) -> DataObject:
         """pH+ canister fill level (column 38)."""
-        return self._canister_objects[2]
+        return self._objects_of(CATEGORY_CANISTER)[2]
 
     @property
     def chlorine_consumption(self) -> DataObject:
         """Cumulative chlorine consumption counter (column 39)."""
-        return self._consumption_objects[0]
+        return self._objects_of(CATEGORY_CONSUMPTION)[0]
 
     @property
     def ph_minus_consumption(self) -> DataObject:
         """Cumulative pH- consumption counter (column 40)."""
-        return self._consumption_objects[1]
+        return self._objects_of(CATEGORY_CONSUMPTION)[1]
 
     @property
     def ph_plus_consumption(self) -> DataObject:
         """Cumulative pH+ consumption counter (column 41)."""
-        return self._consumption_objects[2]
+        return self._objects_of(CATEGORY_CONSUMPTION)[2]
 
     @property
     def aggregated_relay_objects(self) -> list[DataObject]:
         """All 16 relay `DataObject`s — internal first, then external.
 
         Index in this list is the aggregated relay ID used by `Relay.relay_id`,
-        `get_relay`, and the `RelaySwitch` API.
+        `get_relay`, and the `RelaySwitch` API. Each access returns a new
+        list over the same cached `DataObject`s.
         """
-        return self._relay_objects + self._external_relay_objects
+        return list(self._relay_data_objects())
+
+    def _relay_data_objects(self) -> tuple[DataObject, ...]:
+        """Return the cached, immutable aggregated tuple of relay `DataObject`s."""
+        if self._aggregated_relay_objects is None:
+            self._aggregated_relay_objects = tuple(
+                self._objects_of(CATEGORY_RELAY) + self._objects_of(CATEGORY_EXTERNAL_RELAY)
+            )
+        return self._aggregated_relay_objects
 
     @property
     def chlorine_dosage_relay(self) -> DataObject:
         """The relay configured as the chlorine dosing pump."""
-        return self.aggregated_relay_objects[self._chlorine_dosage_relay_id]
+        return self._relay_data_objects()[self._chlorine_dosage_relay_id]
 
     @property
     def ph_minus_dosage_relay(self) -> DataObject:
         """The relay configured as the pH- dosing pump."""
-        return self.aggregated_relay_objects[self._ph_minus_dosage_relay_id]
+        return self._relay_data_objects()[self._ph_minus_dosage_relay_id]
 
     @property
     def ph_plus_dosage_relay(self) -> DataObject:
         """The relay configured as the pH+ dosing pump."""
-        return self.aggregated_relay_objects[self._ph_plus_dosage_relay_id]
+        return self._relay_data_objects()[self._ph_plus_dosage_relay_id]
 
     def get_relay(self, relay_id: int) -> Relay:
         """Return the `Relay` for the given aggregated relay ID (0–15).
@@ -976,16 +1517,25 @@ class GetStateData:
             relay_id: 0–7 for internal relays, 8–15 for external relays.
 
         Returns:
-            A new `Relay` wrapping the underlying `DataObject`.
+            The `Relay` wrapping the underlying `DataObject`. Repeated calls
+            for the same ID return the same cached instance.
 
         Raises:
             IndexError: If ``relay_id`` is outside the 0–15 range.
         """
-        return Relay(self.aggregated_relay_objects[relay_id])
+        return self._relay_views()[relay_id]
 
     def get_relays(self) -> list[Relay]:
         """All 16 relays as `Relay` instances, in aggregated-ID order."""
-        return [Relay(obj) for obj in self.aggregated_relay_objects]
+        return list(self._relay_views())
+
+    def _relay_views(self) -> tuple[Relay, ...]:
+        """Return the cached, immutable aggregated tuple of `Relay` views."""
+        if self._aggregated_relays is None:
+            self._aggregated_relays = tuple(
+                self._relays_of(CATEGORY_RELAY) + self._relays_of(CATEGORY_EXTERNAL_RELAY)
+            )
+        return self._aggregated_relays
 
     def determine_overall_relay_bit_state(self) -> list[int]:
         """Build the two-element ENA bit field that represents the current relay state.
@@ -1003,19 +1553,23 @@ class GetStateData:
             The masks reflect the *current* state, so callers can flip a
             single relay's bit and POST the result to switch only that
             relay without touching the others.
+
+        Both masks are derived from `relay_manual_mask` and `relay_on_mask`,
+        which are computed once at parse time.
+
+        Raises:
+            ValueError: If one of the covered relays holds a value other
+                than the four valid relay states (0, 1, 2, 3). Its mode is
+                unknown, so any ENA write built from these masks could
+                silently switch it.
         """
-        relay_list: list[Relay] = [Relay(obj) for obj in self._relay_objects]
-        bit_state = [255, 0]
-        if self.is_relay_extension_enabled():
-            relay_list.extend(Relay(obj) for obj in self._external_relay_objects)
-            bit_state[0] = 65535
-        for relay in relay_list:
-            relay_bit_mask = relay.get_bit_mask()
-            if relay.is_auto_mode():
-                bit_state[0] &= ~relay_bit_mask
-            if relay.is_on():
-                bit_state[1] |= relay_bit_mask
-        return bit_state
+        relay_mask = 65535 if self.is_relay_extension_enabled() else 255
+        invalid_mask = self._relay_invalid_mask & relay_mask
+        if invalid_mask:
+            relay_id = (invalid_mask & -invalid_mask).bit_length() - 1
+            value = self._relay_views()[relay_id].value
+            raise ValueError(f"Unexpected relay value {value} for relay {relay_id}")
+        return [self._relay_manual_mask & relay_mask, self._relay_on_mask & relay_mask]
 
 
 class DmxChannelData:
@@ -1027,6 +1581,8 @@ class DmxChannelData:
             `GetDmxData.set`.
     """
 
+    __slots__ = ("value", "_index", "_name")
+
     value: int
     _index: int
     _name: str
@@ -1068,6 +1624,8 @@ class GetDmxData:
     """
 
     _channels: list[DmxChannelData]
+    _raw_data: str | bytes
+    _encoding: str
 
     def __init__(self, raw_data: str):
         """Parse a `/GetDmx.csv` body into 16 channels.
@@ -1083,17 +1641,42 @@ class GetDmxData:
             ValueError: If a channel value cannot be parsed as an integer.
         """
         self._raw_data = raw_data
-        self._channels = []
+        self._encoding = DEFAULT_PAYLOAD_ENCODING
+        self._parse(raw_data.splitlines(), ",")
 
+    @classmethod
+    def from_bytes(
+        cls,
+        raw_data: bytes | bytearray | memoryview,
+        encoding: str = DEFAULT_PAYLOAD_ENCODING,
+    ) -> "GetDmxData":
+        """Parse a `/GetDmx.csv` body straight from the raw response bytes.
+
+        Equivalent to ``GetDmxData(raw_data.decode(encoding))`` without
+        making a decoded copy of the body first. This is what
+        `proconip.api.async_get_dmx` uses.
+
+        Raises:
+            InvalidPayloadException: Same conditions as the constructor.
+            ValueError: Same conditions as the constructor.
+        """
+        dmx = cls.__new__(cls)
+        dmx._raw_data = bytes(raw_data)
+        dmx._encoding = encoding
+        dmx._parse(dmx._raw_data.splitlines(), b",")
+        return dmx
+
+    def _parse[T: (str, bytes)](self, lines: list[T], separator: T) -> None:
+        """Parse the payload lines; shared by the text and bytes entry points."""
+        self._channels = []
         line = 0
-        lines = raw_data.splitlines()
         while line < len(lines) and len(lines[line].strip()) < 1:
             line += 1
 
         if line >= len(lines):
             raise InvalidPayloadException("Empty or missing DMX payload")
 
-        values = lines[line].split(",")
+        values = lines[line].split(separator)
         if len(values) != 16:
             raise InvalidPayloadException(
                 f"GetDmx.csv must contain exactly 16 channels; got {len(values)}"
@@ -1111,7 +1694,7 @@ class GetDmxData:
 
     def __str__(self) -> str:
         """Return the raw CSV body the instance was parsed from."""
-        return self._raw_data
+        return _as_text(self._raw_data, self._encoding)
 
     def get_value(self, index: int) -> int:
         """Return the current value of the channel at ``index``.
@@ -0,0 +1,331 @@
+"""Polling many ProCon.IP controllers from one process.
+
+`proconip.client.ProconipClient` is built around one controller. An
+installer or monitoring service that looks after hundreds of pools needs the
+opposite trade-off: one shared `aiohttp.ClientSession`, a hard cap on the
+number of requests in flight across all controllers, and start times spread
+out so the whole fleet is not hit (and does not answer) in the same instant.
+
+`ControllerFleet` does that with a fixed pool of worker tasks fed by a
+deadline heap, so the number of tasks does not grow with the fleet and every
+controller only costs a small record with its precomputed URL and
+``Authorization`` header.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import time
+from collections.abc import AsyncIterator, Iterable, Mapping
+from types import TracebackType
+from typing import Self
+
+from aiohttp import BasicAuth, ClientSession, ClientTimeout, TCPConnector
+from yarl import URL
+
+from .api import _async_request, _handle_response_payload
+from .client import DEFAULT_KEEPALIVE_TIMEOUT
+from .definitions import API_PATH_GET_STATE, ConfigObject, GetStateData
+from .resilience import CircuitBreaker, RetryPolicy
+
+# Requests in flight across the whole fleet unless told otherwise.
+DEFAULT_FLEET_CONCURRENCY = 32
+
+# What a fleet poll yields per controller: its ID and the state, or why the
+# state could not be read.
+type FleetResult = tuple[str, GetStateData | Exception]
+
+
+class _Controller:
+    """One fleet member: its ID, state URL, auth header and circuit breaker."""
+
+    __slots__ = ("controller_id", "url", "headers", "breaker")
+
+    def __init__(
+        self, controller_id: str, config: ConfigObject, breaker: CircuitBreaker | None
+    ) -> None:
+        self.controller_id = controller_id
+        self.url = URL(config.base_url).with_path(API_PATH_GET_STATE)
+        self.headers = {"Authorization": BasicAuth(config.username, config.password).encode()}
+        self.breaker = breaker
+
+
+class ControllerFleet:
+    """Async context manager that polls the state of many controllers.
+
+    Controllers are given either as a mapping from an ID of your choice to
+    their `ConfigObject`, or as plain `ConfigObject`s identified by their
+    ``base_url``. On entry a session is created (unless one was passed in)
+    whose connector allows ``max_concurrency`` connections in total and
+    ``per_host_limit`` per controller; on exit it is closed again.
+
+    `poll` reads every controller once, `watch` keeps reading them at a
+    fixed interval. Both yield ``(controller_id, result)`` pairs in the
+    order the reads complete, where ``result`` is the `GetStateData` or the
+    exception the read failed with; one broken controller never ends the
+    iteration. At most ``max_concurrency`` reads run at a time.
+
+    With ``failure_threshold`` set, every controller gets its own
+    `proconip.resilience.CircuitBreaker`. Reads of a controller whose
+    circuit is open fail at once with `proconip.api.CircuitOpenException`
+    and hand their worker to the next controller instead of waiting for a
+    timeout.
+
+    Example:
+        ```python
+        configs = {"pool-a": config_a, "pool-b": config_b}
+        async with ControllerFleet(configs, max_concurrency=16) as fleet:
+            async for controller_id, result in fleet.watch(interval=30):
+                if isinstance(result, GetStateData):
+                    print(controller_id, result.ph_electrode.display_value)
+        ```
+    """
+
+    def __init__(
+        self,
+        controllers: Mapping[str, ConfigObject] | Iterable[ConfigObject],
+        client_session: ClientSession | None = None,
+        timeout: float = 10.0,
+        max_concurrency: int = DEFAULT_FLEET_CONCURRENCY,
+        per_host_limit: int = 1,
+        retry: RetryPolicy | None = None,
+        failure_threshold: int | None = None,
+        cooldown: float = 30.0,
+    ):
+        """Precompute every controller's URL and auth header.
+
+        Args:
+            controllers: The controllers to poll, keyed by ID, or as
+                `ConfigObject`s that are keyed by their ``base_url``.
+            client_session: An open `aiohttp.ClientSession` to borrow. If
+                ``None``, the fleet creates its own on entry and closes it
+                on exit.
+            timeout: Per-request timeout in seconds.
+            max_concurrency: Maximum reads in flight across the fleet.
+            per_host_limit: Maximum simultaneous connections to any one
+                controller of an owned session. Ignored for a borrowed
+                session.
+            retry: Retry policy for reads that hit a timeout or network
+                error (see `proconip.resilience.RetryPolicy`).
+            failure_threshold: Consecutive failures after which a
+                controller's circuit opens. ``None`` (the default) turns
+                circuit breaking off.
+            cooldown: Seconds an open circuit rejects reads before it lets a
+                probe through.
+
+        Raises:
+            ValueError: If ``max_concurrency`` or ``per_host_limit`` is
+                below 1, or two controllers share an ID.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if per_host_limit < 1:
+            raise ValueError(f"per_host_limit must be at least 1, got {per_host_limit}")
+        if isinstance(controllers, Mapping):
+            configs = list(controllers.items())
+        else:
+            configs = [(config.base_url, config) for config in controllers]
+        self._controllers: list[_Controller] = []
+        self._by_id: dict[str, _Controller] = {}
+        for controller_id, config in configs:
+            if controller_id in self._by_id:
+                raise ValueError(f"Duplicate controller ID {controller_id!r}")
+            breaker = None
+            if failure_threshold is not None:
+                breaker = CircuitBreaker(failure_threshold, cooldown)
+            controller = _Controller(controller_id, config, breaker)
+            self._controllers.append(controller)
+            self._by_id[controller_id] = controller
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.retry = retry
+        self._per_host_limit = per_host_limit
+        self._session = client_session
+        self._owns_session = client_session is None
+
+    def __len__(self) -> int:
+        """Number of controllers in the fleet."""
+        return len(self._controllers)
+
+    async def __aenter__(self) -> Self:
+        """Create the owned session if needed and return the fleet."""
+        if self._session is None:
+            connector = TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self._per_host_limit,
+                keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+            )
+            self._session = ClientSession(connector=connector, timeout=ClientTimeout(total=None))
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the session if the fleet owns it."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the owned session. A borrowed session is left open."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def client_session(self) -> ClientSession:
+        """The session requests are sent through.
+
+        Raises:
+            RuntimeError: If the fleet owns its session and has not been
+                entered yet (or has already been closed).
+        """
+        if self._session is None:
+            raise RuntimeError("ControllerFleet is not open; use it as 'async with'")
+        return self._session
+
+    def breaker(self, controller_id: str) -> CircuitBreaker | None:
+        """Return the circuit breaker of ``controller_id``, if circuit breaking is on.
+
+        Raises:
+            KeyError: If there is no controller with that ID.
+        """
+        return self._by_id[controller_id].breaker
+
+    async def poll(self, stagger: float = 0.0) -> AsyncIterator[FleetResult]:
+        """Read every controller once, yielding results as they complete.
+
+        Args:
+            stagger: Seconds over which the reads are started, spread evenly
+                across the fleet. ``0`` starts them as fast as the
+                concurrency cap allows.
+
+        Raises:
+            ValueError: If ``stagger`` is negative.
+        """
+        if stagger < 0:
+            raise ValueError(f"stagger must not be negative, got {stagger}")
+        async for result in self._async_run(stagger, None):
+            yield result
+
+    async def watch(
+        self, interval: float, stagger: float | None = None
+    ) -> AsyncIterator[FleetResult]:
+        """Read every controller every ``interval`` seconds, indefinitely.
+
+        Each controller keeps its own phase: the first reads are spread over
+        ``stagger`` seconds, and every controller is read again ``interval``
+        seconds after its previous read was due (or at once, if that read
+        took longer). A controller is never read twice at the same time.
+
+        A consumer that falls behind holds up the workers rather than
+        letting results pile up, so memory stays bounded.
+
+        Args:
+            interval: Seconds between two reads of the same controller.
+            stagger: Seconds over which the first reads are spread.
+                Defaults to ``interval``, which spreads the load evenly.
+
+        Raises:
+            ValueError: If ``interval`` is not positive or ``stagger`` is
+                negative.
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        if stagger is None:
+            stagger = interval
+        if stagger < 0:
+            raise ValueError(f"stagger must not be negative, got {stagger}")
+        async for result in self._async_run(stagger, interval):
+            yield result
+
+    async def _async_run(
+        self, stagger: float, interval: float | None
+    ) -> AsyncIterator[FleetResult]:
+        """Run the scheduler and worker pool until the consumer stops (or one round ends)."""
+        session = self.client_session
+        count = len(self._controllers)
+        if not count:
+            return
+        start = time.monotonic()
+        deadlines = [(start + index * stagger / count, index) for index in range(count)]
+        work: asyncio.Queue[tuple[float, int]] = asyncio.Queue()
+        results: asyncio.Queue[FleetResult] = asyncio.Queue(maxsize=self.max_concurrency)
+        wakeup = asyncio.Event()
+        tasks = [asyncio.ensure_future(self._async_schedule(deadlines, work, wakeup))]
+        tasks.extend(
+            asyncio.ensure_future(
+                self._async_work(session, deadlines, work, results, wakeup, interval)
+            )
+            for _ in range(min(self.max_concurrency, count))
+        )
+        try:
+            remaining = count
+            while interval is not None or remaining:
+                yield await results.get()
+                remaining -= 1
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _async_schedule(
+        deadlines: list[tuple[float, int]],
+        work: asyncio.Queue[tuple[float, int]],
+        wakeup: asyncio.Event,
+    ) -> None:
+        """Hand every controller to the workers once its deadline has passed."""
+        while True:
+            if not deadlines:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+            due, index = deadlines[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                wakeup.clear()
+                with contextlib.suppress(TimeoutError):
+                    async with asyncio.timeout(delay):
+                        await wakeup.wait()
+                continue
+            heapq.heappop(deadlines)
+            work.put_nowait((due, index))
+
+    async def _async_work(
+        self,
+        session: ClientSession,
+        deadlines: list[tuple[float, int]],
+        work: asyncio.Queue[tuple[float, int]],
+        results: asyncio.Queue[FleetResult],
+        wakeup: asyncio.Event,
+        interval: float | None,
+    ) -> None:
+        """Read controllers from ``work``, report them and schedule their next read."""
+        while True:
+            due, index = await work.get()
+            controller = self._controllers[index]
+            result: GetStateData | Exception
+            try:
+                result = await self._async_fetch(session, controller)
+            except Exception as exc:
+                result = exc
+            await results.put((controller.controller_id, result))
+            if interval is not None:
+                heapq.heappush(deadlines, (max(due + interval, time.monotonic()), index))
+                wakeup.set()
+
+    async def _async_fetch(self, session: ClientSession, controller: _Controller) -> GetStateData:
+        """Read and parse the state of one controller."""
+        raw_data, encoding = await _async_request(
+            session,
+            "GET",
+            controller.url,
+            self.timeout,
+            _handle_response_payload,
+            headers=controller.headers,
+            retry=self.retry,
+            breaker=controller.breaker,
+        )
+        return GetStateData.from_bytes(raw_data, encoding=encoding)
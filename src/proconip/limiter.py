@@ -0,0 +1,199 @@
+"""Per-controller request limiting.
+
+The ProCon.IP runs a tiny embedded web server that handles requests one at
+a time and stops answering when it is flooded. `RequestLimiter` keeps the
+traffic to one controller within bounds: at most ``max_in_flight`` requests
+at once, at most ``max_rate`` request starts per second, and at least
+``min_spacing`` seconds between two starts. Excess requests wait in a FIFO
+queue, with writes served before reads so a switch command is never stuck
+behind a backlog of polls.
+
+Share one limiter per controller between everything that talks to it, by
+passing it to `proconip.client.ProconipClient`, to the OO wrappers, or to
+the free functions in `proconip.api`.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+
+
+class RequestLimiter:
+    """Admission control for the requests sent to one controller.
+
+    The queue depth and wait time statistics help to tune the limits: a
+    steadily growing `queue_depth` or `average_wait` means callers ask for
+    more than the limits allow.
+
+    Example:
+        ```python
+        limiter = RequestLimiter(max_in_flight=1, max_rate=2.0)
+        async with ProconipClient(config, limiter=limiter) as client:
+            ...
+        print(limiter.queue_depth, limiter.average_wait)
+        ```
+    """
+
+    __slots__ = (
+        "max_in_flight",
+        "max_rate",
+        "min_spacing",
+        "_writes",
+        "_reads",
+        "_in_flight",
+        "_tokens",
+        "_refilled_at",
+        "_last_start",
+        "_timer",
+        "_granted",
+        "_total_wait",
+        "_max_wait",
+    )
+
+    def __init__(
+        self,
+        max_in_flight: int = 1,
+        max_rate: float | None = None,
+        min_spacing: float = 0.0,
+    ):
+        """Set the limits.
+
+        Args:
+            max_in_flight: Maximum number of requests sent at the same time.
+            max_rate: Maximum request starts per second, averaged by a token
+                bucket that allows bursts of up to ``max_rate`` requests.
+                ``None`` (the default) leaves the rate unlimited.
+            min_spacing: Minimum seconds between two request starts.
+
+        Raises:
+            ValueError: If ``max_in_flight`` is below 1, ``max_rate`` is not
+                positive, or ``min_spacing`` is negative.
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
+        if max_rate is not None and max_rate <= 0:
+            raise ValueError(f"max_rate must be positive, got {max_rate}")
+        if min_spacing < 0:
+            raise ValueError(f"min_spacing must not be negative, got {min_spacing}")
+        self.max_in_flight = max_in_flight
+        self.max_rate = max_rate
+        self.min_spacing = min_spacing
+        self._writes: deque[asyncio.Future[None]] = deque()
+        self._reads: deque[asyncio.Future[None]] = deque()
+        self._in_flight = 0
+        self._tokens = 0.0 if max_rate is None else max(1.0, max_rate)
+        self._refilled_at = time.monotonic()
+        self._last_start = -float("inf")
+        self._timer: asyncio.TimerHandle | None = None
+        self._granted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests currently waiting for a slot."""
+        return len(self._writes) + len(self._reads)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding a slot."""
+        return self._in_flight
+
+    @property
+    def granted(self) -> int:
+        """Number of slots handed out so far."""
+        return self._granted
+
+    @property
+    def average_wait(self) -> float:
+        """Mean seconds a request waited for its slot, ``0.0`` before the first one."""
+        return self._total_wait / self._granted if self._granted else 0.0
+
+    @property
+    def max_wait(self) -> float:
+        """Longest seconds a request waited for its slot."""
+        return self._max_wait
+
+    @contextlib.asynccontextmanager
+    async def slot(self, write: bool = False) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the ``async with`` block.
+
+        Args:
+            write: Queue ahead of all waiting reads.
+        """
+        await self.acquire(write)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, write: bool = False) -> None:
+        """Wait until the limits allow one more request, then take a slot.
+
+        Every successful `acquire` must be paired with a `release`; prefer
+        `slot`, which does that for you.
+
+        Args:
+            write: Queue ahead of all waiting reads.
+        """
+        queue = self._writes if write else self._reads
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        enqueued_at = time.monotonic()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just before the cancellation arrived.
+                self.release()
+            else:
+                with contextlib.suppress(ValueError):
+                    queue.remove(future)
+            raise
+        wait = time.monotonic() - enqueued_at
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+
+    def release(self) -> None:
+        """Give a slot back and admit the next waiting request, if any."""
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots to waiting requests for as long as the limits allow."""
+        while self._writes or self._reads:
+            if self._in_flight >= self.max_in_flight:
+                return
+            now = time.monotonic()
+            delay = self._delay(now)
+            if delay > 0:
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+                return
+            future = (self._writes or self._reads).popleft()
+            if future.done():
+                continue
+            if self.max_rate is not None:
+                self._tokens -= 1
+            self._last_start = now
+            self._in_flight += 1
+            self._granted += 1
+            future.set_result(None)
+
+    def _delay(self, now: float) -> float:
+        """Seconds until the rate and spacing limits admit the next request."""
+        delay = self._last_start + self.min_spacing - now
+        if self.max_rate is not None:
+            capacity = max(1.0, self.max_rate)
+            self._tokens = min(capacity, self._tokens + (now - self._refilled_at) * self.max_rate)
+            self._refilled_at = now
+            if self._tokens < 1:
+                delay = max(delay, (1 - self._tokens) / self.max_rate)
+        return delay
+
+    def _wake(self) -> None:
+        self._timer = None
+        self._dispatch()
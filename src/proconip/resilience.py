@@ -0,0 +1,143 @@
+"""Retries and circuit breaking for controllers that are unreachable.
+
+A controller that is switched off or has dropped off the network makes
+every request run into its full timeout. Both classes here are opt-in and
+plug into the same places as `proconip.limiter.RequestLimiter`:
+
+- `RetryPolicy` repeats a failed read after a short, randomly jittered
+  backoff, so a single lost packet does not surface as an error. Writes are
+  never retried, since the controller may already have applied them.
+- `CircuitBreaker` counts consecutive transport failures (timeouts and
+  network errors) of one controller. Past a threshold it opens and requests
+  fail immediately with `proconip.api.CircuitOpenException` until a cooldown
+  has passed; then a single probe request decides whether it closes again.
+  An open circuit is checked before a limiter slot is taken, so requests to
+  a dead controller do not occupy the limiter at all.
+
+HTTP error responses are no transport failures: a controller that answers
+with 401 or 500 is reachable, and retrying will not change the answer.
+"""
+
+import random
+import time
+
+
+class RetryPolicy:
+    """How often, and after which backoff, a failed read is repeated.
+
+    Retry ``n`` (counting from 0) waits a random time between zero and
+    ``min(max_delay, base_delay * 2**n)`` seconds ("full jitter"), which
+    keeps many clients that failed together from retrying in lockstep.
+
+    Example:
+        ```python
+        retry = RetryPolicy(attempts=3, base_delay=0.5)
+        state = await async_get_state(session, config, retry=retry)
+        ```
+    """
+
+    __slots__ = ("attempts", "base_delay", "max_delay")
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.2, max_delay: float = 5.0):
+        """Set the attempt budget and the backoff bounds.
+
+        Args:
+            attempts: Total attempts per call, including the first one.
+            base_delay: Upper bound of the first backoff, in seconds.
+            max_delay: Upper bound of any backoff, in seconds.
+
+        Raises:
+            ValueError: If ``attempts`` is below 1 or a delay is negative.
+        """
+        if attempts < 1:
+            raise ValueError(f"attempts must be at least 1, got {attempts}")
+        if base_delay < 0 or max_delay < 0:
+            raise ValueError("base_delay and max_delay must not be negative")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, retry: int) -> float:
+        """Return the jittered backoff before retry number ``retry`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class CircuitBreaker:
+    """Fail fast for a controller after repeated transport failures.
+
+    Share one breaker per controller between everything that talks to it.
+
+    Example:
+        ```python
+        breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+        async with ProconipClient(config, breaker=breaker) as client:
+            ...
+        ```
+    """
+
+    __slots__ = ("failure_threshold", "cooldown", "_failures", "_opened_at")
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        """Set when the circuit opens and how long it stays open.
+
+        Args:
+            failure_threshold: Consecutive transport failures that open the
+                circuit.
+            cooldown: Seconds an open circuit rejects requests before it
+                lets a probe through.
+
+        Raises:
+            ValueError: If ``failure_threshold`` is below 1 or ``cooldown``
+                is negative.
+        """
+        if failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be at least 1, got {failure_threshold}")
+        if cooldown < 0:
+            raise ValueError(f"cooldown must not be negative, got {cooldown}")
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit is open, i.e. requests are (mostly) rejected."""
+        return self._opened_at is not None
+
+    @property
+    def failures(self) -> int:
+        """Consecutive transport failures seen so far."""
+        return self._failures
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets the next probe through; ``0.0`` if closed."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now.
+
+        Once the cooldown of an open circuit has passed, exactly one caller
+        is let through as a probe and the cooldown starts over, so a probe
+        that never reports back cannot keep the circuit shut for good.
+        """
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now < self._opened_at + self.cooldown:
+            return False
+        self._opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Note that the controller answered; closes the circuit."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Note a transport failure; opens the circuit past the threshold."""
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
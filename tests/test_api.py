@@ -1,11 +1,13 @@
 """Tests for the API module — HTTP layer, error mapping, and class wrappers."""
 
 import asyncio
+import gc
 from unittest.mock import patch
 
 import aiohttp
 import pytest
-from aioresponses import aioresponses
+from aioresponses import CallbackResult, aioresponses
+from yarl import URL
 
 from proconip.api import (
     BadCredentialsException,
@@ -17,7 +19,9 @@ from proconip.api import (
     ProconipApiException,
     RelaySwitch,
     TimeoutException,
+    async_apply_relay_changes,
     async_get_dmx,
+    async_get_raw_bytes,
     async_get_raw_dmx,
     async_get_raw_state,
     async_get_state,
@@ -28,7 +32,14 @@ from proconip.api import (
     async_switch_on,
     async_trigger_digital_input,
 )
-from proconip.definitions import ConfigObject, DosageTarget, GetDmxData, GetStateData
+from proconip.definitions import (
+    BadRelayException,
+    ConfigObject,
+    DosageTarget,
+    GetDmxData,
+    GetStateData,
+    RelayMode,
+)
 
 BASE_URL = "http://127.0.0.1"
 GET_STATE_URL = f"{BASE_URL}/GetState.csv"
@@ -105,6 +116,166 @@ async def test_get_state_returns_parsed_data(config: ConfigObject, get_state_csv
     assert state.version == "1.7.3"
 
 
+async def test_get_state_reuses_previous_state_for_identical_body(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    previous = GetStateData(get_state_csv)
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        async with aiohttp.ClientSession() as session:
+            state = await async_get_state(session, config, previous_state=previous)
+    assert state is previous
+
+
+async def test_get_state_parses_changed_body_despite_previous_state(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    previous = GetStateData(get_state_csv)
+    changed = get_state_csv.replace("529,", "530,", 1)
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=changed, status=200)
+        async with aiohttp.ClientSession() as session:
+            state = await async_get_state(session, config, previous_state=previous)
+    assert state is not previous
+    assert str(state) == changed
+
+
+async def test_get_state_parses_response_bytes(config: ConfigObject, get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv.encode(), status=200)
+        async with aiohttp.ClientSession() as session:
+            with patch.object(aiohttp.ClientResponse, "text") as text:
+                state = await async_get_state(session, config)
+    text.assert_not_called()
+    assert str(state) == get_state_csv
+
+
+async def test_get_state_decodes_names_with_response_charset(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    payload = get_state_csv.replace("Terassenlicht", "Außenlicht")
+    with aioresponses() as m:
+        m.get(
+            GET_STATE_URL,
+            body=payload.encode("latin-1"),
+            status=200,
+            content_type="text/csv; charset=ISO-8859-1",
+        )
+        async with aiohttp.ClientSession() as session:
+            state = await async_get_state(session, config)
+    assert state.get_relay(0).name == "Außenlicht"
+    assert str(state) == payload
+
+
+async def test_get_raw_bytes_returns_undecoded_body(config: ConfigObject) -> None:
+    body = "Pumpe \u00e4,\n".encode("latin-1")
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=body, status=200)
+        async with aiohttp.ClientSession() as session:
+            result = await async_get_raw_bytes(session, config, URL(GET_STATE_URL))
+    assert result == body
+
+
+async def test_get_raw_bytes_maps_errors(config: ConfigObject) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, status=401)
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(BadCredentialsException):
+                await async_get_raw_bytes(session, config, URL(GET_STATE_URL))
+
+
+async def test_get_raw_state_fixed_encoding(config: ConfigObject) -> None:
+    body = "Pumpe \u00e4,\n".encode("latin-1")
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=body, status=200, content_type="text/csv")
+        async with aiohttp.ClientSession() as session:
+            with patch.object(aiohttp.ClientResponse, "get_encoding") as get_encoding:
+                result = await async_get_raw_state(session, config, encoding="latin-1")
+    get_encoding.assert_not_called()
+    assert result == "Pumpe \u00e4,\n"
+
+
+async def test_get_state_wrapper_raw_bytes_and_encoding(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv.encode(), status=200, repeat=True)
+        async with aiohttp.ClientSession() as session:
+            api = GetState(session, config, encoding="utf-8")
+            raw = await api.async_get_raw_bytes()
+            text = await api.async_get_raw_state()
+    assert raw == get_state_csv.encode()
+    assert text == get_state_csv
+
+
+async def test_get_state_wrapper_coalesces_concurrent_calls(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with aiohttp.ClientSession() as session:
+            api = GetState(session, config)
+            states = await asyncio.gather(*(api.async_get_state() for _ in range(5)))
+            later = await api.async_get_state()
+    assert all(state is states[0] for state in states)
+    assert later is not states[0]
+    assert sum(len(calls) for calls in m.requests.values()) == 2
+
+
+async def test_get_state_wrapper_coalesced_error_reaches_all_callers(config: ConfigObject) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, status=500)
+        async with aiohttp.ClientSession() as session:
+            api = GetState(session, config)
+            results = await asyncio.gather(
+                api.async_get_state(), api.async_get_state(), return_exceptions=True
+            )
+    assert all(isinstance(result, BadStatusCodeException) for result in results)
+
+
+async def test_get_state_wrapper_failure_after_all_callers_cancelled_is_not_logged(
+    config: ConfigObject,
+) -> None:
+    async def respond(url: URL, **kwargs: object) -> CallbackResult:
+        await asyncio.sleep(0.01)
+        return CallbackResult(status=500)
+
+    errors: list[dict] = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda _, context: errors.append(context))
+    try:
+        with aioresponses() as m:
+            m.get(GET_STATE_URL, callback=respond)
+            async with aiohttp.ClientSession() as session:
+                api = GetState(session, config)
+                caller = asyncio.ensure_future(api.async_get_state())
+                await asyncio.sleep(0)
+                caller.cancel()
+                await asyncio.sleep(0.05)
+        assert caller.cancelled()
+        del caller
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+    assert errors == []
+
+
+async def test_get_state_wrapper_cancelled_caller_does_not_cancel_others(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        async with aiohttp.ClientSession() as session:
+            api = GetState(session, config)
+            first = asyncio.ensure_future(api.async_get_state())
+            second = asyncio.ensure_future(api.async_get_state())
+            await asyncio.sleep(0)
+            first.cancel()
+            state = await second
+    assert first.cancelled()
+    assert isinstance(state, GetStateData)
+
+
 # ---------------------------------------------------------------------------
 # async_get_raw_dmx / async_get_dmx
 # ---------------------------------------------------------------------------
@@ -196,6 +367,90 @@ async def test_switch_on_401_raises_bad_credentials(
                 await async_switch_on(session, config, state, relay)
 
 
+async def test_switch_rejects_invalid_relay_values(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    lines = get_state_csv.splitlines()
+    values = lines[5].split(",")
+    values[16] = "nan"  # relay 0
+    lines[5] = ",".join(values)
+    state = GetStateData("\n".join(lines))
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(ValueError):
+                await async_switch_off(session, config, state, state.get_relay(1))
+    assert not m.requests
+
+
+async def test_apply_relay_changes_sends_one_post(config: ConfigObject, get_state_csv: str) -> None:
+    state = GetStateData(get_state_csv)
+    changes = {0: RelayMode.ON, 2: RelayMode.OFF, 5: RelayMode.OFF, 3: RelayMode.AUTO}
+    manual, on = state.determine_overall_relay_bit_state()
+    manual |= 0b100101
+    manual &= ~0b1000
+    on |= 0b1
+    on &= ~0b101100
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200)
+        async with aiohttp.ClientSession() as session:
+            result = await async_apply_relay_changes(session, config, state, changes)
+    assert result == "ok"
+    (call,) = m.requests[("POST", URL(USRCFG_URL))]
+    assert call.kwargs["data"] == f"ENA={manual},{on}&MANUAL=1"
+
+
+async def test_apply_relay_changes_matches_single_switches(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    state = GetStateData(get_state_csv)
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with aiohttp.ClientSession() as session:
+            await async_switch_on(session, config, state, state.get_relay(1))
+            await async_apply_relay_changes(session, config, state, {1: RelayMode.ON})
+    single, batch = m.requests[("POST", URL(USRCFG_URL))]
+    assert single.kwargs["data"] == batch.kwargs["data"]
+
+
+@pytest.mark.parametrize(
+    ("changes", "exception"),
+    [
+        ({0: RelayMode.ON, 5: RelayMode.ON}, BadRelayException),
+        ({}, ValueError),
+        ({0: 1}, ValueError),
+        ({16: RelayMode.OFF}, IndexError),
+        ({-1: RelayMode.OFF}, IndexError),
+        ({8: RelayMode.OFF}, IndexError),  # relay extension disabled
+    ],
+)
+async def test_apply_relay_changes_rejects_batch_without_sending(
+    config: ConfigObject, get_state_csv: str, changes: dict, exception: type[Exception]
+) -> None:
+    state = GetStateData(get_state_csv)
+    with aioresponses() as m:
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(exception):
+                await async_apply_relay_changes(session, config, state, changes)
+    assert not m.requests
+
+
+async def test_apply_relay_changes_external_relay_with_extension(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    lines = get_state_csv.splitlines()
+    sysinfo = lines[0].split(",")
+    sysinfo[5] = "16"  # relay extension enabled
+    lines[0] = ",".join(sysinfo)
+    state = GetStateData("\n".join(lines))
+    manual, on = state.determine_overall_relay_bit_state()
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200)
+        async with aiohttp.ClientSession() as session:
+            await async_apply_relay_changes(session, config, state, {8: RelayMode.ON})
+    (call,) = m.requests[("POST", URL(USRCFG_URL))]
+    assert call.kwargs["data"] == f"ENA={manual | 256},{on | 256}&MANUAL=1"
+
+
 # ---------------------------------------------------------------------------
 # async_start_dosage
 # ---------------------------------------------------------------------------
@@ -365,6 +620,34 @@ async def test_get_state_class_get_state(config: ConfigObject, get_state_csv: st
     assert isinstance(state, GetStateData)
 
 
+async def test_get_state_class_reuse_unchanged(config: ConfigObject, get_state_csv: str) -> None:
+    changed = get_state_csv.replace("529,", "530,", 1)
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, body=changed, status=200)
+        async with aiohttp.ClientSession() as session:
+            api = GetState(session, config, reuse_unchanged=True)
+            first = await api.async_get_state()
+            second = await api.async_get_state()
+            third = await api.async_get_state()
+    assert second is first
+    assert third is not first
+
+
+async def test_get_state_class_does_not_reuse_by_default(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        async with aiohttp.ClientSession() as session:
+            api = GetState(session, config)
+            first = await api.async_get_state()
+            second = await api.async_get_state()
+    assert second is not first
+
+
 async def test_relay_switch_class(config: ConfigObject, get_state_csv: str) -> None:
     state = GetStateData(get_state_csv)
     with aioresponses() as m:
@@ -378,6 +661,15 @@ async def test_relay_switch_class(config: ConfigObject, get_state_csv: str) -> N
             await rs.async_set_auto_mode(state, 0)
 
 
+async def test_relay_switch_class_apply_changes(config: ConfigObject, get_state_csv: str) -> None:
+    state = GetStateData(get_state_csv)
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200)
+        async with aiohttp.ClientSession() as session:
+            rs = RelaySwitch(session, config)
+            assert await rs.async_apply_changes(state, {0: RelayMode.ON, 1: RelayMode.ON}) == "ok"
+
+
 async def test_dosage_control_class(config: ConfigObject) -> None:
     cmd_url_chlorine = f"{BASE_URL}/Command.htm?MAN_DOSAGE=0,60"
     cmd_url_ph_minus = f"{BASE_URL}/Command.htm?MAN_DOSAGE=1,30"
@@ -0,0 +1,829 @@
+"""Tests for the persistent `ProconipClient`."""
+
+import asyncio
+import math
+from collections.abc import Callable
+
+import aiohttp
+import pytest
+from aioresponses import CallbackResult, aioresponses
+from yarl import URL
+
+from proconip.api import BadCredentialsException, ProconipApiException, TimeoutException
+from proconip.client import AdaptiveInterval, ProconipClient, _Subscription
+from proconip.definitions import (
+    CATEGORY_RELAY,
+    BadRelayException,
+    ConfigObject,
+    DosageTarget,
+    GetDmxData,
+    GetStateData,
+    RelayMode,
+)
+
+BASE_URL = "http://127.0.0.1"
+GET_STATE_URL = f"{BASE_URL}/GetState.csv"
+GET_DMX_URL = f"{BASE_URL}/GetDmx.csv"
+USRCFG_URL = f"{BASE_URL}/usrcfg.cgi"
+
+
+def _calls(m: aioresponses, method: str) -> list:
+    """Return the recorded calls for ``method``, in order."""
+    return [call for (meth, _), calls in m.requests.items() for call in calls if meth == method]
+
+
+# ---------------------------------------------------------------------------
+# Lifecycle
+# ---------------------------------------------------------------------------
+
+
+async def test_client_owns_and_closes_session(config: ConfigObject) -> None:
+    async with ProconipClient(config) as client:
+        session = client.client_session
+        assert not session.closed
+    assert session.closed
+    with pytest.raises(RuntimeError):
+        _ = client.client_session
+
+
+async def test_client_borrows_session_without_closing_it(config: ConfigObject) -> None:
+    async with aiohttp.ClientSession() as session:
+        async with ProconipClient(config, session) as client:
+            assert client.client_session is session
+        assert not session.closed
+
+
+async def test_client_requires_entering(config: ConfigObject) -> None:
+    client = ProconipClient(config)
+    with pytest.raises(RuntimeError):
+        await client.async_get_raw_state()
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+
+async def test_client_sends_precomputed_auth_header(config: ConfigObject) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body="raw", status=200)
+        async with ProconipClient(config) as client:
+            assert await client.async_get_raw_state() == "raw"
+    (call,) = _calls(m, "GET")
+    expected = aiohttp.BasicAuth(config.username, config.password).encode()
+    assert call.kwargs["headers"]["Authorization"] == expected
+    assert call.kwargs["auth"] is None
+
+
+async def test_client_get_state(config: ConfigObject, get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        async with ProconipClient(config) as client:
+            state = await client.async_get_state()
+    assert isinstance(state, GetStateData)
+    assert state.version == "1.7.3"
+
+
+async def test_client_get_state_honours_response_charset(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    payload = get_state_csv.replace("Terassenlicht", "Außenlicht")
+    with aioresponses() as m:
+        m.get(
+            GET_STATE_URL,
+            body=payload.encode("latin-1"),
+            status=200,
+            content_type="text/csv; charset=ISO-8859-1",
+        )
+        async with ProconipClient(config) as client:
+            state = await client.async_get_state()
+    assert state.get_relay(0).name == "Außenlicht"
+
+
+async def test_client_reuse_unchanged(config: ConfigObject, get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with ProconipClient(config, reuse_unchanged=True) as client:
+            first = await client.async_get_state()
+            second = await client.async_get_state()
+    assert second is first
+
+
+async def test_client_coalesces_concurrent_state_reads(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            states = await asyncio.gather(*(client.async_get_state() for _ in range(4)))
+    assert all(state is states[0] for state in states)
+    assert len(_calls(m, "GET")) == 1
+
+
+async def test_client_write_detaches_in_flight_read(
+    config: ConfigObject, get_state_csv: str, get_state_data: GetStateData
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        m.post(USRCFG_URL, body="ok", status=200)
+        async with ProconipClient(config) as client:
+            before = asyncio.ensure_future(client.async_get_state())
+            await asyncio.sleep(0)
+            await client.async_switch_off(get_state_data, 2)
+            after = await client.async_get_state()
+            assert await before is not after
+    assert len(_calls(m, "GET")) == 2
+
+
+async def test_client_get_dmx(config: ConfigObject, get_dmx_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_DMX_URL, body=get_dmx_csv, status=200)
+        m.get(GET_DMX_URL, body=get_dmx_csv, status=200)
+        async with ProconipClient(config, encoding="utf-8") as client:
+            dmx = await client.async_get_dmx()
+            raw = await client.async_get_raw_dmx()
+    assert isinstance(dmx, GetDmxData)
+    assert dmx.get_value(15) == 150
+    assert raw == get_dmx_csv
+
+
+async def test_client_maps_errors(config: ConfigObject) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, status=401)
+        m.get(GET_STATE_URL, exception=TimeoutError())
+        async with ProconipClient(config) as client:
+            with pytest.raises(BadCredentialsException):
+                await client.async_get_state()
+            with pytest.raises(TimeoutException):
+                await client.async_get_state()
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+
+async def test_client_relay_writes(config: ConfigObject, get_state_data: GetStateData) -> None:
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            await client.async_switch_on(get_state_data, 2)
+            await client.async_switch_off(get_state_data, 2)
+            await client.async_set_auto_mode(get_state_data, 2)
+    manual, on = get_state_data.determine_overall_relay_bit_state()
+    bit = get_state_data.get_relay(2).get_bit_mask()
+    payloads = [call.kwargs["data"] for call in _calls(m, "POST")]
+    assert payloads == [
+        f"ENA={manual | bit},{on | bit}&MANUAL=1",
+        f"ENA={manual | bit},{on & ~bit}&MANUAL=1",
+        f"ENA={manual & ~bit},{on & ~bit}&MANUAL=1",
+    ]
+    headers = _calls(m, "POST")[0].kwargs["headers"]
+    assert headers["Content-Type"].startswith("application/x-www-form-urlencoded")
+    assert headers["Authorization"].startswith("Basic ")
+
+
+async def test_client_apply_relay_changes(
+    config: ConfigObject, get_state_data: GetStateData
+) -> None:
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200)
+        async with ProconipClient(config) as client:
+            changes = {2: RelayMode.ON, 3: RelayMode.AUTO}
+            assert await client.async_apply_relay_changes(get_state_data, changes) == "ok"
+            with pytest.raises(BadRelayException):
+                await client.async_apply_relay_changes(get_state_data, {5: RelayMode.ON})
+    (call,) = _calls(m, "POST")
+    manual, on = get_state_data.determine_overall_relay_bit_state()
+    assert call.kwargs["data"] == f"ENA={(manual | 4) & ~8},{(on | 4) & ~8}&MANUAL=1"
+
+
+async def test_client_refuses_dosage_relay(
+    config: ConfigObject, get_state_data: GetStateData
+) -> None:
+    relay_id = get_state_data.chlorine_dosage_relay_id
+    async with ProconipClient(config) as client:
+        with pytest.raises(BadRelayException):
+            await client.async_switch_on(get_state_data, relay_id)
+
+
+async def test_client_start_dosage(config: ConfigObject) -> None:
+    with aioresponses() as m:
+        m.get(f"{BASE_URL}/Command.htm?MAN_DOSAGE=0,60", body="ok", status=200)
+        async with ProconipClient(config) as client:
+            assert await client.async_start_dosage(DosageTarget.CHLORINE, 60) == "ok"
+
+
+async def test_client_set_dmx(config: ConfigObject, get_dmx_data: GetDmxData) -> None:
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200)
+        async with ProconipClient(config) as client:
+            assert await client.async_set_dmx(get_dmx_data) == "ok"
+    (call,) = _calls(m, "POST")
+    assert call.kwargs["data"].startswith("TYPE=0&LEN=16&CH1_8=")
+
+
+async def test_client_trigger_digital_input(config: ConfigObject) -> None:
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="press-ok", status=200)
+        m.post(USRCFG_URL, body="release-ok", status=200)
+        async with ProconipClient(config) as client:
+            result = await client.async_trigger_digital_input(1, hold_seconds=0)
+            with pytest.raises(ValueError):
+                await client.async_trigger_digital_input(4)
+    assert result == "release-ok"
+    assert [c.kwargs["data"] for c in _calls(m, "POST")] == ["IO=2&WEBIO=1", "IO=0&WEBIO=1"]
+
+
+# ---------------------------------------------------------------------------
+# Relay model
+# ---------------------------------------------------------------------------
+
+
+async def test_client_relay_writes_use_fresh_model(
+    config: ConfigObject, get_state_csv: str, get_state_data: GetStateData
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with ProconipClient(config, relay_state_max_age=60) as client:
+            await client.async_get_state()
+            await client.async_switch_on(None, 2)
+            await client.async_switch_off(None, 3)
+    assert len(_calls(m, "GET")) == 1
+    manual, on = get_state_data.determine_overall_relay_bit_state()
+    payloads = [call.kwargs["data"] for call in _calls(m, "POST")]
+    assert payloads == [
+        f"ENA={manual | 4},{on | 4}&MANUAL=1",
+        f"ENA={manual | 4 | 8},{(on | 4) & ~8}&MANUAL=1",
+    ]
+
+
+async def test_client_relay_writes_read_without_fresh_model(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            await client.async_switch_on(None, 2)
+            await client.async_apply_relay_changes(None, {3: RelayMode.OFF})
+    assert len(_calls(m, "GET")) == 2
+    assert len(_calls(m, "POST")) == 2
+
+
+async def test_client_relay_model_dropped_after_unknown_writes(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        m.post(USRCFG_URL, status=500)
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with ProconipClient(config, relay_state_max_age=60) as client:
+            await client.async_get_state()
+            with pytest.raises(ProconipApiException):
+                await client.async_switch_on(None, 2)
+            await client.async_switch_on(None, 2)
+            await client.async_post_usrcfg_cgi("SYS=1")
+            await client.async_switch_on(None, 2)
+    assert len(_calls(m, "GET")) == 3
+
+
+async def test_client_relay_model_forgets_invalid_relay_values(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    lines = get_state_csv.splitlines()
+    values = lines[5].split(",")
+    values[17] = "nan"  # relay 1
+    lines[5] = ",".join(values)
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, body="\n".join(lines), status=200, repeat=True)
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with ProconipClient(config, relay_state_max_age=60) as client:
+            await client.async_get_state()
+            await client.async_switch_on(None, 2)
+            await client.async_get_state()
+            with pytest.raises(ValueError):
+                await client.async_switch_on(None, 3)
+    assert len(_calls(m, "GET")) == 3
+    assert len(_calls(m, "POST")) == 1
+
+
+async def test_client_relay_writes_rebase_on_previous_write(
+    config: ConfigObject, get_state_data: GetStateData
+) -> None:
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with ProconipClient(config, relay_state_max_age=60) as client:
+            await client.async_switch_on(get_state_data, 2)
+            await client.async_switch_on(get_state_data, 3)
+    manual, on = get_state_data.determine_overall_relay_bit_state()
+    assert _calls(m, "POST")[-1].kwargs["data"] == f"ENA={manual | 12},{on | 12}&MANUAL=1"
+
+
+@pytest.mark.parametrize("read_after_write", [False, True])
+async def test_client_relay_writes_trust_supplied_snapshot(
+    config: ConfigObject, get_state_csv: str, get_state_data: GetStateData, read_after_write: bool
+) -> None:
+    # Without a bound on the model's age, or once the client has handed out
+    # a snapshot newer than its last write, the caller's snapshot is used.
+    max_age = 60 if read_after_write else None
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with ProconipClient(config, relay_state_max_age=max_age) as client:
+            await client.async_switch_on(get_state_data, 2)
+            if read_after_write:
+                await client.async_get_state()
+            await client.async_switch_on(get_state_data, 3)
+    manual, on = get_state_data.determine_overall_relay_bit_state()
+    assert _calls(m, "POST")[-1].kwargs["data"] == f"ENA={manual | 8},{on | 8}&MANUAL=1"
+
+
+async def test_client_merges_queued_relay_writes(
+    config: ConfigObject, get_state_data: GetStateData
+) -> None:
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            async with client._relay_lock:
+                results = asyncio.gather(
+                    client.async_switch_on(get_state_data, 2),
+                    client.async_switch_on(get_state_data, 5),
+                    client.async_switch_off(get_state_data, 3),
+                    return_exceptions=True,
+                )
+                await asyncio.sleep(0)
+            on_two, dosage, off_three = await results
+    assert on_two == off_three == "ok"
+    assert isinstance(dosage, BadRelayException)
+    (call,) = _calls(m, "POST")
+    manual, on = get_state_data.determine_overall_relay_bit_state()
+    assert call.kwargs["data"] == f"ENA={manual | 12},{(on | 4) & ~8}&MANUAL=1"
+
+
+async def test_client_failed_merged_write_reaches_every_caller(
+    config: ConfigObject, get_state_data: GetStateData
+) -> None:
+    with aioresponses() as m:
+        m.post(USRCFG_URL, status=500)
+        async with ProconipClient(config) as client:
+            async with client._relay_lock:
+                results = asyncio.gather(
+                    client.async_switch_on(get_state_data, 2),
+                    client.async_switch_off(get_state_data, 3),
+                    return_exceptions=True,
+                )
+                await asyncio.sleep(0)
+            errors = await results
+    assert all(isinstance(error, ProconipApiException) for error in errors)
+    assert len(_calls(m, "POST")) == 1
+
+
+async def test_client_cancelled_queued_relay_write_is_dropped(
+    config: ConfigObject, get_state_data: GetStateData
+) -> None:
+    with aioresponses() as m:
+        m.post(USRCFG_URL, body="ok", status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            async with client._relay_lock:
+                task = asyncio.ensure_future(client.async_switch_on(get_state_data, 2))
+                await asyncio.sleep(0)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+            await client.async_switch_off(get_state_data, 3)
+    (call,) = _calls(m, "POST")
+    manual, on = get_state_data.determine_overall_relay_bit_state()
+    assert call.kwargs["data"] == f"ENA={manual | 8},{on & ~8}&MANUAL=1"
+
+
+# ---------------------------------------------------------------------------
+# Snapshot cache
+# ---------------------------------------------------------------------------
+
+
+async def test_client_cache_serves_fresh_snapshot(config: ConfigObject, get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with ProconipClient(config, cache_max_age=60) as client:
+            first = await client.async_get_state()
+            second = await client.async_get_state()
+    assert second is first
+    assert len(_calls(m, "GET")) == 1
+
+
+async def test_client_cache_is_off_by_default(config: ConfigObject, get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            await client.async_get_state()
+            await client.async_get_state()
+    assert len(_calls(m, "GET")) == 2
+
+
+async def test_client_cache_stale_while_revalidate(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with ProconipClient(config, cache_max_age=60) as client:
+            first = await client.async_get_state()
+            client._state_cache.fetched_at -= 120
+            stale = await client.async_get_state()
+            assert stale is first
+            await asyncio.sleep(0.01)
+            refreshed = await client.async_get_state()
+    assert refreshed is not first
+    assert len(_calls(m, "GET")) == 2
+
+
+async def test_client_cache_waits_when_too_stale(config: ConfigObject, get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with ProconipClient(config, cache_max_age=60, cache_max_stale=30) as client:
+            first = await client.async_get_state()
+            client._state_cache.fetched_at -= 120
+            second = await client.async_get_state()
+    assert second is not first
+
+
+async def test_client_cache_background_error_keeps_stale_snapshot(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, status=500)
+        async with ProconipClient(config, cache_max_age=60) as client:
+            first = await client.async_get_state()
+            client._state_cache.fetched_at -= 120
+            assert await client.async_get_state() is first
+            await asyncio.sleep(0.01)
+            assert await client.async_get_state() is first
+
+
+async def test_client_write_invalidates_state_cache(
+    config: ConfigObject, get_state_csv: str, get_state_data: GetStateData
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        m.post(USRCFG_URL, body="ok", status=200)
+        async with ProconipClient(config, cache_max_age=60) as client:
+            first = await client.async_get_state()
+            await client.async_switch_off(get_state_data, 2)
+            second = await client.async_get_state()
+    assert second is not first
+    assert len(_calls(m, "GET")) == 2
+
+
+async def test_client_cached_dmx_is_copied_and_updated_by_writes(
+    config: ConfigObject, get_dmx_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_DMX_URL, body=get_dmx_csv, status=200, repeat=True)
+        m.post(USRCFG_URL, body="ok", status=200)
+        async with ProconipClient(config, cache_max_age=60) as client:
+            dmx = await client.async_get_dmx()
+            dmx.set(0, 99)
+            assert (await client.async_get_dmx()).get_value(0) == 0
+            await client.async_set_dmx(dmx)
+            dmx.set(0, 1)
+            assert (await client.async_get_dmx()).get_value(0) == 99
+    assert len(_calls(m, "GET")) == 1
+
+
+# ---------------------------------------------------------------------------
+# watch
+# ---------------------------------------------------------------------------
+
+
+async def test_watch_shares_one_poll_loop(config: ConfigObject, get_state_csv: str) -> None:
+    changed = get_state_csv.replace("529,", "530,", 1)
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, body=changed, status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            first = client.watch(interval=0.01)
+            second = client.watch(interval=0.01)
+            a = await anext(first)
+            b = await anext(second)
+            assert a is b
+            assert client._poll_task is not None
+            await first.aclose()
+            assert client._poll_task is not None
+            await second.aclose()
+            assert client._poll_task is None
+    assert str(a) == get_state_csv
+
+
+async def test_watch_skips_unchanged_snapshots(config: ConfigObject, get_state_csv: str) -> None:
+    changed = get_state_csv.replace("529,", "530,", 1)
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, body=changed, status=200, repeat=True)
+        async with ProconipClient(config, reuse_unchanged=True) as client:
+            stream = client.watch(interval=0.01)
+            first = await anext(stream)
+            second = await anext(stream)
+            await stream.aclose()
+    assert str(first) == get_state_csv
+    assert str(second) == changed
+
+
+async def test_watch_slow_subscriber_drops_oldest(config: ConfigObject, get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            stream = client.watch(interval=0.001, queue_size=2)
+            await anext(stream)
+            await asyncio.sleep(0.05)
+            (subscription,) = client._subscriptions
+            assert subscription.queue.qsize() == 2
+            await stream.aclose()
+    assert len(_calls(m, "GET")) > 3
+
+
+def test_subscription_offer_evicts_oldest() -> None:
+    subscription = _Subscription(interval=1, queue_size=2, raise_errors=False)
+    for item in ("a", "b", "c"):
+        subscription.offer(item)
+    subscription.offer(ValueError("skipped without raise_errors"))
+    assert [subscription.queue.get_nowait() for _ in range(2)] == ["b", "c"]
+
+
+async def test_watch_errors_are_skipped_or_raised(config: ConfigObject, get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, status=500)
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            stream = client.watch(interval=0.01)
+            assert isinstance(await anext(stream), GetStateData)
+            await stream.aclose()
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, status=500)
+        async with ProconipClient(config) as client:
+            stream = client.watch(interval=0.01, raise_errors=True)
+            with pytest.raises(ProconipApiException):
+                await anext(stream)
+
+
+async def test_watch_ends_when_client_closes(config: ConfigObject, get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            received = []
+
+            async def consume() -> None:
+                async for state in client.watch(interval=0.01):
+                    received.append(state)
+
+            consumer = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.02)
+        await asyncio.wait_for(consumer, 1)
+    assert received
+    assert client._poll_task is None
+
+
+async def test_close_waits_for_in_flight_poll(config: ConfigObject, get_state_csv: str) -> None:
+    started = asyncio.Event()
+
+    async def respond(url: URL, **kwargs: object) -> CallbackResult:
+        started.set()
+        await asyncio.sleep(10)
+        return CallbackResult(status=200, body=get_state_csv)
+
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, callback=respond)
+        async with ProconipClient(config) as client:
+            stream = client.watch(interval=60)
+            consumer = asyncio.ensure_future(anext(stream, None))
+            await asyncio.wait_for(started.wait(), 1)
+            poll_task = client._poll_task
+            read_task = client._state_flight._task
+            assert poll_task is not None and read_task is not None
+        assert poll_task.done()
+        assert read_task.cancelled()
+        assert await asyncio.wait_for(consumer, 1) is None
+
+
+@pytest.mark.parametrize(("interval", "queue_size"), [(0, 1), (-1, 1), (1, 0)])
+async def test_watch_rejects_bad_arguments(
+    config: ConfigObject, interval: float, queue_size: int
+) -> None:
+    client = ProconipClient(config)
+    with pytest.raises(ValueError):
+        await anext(client.watch(interval=interval, queue_size=queue_size))
+
+
+# ---------------------------------------------------------------------------
+# subscribe
+# ---------------------------------------------------------------------------
+
+
+def _with_raw_value(csv: str, column: int, raw: float) -> str:
+    """Return ``csv`` with the raw value of ``column`` replaced."""
+    lines = csv.splitlines()
+    values = lines[5].split(",")
+    values[column] = str(raw)
+    lines[5] = ",".join(values)
+    return "\n".join(lines) + "\n"
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    async with asyncio.timeout(1):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+async def test_subscribe_reports_changes_beyond_deadband(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    # pH is column 7 with a gain of 0.0078125 per raw step.
+    calls: list[tuple[float, tuple[int, ...]]] = []
+    with aioresponses() as m:
+        for raw in (932, 935, 938, 939):
+            m.get(GET_STATE_URL, body=_with_raw_value(get_state_csv, 7, raw), status=200)
+        m.get(GET_STATE_URL, body=_with_raw_value(get_state_csv, 7, 939), status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            unsubscribe = client.subscribe(
+                lambda state, columns: calls.append((state.ph_electrode.value, columns)),
+                columns=(7, 6),
+                absolute_deadband=0.05,
+                interval=0.001,
+            )
+            await _wait_for(lambda: len(calls) == 2)
+            await asyncio.sleep(0.01)
+            unsubscribe()
+            assert client._poll_task is None
+    assert calls == [(932 * 0.0078125, (7, 6)), (939 * 0.0078125, (7,))]
+
+
+async def test_subscribe_relative_deadband_and_categories(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    calls: list[tuple[int, ...]] = []
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, body=_with_raw_value(get_state_csv, 37, 620), status=200)
+        m.get(GET_STATE_URL, body=_with_raw_value(get_state_csv, 16, 3), status=200, repeat=True)
+        async with ProconipClient(config) as client:
+            unsubscribe = client.subscribe(
+                lambda state, columns: calls.append(columns),
+                columns=(37,),
+                categories=(CATEGORY_RELAY,),
+                relative_deadband=0.01,
+                interval=0.001,
+            )
+            await _wait_for(lambda: len(calls) == 2)
+            unsubscribe()
+    assert calls == [(37, *range(16, 24)), (16,)]
+
+
+async def test_subscribe_reports_columns_turning_and_leaving_nan(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    reported: list[float] = []
+    with aioresponses() as m:
+        for raw in (math.nan, math.nan, 932):
+            m.get(GET_STATE_URL, body=_with_raw_value(get_state_csv, 7, raw), status=200)
+        m.get(
+            GET_STATE_URL, body=_with_raw_value(get_state_csv, 7, math.nan), status=200, repeat=True
+        )
+        async with ProconipClient(config) as client:
+            unsubscribe = client.subscribe(
+                lambda state, columns: reported.append(state.ph_electrode.value),
+                columns=(7,),
+                interval=0.001,
+            )
+            await _wait_for(lambda: len(reported) == 3)
+            await asyncio.sleep(0.01)
+            unsubscribe()
+    assert len(reported) == 3
+    assert math.isnan(reported[0])
+    assert reported[1] == 932 * 0.0078125
+    assert math.isnan(reported[2])
+
+
+async def test_subscribe_callback_may_unsubscribe_itself(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    one_shot: list[GetStateData] = []
+    steady: list[GetStateData] = []
+    with aioresponses() as m:
+        for raw in (932, 940, 948):
+            m.get(GET_STATE_URL, body=_with_raw_value(get_state_csv, 7, raw), status=200)
+        m.get(GET_STATE_URL, body=_with_raw_value(get_state_csv, 7, 948), status=200, repeat=True)
+        async with ProconipClient(config) as client:
+
+            def once(state: GetStateData, columns: tuple[int, ...]) -> None:
+                one_shot.append(state)
+                unsubscribe_once()
+
+            unsubscribe_once = client.subscribe(once, columns=(7,), interval=0.001)
+            unsubscribe = client.subscribe(
+                lambda state, columns: steady.append(state), columns=(7,), interval=0.001
+            )
+            await _wait_for(lambda: len(steady) == 3)
+            unsubscribe()
+    assert len(one_shot) == 1
+
+
+async def test_subscribe_callback_errors_go_to_loop_handler(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    errors: list[BaseException] = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda _, context: errors.append(context["exception"]))
+    try:
+        with aioresponses() as m:
+            m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+            async with ProconipClient(config) as client:
+                unsubscribe = client.subscribe(lambda *_: 1 / 0, columns=(7,), interval=0.001)
+                bad = client.subscribe(lambda *_: None, columns=(999,), interval=0.001)
+                await _wait_for(lambda: len(errors) >= 2)
+                assert client._poll_task is not None
+                unsubscribe()
+                bad()
+    finally:
+        loop.set_exception_handler(None)
+    assert {type(error) for error in errors} == {ZeroDivisionError, IndexError}
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"columns": (7,), "absolute_deadband": -1},
+        {"columns": (7,), "relative_deadband": -0.1},
+        {"columns": (7,), "interval": 0},
+    ],
+)
+async def test_subscribe_rejects_bad_arguments(config: ConfigObject, kwargs: dict) -> None:
+    client = ProconipClient(config)
+    with pytest.raises(ValueError):
+        client.subscribe(lambda *_: None, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Adaptive polling
+# ---------------------------------------------------------------------------
+
+
+def test_adaptive_interval_backs_off_and_resets() -> None:
+    schedule = AdaptiveInterval(min_interval=1, max_interval=5)
+    assert [schedule.next(False) for _ in range(4)] == [2, 4, 5, 5]
+    assert schedule.next(True) == 1
+    schedule.next(False)
+    schedule.reset()
+    assert schedule.current == 1
+
+
+@pytest.mark.parametrize(("low", "high", "backoff"), [(0, 1, 2), (2, 1, 2), (1, 2, 0.5)])
+def test_adaptive_interval_rejects_bad_bounds(low: float, high: float, backoff: float) -> None:
+    with pytest.raises(ValueError):
+        AdaptiveInterval(low, high, backoff)
+
+
+async def test_watch_adaptive_interval_follows_changes(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    seen: list[bool] = []
+
+    class RecordingInterval(AdaptiveInterval):
+        def next(self, changed: bool) -> float:
+            seen.append(changed)
+            return super().next(changed)
+
+    schedule = RecordingInterval(min_interval=0.001, max_interval=0.008)
+    with aioresponses() as m:
+        for _ in range(5):
+            m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        m.get(GET_STATE_URL, body=_with_raw_value(get_state_csv, 7, 940), status=200, repeat=True)
+        async with ProconipClient(config, adaptive_interval=schedule) as client:
+            stream = client.watch()
+            async for state in stream:
+                if state.ph_electrode.value != 932 * 0.0078125:
+                    break
+            await stream.aclose()
+    # First poll counts as a change, four identical ones back off, then the pH moves.
+    assert seen[:6] == [True, False, False, False, False, True]
+
+
+async def test_write_wakes_the_poll_loop(
+    config: ConfigObject, get_state_csv: str, get_state_data: GetStateData
+) -> None:
+    schedule = AdaptiveInterval(min_interval=0.001, max_interval=60)
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, body=get_state_csv, status=200, repeat=True)
+        m.post(USRCFG_URL, body="ok", status=200)
+        async with ProconipClient(config, adaptive_interval=schedule) as client:
+            stream = client.watch(interval=60)
+            await anext(stream)
+            schedule._current = 60
+            await client.async_switch_off(get_state_data, 2)
+            assert schedule.current == 0.001
+            await anext(stream)
+            await stream.aclose()
+    assert len(_calls(m, "GET")) >= 2
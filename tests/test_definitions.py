@@ -13,7 +13,10 @@ from proconip.definitions import (
     CATEGORY_EXTERNAL_RELAY,
     CATEGORY_RELAY,
     CATEGORY_TEMPERATURE,
+    CATEGORY_TIME,
+    DEFAULT_COLUMN_LAYOUT,
     BadRelayException,
+    ColumnLayout,
     ConfigObject,
     DataObject,
     DigitalInput,
@@ -67,6 +70,82 @@ def test_config_from_dict_missing_key(missing_key: str) -> None:
         ConfigObject.from_dict(data)
 
 
+# ---------------------------------------------------------------------------
+# ColumnLayout
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    ("column", "category", "category_id"),
+    [
+        (0, CATEGORY_TIME, 0),
+        (5, CATEGORY_ANALOG, 4),
+        (7, CATEGORY_ELECTRODE, 1),
+        (8, CATEGORY_TEMPERATURE, 0),
+        (23, CATEGORY_RELAY, 7),
+        (24, CATEGORY_DIGITAL_INPUT, 0),
+        (35, CATEGORY_EXTERNAL_RELAY, 7),
+        (36, CATEGORY_CANISTER, 0),
+        (41, CATEGORY_CONSUMPTION, 2),
+        (42, "", -1),
+        (-1, "", -1),
+    ],
+)
+def test_default_column_layout(column: int, category: str, category_id: int) -> None:
+    spec = DEFAULT_COLUMN_LAYOUT.spec(column)
+    assert spec.category == category
+    assert spec.category_id == category_id
+
+
+def test_default_column_layout_size() -> None:
+    assert len(DEFAULT_COLUMN_LAYOUT) == 42
+    assert DEFAULT_COLUMN_LAYOUT.categories[0] == CATEGORY_TIME
+
+
+def test_column_layout_columns() -> None:
+    assert DEFAULT_COLUMN_LAYOUT.columns(CATEGORY_RELAY) == range(16, 24)
+    assert DEFAULT_COLUMN_LAYOUT.columns("no_such_category") == ()
+    split = ColumnLayout([(CATEGORY_RELAY, 1), (CATEGORY_ANALOG, 1), (CATEGORY_RELAY, 1)])
+    assert split.columns(CATEGORY_RELAY) == (0, 2)
+    assert split.spec(2).category_id == 1
+
+
+@pytest.mark.parametrize("count", [0, -1])
+def test_column_layout_rejects_empty_blocks(count: int) -> None:
+    with pytest.raises(ValueError):
+        ColumnLayout([(CATEGORY_TIME, 1), (CATEGORY_ANALOG, count)])
+
+
+def test_values_by_category_non_contiguous_layout() -> None:
+    layout = ColumnLayout([(CATEGORY_TIME, 1), (CATEGORY_ANALOG, 1), (CATEGORY_TIME, 1)])
+    payload = "SYSINFO,1.7.3,0,0,0,0,0,0,0,0\na,b,c\nh,V,h\n0,0,0\n1,2,1\n3,4,5\n"
+    data = GetStateData(payload, layout=layout)
+    assert list(data.values_by_category(CATEGORY_TIME)) == [3, 5]
+    assert list(data.values_by_category(CATEGORY_ANALOG)) == [8]
+
+
+def test_custom_column_layout() -> None:
+    """A firmware variant with a different column arrangement parses via its own layout."""
+    layout = ColumnLayout(
+        [(CATEGORY_TIME, 1), (CATEGORY_RELAY, 2), (CATEGORY_TEMPERATURE, 1)],
+        formatters={CATEGORY_TEMPERATURE: lambda value, unit: f"{value:.1f}{unit}"},
+    )
+    payload = (
+        "SYSINFO,1.7.3,0,0,0,0,0,0,0,0\n"
+        "Time,Pump,Light,Pool\n"
+        "h,--,--,C\n"
+        "0,0,0,0\n"
+        "1,1,1,0.5\n"
+        "529,3,0,50\n"
+    )
+    data = GetStateData(payload, layout=layout)
+    assert [relay.name for relay in data.relays()] == ["Pump", "Light"]
+    assert data.get_relay(0).is_on()
+    assert data.get_relay(1).display_value == "Auto (off)"
+    assert data.temperature_objects[0].display_value == "25.0C"
+    assert data.analog_objects == []
+
+
 # ---------------------------------------------------------------------------
 # GetStateData — system info
 # ---------------------------------------------------------------------------
@@ -148,6 +227,53 @@ def test_get_state_dosage_control(get_state_data: GetStateData) -> None:
     assert not get_state_data.is_ph_plus_dosage_enabled()
 
 
+def test_get_state_reuses_parsed_header(get_state_csv: str) -> None:
+    """Snapshots with an identical header block share the parsed header."""
+    first = GetStateData(get_state_csv)
+    lines = get_state_csv.splitlines()
+    lines[5] = lines[5].replace("529,", "530,", 1)
+    second = GetStateData("\n".join(lines))
+    assert second._header is first._header
+    assert first.get_relay(0).name == second.get_relay(0).name == "Terassenlicht"
+
+
+def test_get_state_header_change_is_picked_up(get_state_csv: str) -> None:
+    first = GetStateData(get_state_csv)
+    renamed = get_state_csv.replace("Terassenlicht", "Terrace", 1)
+    second = GetStateData(renamed)
+    assert second._header is not first._header
+    assert second.get_relay(0).name == "Terrace"
+    assert first.get_relay(0).name == "Terassenlicht"
+
+
+def test_get_state_from_bytes_matches_text(get_state_csv: str) -> None:
+    text = GetStateData(get_state_csv)
+    raw = GetStateData.from_bytes(get_state_csv.encode())
+    assert raw.version == text.version
+    assert raw.time == text.time
+    assert list(raw.values_by_category("temperature")) == list(
+        text.values_by_category("temperature")
+    )
+    assert raw.get_relay(0).name == text.get_relay(0).name
+    assert raw.relay_on_mask == text.relay_on_mask
+    assert str(raw) == get_state_csv
+
+
+def test_get_state_from_bytes_shares_header_cache(get_state_csv: str) -> None:
+    first = GetStateData.from_bytes(get_state_csv.encode())
+    second = GetStateData.from_bytes(get_state_csv.encode())
+    assert second._header is first._header
+
+
+def test_get_state_matches_payload(get_state_csv: str) -> None:
+    changed = get_state_csv.replace("529,", "530,", 1)
+    for state in (GetStateData(get_state_csv), GetStateData.from_bytes(get_state_csv.encode())):
+        assert state.matches_payload(get_state_csv)
+        assert state.matches_payload(get_state_csv.encode())
+        assert not state.matches_payload(changed)
+        assert not state.matches_payload(changed.encode())
+
+
 # ---------------------------------------------------------------------------
 # GetStateData — category lists
 # ---------------------------------------------------------------------------
@@ -239,6 +365,88 @@ def test_consumption_objects(get_state_data: GetStateData) -> None:
 
 def test_aggregated_relay_objects(get_state_data: GetStateData) -> None:
     assert len(get_state_data.aggregated_relay_objects) == 16
+    assert get_state_data.chlorine_dosage_relay is get_state_data.aggregated_relay_objects[5]
+
+
+def test_aggregated_relay_objects_cannot_be_mutated(get_state_data: GetStateData) -> None:
+    chlorine_relay = get_state_data.chlorine_dosage_relay
+    get_state_data.aggregated_relay_objects.reverse()
+    get_state_data.aggregated_relay_objects.clear()
+    assert get_state_data.chlorine_dosage_relay is chlorine_relay
+    assert chlorine_relay.column == 21
+    assert len(get_state_data.aggregated_relay_objects) == 16
+
+
+def test_category_objects_are_cached(get_state_data: GetStateData) -> None:
+    assert get_state_data.temperature_objects is get_state_data.temperature_objects
+    assert get_state_data.ph_electrode is get_state_data.electrode_objects[1]
+
+
+def test_values_by_category(get_state_data: GetStateData) -> None:
+    values = get_state_data.values_by_category(CATEGORY_ELECTRODE)
+    assert list(values) == pytest.approx([obj.value for obj in get_state_data.electrode_objects])
+    assert len(get_state_data.values_by_category(CATEGORY_TEMPERATURE)) == 8
+
+
+def test_raw_values_by_category(get_state_data: GetStateData) -> None:
+    raw = get_state_data.raw_values_by_category(CATEGORY_RELAY)
+    assert list(raw) == [2, 0, 0, 2, 2, 2, 2, 2]
+
+
+def test_values_at(get_state_data: GetStateData) -> None:
+    assert list(get_state_data.values_at((7, 6))) == [
+        get_state_data.ph_electrode.value,
+        get_state_data.redox_electrode.value,
+    ]
+    with pytest.raises(IndexError):
+        get_state_data.values_at((999,))
+
+
+def test_same_readings_ignores_clock(get_state_csv: str) -> None:
+    lines = get_state_csv.splitlines()
+    base = GetStateData(get_state_csv)
+    lines[5] = lines[5].replace("529,", "530,", 1)
+    assert base.same_readings(GetStateData("\n".join(lines)))
+    lines[5] = lines[5].replace(",932,", ",933,", 1)
+    assert not base.same_readings(GetStateData("\n".join(lines)))
+
+
+def test_same_readings_custom_layout() -> None:
+    layout = ColumnLayout([(CATEGORY_RELAY, 2), (CATEGORY_TIME, 1)])
+    header = "SYSINFO,1.7.3,0,0,0,0,0,0,0,0\nPump,Light,Time\n--,--,h\n0,0,0\n1,1,1\n"
+    base = GetStateData(header + "3,0,529\n", layout=layout)
+    assert base.same_readings(GetStateData(header + "3,0,530\n", layout=layout))
+    assert not base.same_readings(GetStateData(header + "2,0,529\n", layout=layout))
+    shorter = "SYSINFO,1.7.3,0,0,0,0,0,0,0,0\nPump,Time\n--,h\n0,0\n1,1\n3,529\n"
+    assert not base.same_readings(GetStateData(shorter, layout=layout))
+
+
+def test_category_columns(get_state_data: GetStateData) -> None:
+    assert list(get_state_data.category_columns(CATEGORY_RELAY)) == list(range(16, 24))
+    assert list(get_state_data.category_columns("unknown")) == []
+
+
+def test_values_by_unknown_category_is_empty(get_state_data: GetStateData) -> None:
+    assert len(get_state_data.values_by_category("no_such_category")) == 0
+
+
+def test_data_objects_are_built_lazily(get_state_csv: str) -> None:
+    """A malformed relay value must not break access to unrelated columns.
+
+    Columns are only materialized, and display strings only formatted, on
+    first access, so the bad value in column 16 surfaces when the relay's
+    display_value is read, not at construction time.
+    """
+    lines = get_state_csv.splitlines()
+    values = lines[5].split(",")
+    values[16] = "7"
+    lines[5] = ",".join(values)
+    data = GetStateData("\n".join(lines))
+    assert data.ph_electrode.value == pytest.approx(932 * 0.0078125)
+    relay = data.relay_objects[0]
+    assert relay.value == 7
+    with pytest.raises(ValueError, match="Unexpected relay value"):
+        _ = relay.display_value
 
 
 # ---------------------------------------------------------------------------
@@ -279,6 +487,22 @@ def test_is_dosage_relay_by_relay_id(get_state_data: GetStateData) -> None:
     assert not get_state_data.is_dosage_relay(relay_id=0)
 
 
+def test_dosage_relay_mask(get_state_data: GetStateData) -> None:
+    # pH+ and pH- share relay 4, chlorine is relay 5.
+    assert get_state_data.dosage_relay_mask == (1 << 4) | (1 << 5)
+
+
+def test_is_dosage_relay_out_of_range_ids(get_state_data: GetStateData) -> None:
+    assert not get_state_data.is_dosage_relay(relay_id=-1)
+    assert not get_state_data.is_dosage_relay(relay_id=64)
+
+
+def test_is_dosage_relay_by_data_object(get_state_data: GetStateData) -> None:
+    aggregated = get_state_data.aggregated_relay_objects
+    assert get_state_data.is_dosage_relay(data_object=aggregated[5])
+    assert not get_state_data.is_dosage_relay(data_object=aggregated[8])
+
+
 def test_is_dosage_relay_bad_data_object_category(get_state_data: GetStateData) -> None:
     with pytest.raises(BadRelayException, match="not a relay category"):
         get_state_data.is_dosage_relay(data_object=get_state_data.analog_objects[0])
@@ -288,6 +512,57 @@ def test_is_dosage_relay_no_args(get_state_data: GetStateData) -> None:
     assert not get_state_data.is_dosage_relay()
 
 
+def test_relay_bitmaps(get_state_data: GetStateData) -> None:
+    # Internal relay raw values: 2,0,0,2,2,2,2,2 → manual for 0, 3–7, none on.
+    assert get_state_data.relay_manual_mask == 0b11111001
+    assert get_state_data.relay_on_mask == 0
+    assert get_state_data.determine_overall_relay_bit_state() == [0b11111001, 0]
+
+
+def test_determine_overall_relay_bit_state_with_extension(get_state_csv: str) -> None:
+    lines = get_state_csv.splitlines()
+    sysinfo = lines[0].split(",")
+    sysinfo[5] = "16"  # relay extension enabled
+    lines[0] = ",".join(sysinfo)
+    values = lines[5].split(",")
+    values[16:24] = ["3", "1", "0", "2", "3", "0", "1", "2"]
+    values[28:36] = ["0", "3", "1", "2", "0", "0", "0", "3"]
+    lines[5] = ",".join(values)
+    data = GetStateData("\n".join(lines))
+
+    expected = [65535, 0]
+    for relay in data.get_relays():
+        if relay.is_auto_mode():
+            expected[0] &= ~relay.get_bit_mask()
+        if relay.is_on():
+            expected[1] |= relay.get_bit_mask()
+    assert data.determine_overall_relay_bit_state() == expected
+    assert data.relay_on_mask == expected[1]
+
+
+def _with_relay_value(get_state_csv: str, column: int, value: str) -> GetStateData:
+    lines = get_state_csv.splitlines()
+    values = lines[5].split(",")
+    values[column] = value
+    lines[5] = ",".join(values)
+    return GetStateData("\n".join(lines))
+
+
+@pytest.mark.parametrize("bad_value", ["nan", "inf", "7", "1.5", "-1"])
+def test_invalid_relay_value_is_never_encoded(get_state_csv: str, bad_value: str) -> None:
+    data = _with_relay_value(get_state_csv, 17, bad_value)  # relay 1
+    assert data.relay_manual_mask & 0b10 == 0
+    assert data.relay_on_mask & 0b10 == 0
+    with pytest.raises(ValueError, match="relay 1"):
+        data.determine_overall_relay_bit_state()
+
+
+def test_invalid_external_relay_value_ignored_without_extension(get_state_csv: str) -> None:
+    data = _with_relay_value(get_state_csv, 28, "nan")  # external relay 8
+    assert not data.is_relay_extension_enabled()
+    assert data.determine_overall_relay_bit_state() == [0b11111001, 0]
+
+
 # ---------------------------------------------------------------------------
 # Relay
 # ---------------------------------------------------------------------------
@@ -314,6 +589,23 @@ def test_relay_value_not_double_applied() -> None:
     assert relay.is_manual_mode()
 
 
+def test_relay_view_shares_parsed_fields(get_state_data: GetStateData) -> None:
+    obj = get_state_data.relay_objects[3]
+    relay = Relay(obj)
+    assert relay.name == obj.name
+    assert relay.column == obj.column
+    assert relay.category == obj.category
+    assert relay.value == obj.value
+    assert relay.display_value == obj.display_value
+
+
+def test_get_relay_is_cached_per_snapshot(get_state_data: GetStateData) -> None:
+    assert get_state_data.get_relay(3) is get_state_data.get_relay(3)
+    assert get_state_data.get_relay(9) is get_state_data.external_relays()[1]
+    assert get_state_data.relays()[0] is get_state_data.get_relay(0)
+    assert get_state_data.digital_inputs()[2] is get_state_data.digital_inputs()[2]
+
+
 def test_relay_relay_id_internal(get_state_data: GetStateData) -> None:
     relay = get_state_data.get_relay(0)
     assert relay.relay_id == 0
@@ -338,6 +630,21 @@ def test_relay_str(get_state_data: GetStateData) -> None:
     assert "Terassenlicht" in str(relay)
 
 
+def test_display_value_is_cached() -> None:
+    obj = DataObject(column=8, name="Pool", unit="C", offset=0.0, gain=0.5, value=50.0)
+    assert obj.display_value == "25.00 °C"
+    assert obj.display_value is obj.display_value
+
+
+@pytest.mark.parametrize("cls", [DataObject, Relay, DigitalInput])
+def test_data_object_classes_are_slotted(get_state_data: GetStateData, cls: type) -> None:
+    obj = get_state_data.relay_objects[0]
+    instance = obj if cls is DataObject else cls(obj)
+    assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        instance.extra = 1  # type: ignore[attr-defined]
+
+
 # ---------------------------------------------------------------------------
 # DigitalInput
 # ---------------------------------------------------------------------------
@@ -390,6 +697,13 @@ def test_dmx_channel_str() -> None:
     assert str(ch) == "42"
 
 
+def test_dmx_channel_is_slotted() -> None:
+    ch = DmxChannelData(0, 42)
+    assert not hasattr(ch, "__dict__")
+    ch.value = 7
+    assert ch.value == 7
+
+
 # ---------------------------------------------------------------------------
 # GetDmxData
 # ---------------------------------------------------------------------------
@@ -464,6 +778,19 @@ def test_get_dmx_leading_blank_lines(get_dmx_csv: str) -> None:
     assert data.get_value(15) == 150
 
 
+def test_get_dmx_from_bytes(get_dmx_csv: str) -> None:
+    data = GetDmxData.from_bytes(b"\n" + get_dmx_csv.encode())
+    assert [ch.value for ch in data] == [ch.value for ch in GetDmxData(get_dmx_csv)]
+    assert str(data) == "\n" + get_dmx_csv
+
+
+def test_get_dmx_from_bytes_invalid_payload() -> None:
+    with pytest.raises(InvalidPayloadException):
+        GetDmxData.from_bytes(b"  \n")
+    with pytest.raises(InvalidPayloadException):
+        GetDmxData.from_bytes(b"1,2,3")
+
+
 # ---------------------------------------------------------------------------
 # Payload validation
 # ---------------------------------------------------------------------------
@@ -0,0 +1,134 @@
+"""Tests for the multi-controller `ControllerFleet`."""
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aioresponses import CallbackResult, aioresponses
+from yarl import URL
+
+from proconip.api import BadStatusCodeException, CircuitOpenException
+from proconip.definitions import ConfigObject, GetStateData
+from proconip.fleet import ControllerFleet
+
+
+def _configs(count: int) -> dict[str, ConfigObject]:
+    return {
+        f"pool-{index}": ConfigObject(f"http://10.0.0.{index}", "admin", "admin")
+        for index in range(count)
+    }
+
+
+def _state_url(index: int) -> str:
+    return f"http://10.0.0.{index}/GetState.csv"
+
+
+async def test_fleet_poll_yields_every_controller(get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(_state_url(0), body=get_state_csv, status=200)
+        m.get(_state_url(1), status=500)
+        m.get(_state_url(2), body=get_state_csv, status=200)
+        async with ControllerFleet(_configs(3)) as fleet:
+            results = {controller_id: result async for controller_id, result in fleet.poll()}
+    assert results.keys() == {"pool-0", "pool-1", "pool-2"}
+    assert isinstance(results["pool-0"], GetStateData)
+    assert isinstance(results["pool-1"], BadStatusCodeException)
+    assert isinstance(results["pool-2"], GetStateData)
+
+
+async def test_fleet_caps_concurrency(get_state_csv: str) -> None:
+    active = peak = 0
+
+    async def respond(url: URL, **kwargs: object) -> CallbackResult:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return CallbackResult(status=200, body=get_state_csv)
+
+    with aioresponses() as m:
+        for index in range(10):
+            m.get(_state_url(index), callback=respond)
+        async with ControllerFleet(_configs(10), max_concurrency=3) as fleet:
+            results = [result async for result in fleet.poll()]
+    assert len(results) == 10
+    assert peak == 3
+
+
+async def test_fleet_staggers_start_times(get_state_csv: str) -> None:
+    started: list[float] = []
+
+    def respond(url: URL, **kwargs: object) -> CallbackResult:
+        started.append(time.monotonic())
+        return CallbackResult(status=200, body=get_state_csv)
+
+    with aioresponses() as m:
+        for index in range(5):
+            m.get(_state_url(index), callback=respond)
+        async with ControllerFleet(_configs(5)) as fleet:
+            async for _ in fleet.poll(stagger=0.1):
+                pass
+    assert max(started) - min(started) >= 0.07
+
+
+async def test_fleet_watch_polls_repeatedly(get_state_csv: str) -> None:
+    with aioresponses() as m:
+        for index in range(2):
+            m.get(_state_url(index), body=get_state_csv, status=200, repeat=True)
+        async with ControllerFleet(_configs(2)) as fleet:
+            seen: list[str] = []
+            async for controller_id, result in fleet.watch(interval=0.01, stagger=0):
+                assert isinstance(result, GetStateData)
+                seen.append(controller_id)
+                if len(seen) == 6:
+                    break
+    assert seen.count("pool-0") >= 2
+    assert seen.count("pool-1") >= 2
+
+
+async def test_fleet_open_circuit_fails_fast(get_state_csv: str) -> None:
+    with aioresponses() as m:
+        m.get(_state_url(0), exception=aiohttp.ClientConnectionError("down"), repeat=True)
+        m.get(_state_url(1), body=get_state_csv, status=200, repeat=True)
+        async with ControllerFleet(_configs(2), failure_threshold=1, cooldown=60) as fleet:
+            async for _ in fleet.poll():
+                pass
+            breaker = fleet.breaker("pool-0")
+            assert breaker is not None and breaker.is_open
+            results = {controller_id: result async for controller_id, result in fleet.poll()}
+    assert isinstance(results["pool-0"], CircuitOpenException)
+    assert isinstance(results["pool-1"], GetStateData)
+    assert len(m.requests[("GET", URL(_state_url(0)))]) == 1
+
+
+async def test_fleet_keys_plain_configs_by_base_url(get_state_csv: str) -> None:
+    configs = list(_configs(2).values())
+    with aioresponses() as m:
+        for index in range(2):
+            m.get(_state_url(index), body=get_state_csv, status=200)
+        async with ControllerFleet(configs) as fleet:
+            ids = {controller_id async for controller_id, _ in fleet.poll()}
+    assert ids == {"http://10.0.0.0", "http://10.0.0.1"}
+    assert len(fleet) == 2
+    assert fleet.breaker("http://10.0.0.0") is None
+
+
+@pytest.mark.parametrize("kwargs", [{"max_concurrency": 0}, {"per_host_limit": 0}])
+def test_fleet_rejects_bad_limits(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        ControllerFleet(_configs(1), **kwargs)
+
+
+def test_fleet_rejects_duplicate_controllers() -> None:
+    config = ConfigObject("http://10.0.0.1", "admin", "admin")
+    with pytest.raises(ValueError):
+        ControllerFleet([config, config])
+
+
+async def test_fleet_requires_entering() -> None:
+    fleet = ControllerFleet(_configs(1))
+    with pytest.raises(RuntimeError):
+        async for _ in fleet.poll():
+            pass
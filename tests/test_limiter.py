@@ -0,0 +1,124 @@
+"""Tests for the per-controller `RequestLimiter`."""
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from proconip.api import DosageControl, async_get_state
+from proconip.client import ProconipClient
+from proconip.definitions import ConfigObject
+from proconip.limiter import RequestLimiter
+
+BASE_URL = "http://127.0.0.1"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"max_in_flight": 0}, {"max_rate": 0.0}, {"min_spacing": -1.0}],
+)
+def test_limiter_rejects_bad_limits(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        RequestLimiter(**kwargs)
+
+
+async def test_limiter_caps_in_flight_requests() -> None:
+    limiter = RequestLimiter(max_in_flight=2)
+    peak = 0
+
+    async def request() -> None:
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(request() for _ in range(5)))
+    assert peak == 2
+    assert limiter.granted == 5
+    assert limiter.in_flight == 0
+    assert limiter.max_wait > 0
+    assert limiter.average_wait > 0
+
+
+async def test_limiter_serves_writes_before_reads() -> None:
+    limiter = RequestLimiter()
+    order: list[str] = []
+
+    async def request(name: str, write: bool) -> None:
+        async with limiter.slot(write):
+            order.append(name)
+
+    async with limiter.slot():
+        tasks = [
+            asyncio.ensure_future(request("read-1", False)),
+            asyncio.ensure_future(request("read-2", False)),
+            asyncio.ensure_future(request("write", True)),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 3
+    await asyncio.gather(*tasks)
+    assert order == ["write", "read-1", "read-2"]
+
+
+async def test_limiter_drops_cancelled_waiters() -> None:
+    limiter = RequestLimiter()
+    async with limiter.slot():
+        task = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert limiter.queue_depth == 0
+    assert limiter.in_flight == 0
+    assert limiter.granted == 1
+
+
+async def test_limiter_min_spacing() -> None:
+    limiter = RequestLimiter(max_in_flight=4, min_spacing=0.05)
+    starts: list[float] = []
+
+    async def request() -> None:
+        async with limiter.slot():
+            starts.append(time.monotonic())
+
+    await asyncio.gather(request(), request())
+    assert starts[1] - starts[0] >= 0.045
+
+
+async def test_limiter_max_rate_allows_a_burst_then_throttles() -> None:
+    limiter = RequestLimiter(max_in_flight=100, max_rate=20.0)
+    started = time.monotonic()
+    for _ in range(20):
+        async with limiter.slot():
+            pass
+    assert time.monotonic() - started < 0.04
+    async with limiter.slot():
+        pass
+    assert time.monotonic() - started >= 0.04
+
+
+async def test_free_functions_and_wrappers_use_the_limiter(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    limiter = RequestLimiter()
+    with aioresponses() as m:
+        m.get(f"{BASE_URL}/GetState.csv", body=get_state_csv, status=200)
+        m.get(f"{BASE_URL}/Command.htm?MAN_DOSAGE=0,60", body="ok", status=200)
+        async with aiohttp.ClientSession() as session:
+            await async_get_state(session, config, limiter=limiter)
+            await DosageControl(session, config, limiter=limiter).async_chlorine_dosage(60)
+    assert limiter.granted == 2
+
+
+async def test_client_uses_the_limiter(config: ConfigObject, get_state_csv: str) -> None:
+    limiter = RequestLimiter()
+    with aioresponses() as m:
+        m.get(f"{BASE_URL}/GetState.csv", body=get_state_csv, status=200)
+        m.post(f"{BASE_URL}/usrcfg.cgi", body="ok", status=200)
+        async with ProconipClient(config, limiter=limiter) as client:
+            state = await client.async_get_state()
+            await client.async_switch_on(state, 2)
+    assert limiter.granted == 2
+    assert limiter.in_flight == 0
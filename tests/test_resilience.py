@@ -0,0 +1,139 @@
+"""Tests for `RetryPolicy` and `CircuitBreaker`."""
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+from yarl import URL
+
+from proconip.api import (
+    BadStatusCodeException,
+    CircuitOpenException,
+    GetState,
+    ProconipApiException,
+    async_get_state,
+)
+from proconip.client import ProconipClient
+from proconip.definitions import ConfigObject, GetStateData
+from proconip.limiter import RequestLimiter
+from proconip.resilience import CircuitBreaker, RetryPolicy
+
+BASE_URL = "http://127.0.0.1"
+GET_STATE_URL = f"{BASE_URL}/GetState.csv"
+USRCFG_URL = f"{BASE_URL}/usrcfg.cgi"
+
+
+class _Clock:
+    """Stand-in for `time.monotonic` that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr("proconip.resilience.time.monotonic", fake)
+    return fake
+
+
+@pytest.mark.parametrize("kwargs", [{"attempts": 0}, {"base_delay": -1.0}, {"max_delay": -1.0}])
+def test_retry_policy_rejects_bad_arguments(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        RetryPolicy(**kwargs)
+
+
+def test_retry_policy_delay_is_jittered_and_capped() -> None:
+    policy = RetryPolicy(base_delay=0.5, max_delay=1.5)
+    for retry in range(6):
+        assert 0 <= policy.delay(retry) <= min(1.5, 0.5 * 2**retry)
+
+
+@pytest.mark.parametrize("kwargs", [{"failure_threshold": 0}, {"cooldown": -1.0}])
+def test_circuit_breaker_rejects_bad_arguments(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        CircuitBreaker(**kwargs)
+
+
+def test_circuit_breaker_opens_and_probes(clock: _Clock) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=30)
+    breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+    assert breaker.retry_after == 30
+    clock.now += 30
+    assert breaker.allow()  # the probe
+    assert not breaker.allow()  # everyone else keeps failing fast
+    breaker.record_failure()
+    assert breaker.is_open
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.failures == 0
+    assert breaker.retry_after == 0.0
+
+
+async def test_reads_are_retried_after_transport_failures(
+    config: ConfigObject, get_state_csv: str
+) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, exception=aiohttp.ClientConnectionError("reset"))
+        m.get(GET_STATE_URL, exception=aiohttp.ClientConnectionError("reset"))
+        m.get(GET_STATE_URL, body=get_state_csv, status=200)
+        async with aiohttp.ClientSession() as session:
+            api = GetState(session, config, retry=RetryPolicy(attempts=3, base_delay=0))
+            state = await api.async_get_state()
+    assert isinstance(state, GetStateData)
+
+
+async def test_retries_give_up_after_the_last_attempt(config: ConfigObject) -> None:
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, exception=aiohttp.ClientConnectionError("reset"), repeat=True)
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(ProconipApiException):
+                await async_get_state(session, config, retry=RetryPolicy(attempts=2, base_delay=0))
+    assert len(m.requests[("GET", URL(GET_STATE_URL))]) == 2
+
+
+async def test_http_errors_are_not_retried(config: ConfigObject) -> None:
+    breaker = CircuitBreaker(failure_threshold=1)
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, status=500, repeat=True)
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(BadStatusCodeException):
+                await async_get_state(
+                    session, config, retry=RetryPolicy(base_delay=0), breaker=breaker
+                )
+    assert len(m.requests[("GET", URL(GET_STATE_URL))]) == 1
+    assert not breaker.is_open
+
+
+async def test_client_never_retries_writes(
+    config: ConfigObject, get_state_data: GetStateData
+) -> None:
+    with aioresponses() as m:
+        m.post(USRCFG_URL, exception=aiohttp.ClientConnectionError("reset"), repeat=True)
+        async with ProconipClient(config, retry=RetryPolicy(base_delay=0)) as client:
+            with pytest.raises(ProconipApiException):
+                await client.async_switch_on(get_state_data, 2)
+    assert len(m.requests[("POST", URL(USRCFG_URL))]) == 1
+
+
+async def test_open_circuit_fails_fast_without_a_limiter_slot(config: ConfigObject) -> None:
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+    limiter = RequestLimiter()
+    with aioresponses() as m:
+        m.get(GET_STATE_URL, exception=aiohttp.ClientConnectionError("down"), repeat=True)
+        async with ProconipClient(config, limiter=limiter, breaker=breaker) as client:
+            for _ in range(2):
+                with pytest.raises(ProconipApiException):
+                    await client.async_get_state()
+            with pytest.raises(CircuitOpenException):
+                await client.async_get_state()
+    assert len(m.requests[("GET", URL(GET_STATE_URL))]) == 2
+    assert limiter.granted == 2